@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Benchmark tile encodings: encode time and bytes per tile for each option.
+
+Tiles are cut from a frame COG (any EPSG:3857 single-band raster, e.g. a NEXRAD
+``tilt0_reflectivity.tif``) with the tiler's frame cache, or synthesized when no COG
+is given. Each tile is coloured with the same palette the tiler uses, then encoded as
+PNG at every zlib level/filter combination and as lossless and lossy WebP.
+
+Usage:
+  python -m scripts.bench_tile_encoding                       # synthetic radar + IR tiles
+  python -m scripts.bench_tile_encoding --cog frame.tif --zoom 7 --colormap nexrad_reflectivity
+  python -m scripts.bench_tile_encoding --levels 1,6,9 --repeat 5
+
+Run as a module from the repository root so ``services`` is importable.
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from services.common.colormaps import get_colormap
+from services.tiler.encoders import EncodingProfile, encode_tile, webp_available
+from services.tiler.frame_cache import MERCATOR_HALF_EXTENT_M, read_frame
+from services.tiler.server import _tile_to_index
+
+
+def _synthetic_tiles(count: int) -> dict[str, list[np.ndarray]]:
+    """Radar-like (sparse cells over clear air) and IR-like (smooth field) index tiles."""
+    rng = np.random.default_rng(42)
+    yy, xx = np.mgrid[0:256, 0:256].astype("float64")
+    radar, infrared = [], []
+    for _ in range(count):
+        dbz = np.full((256, 256), -30.0)
+        for _ in range(6):
+            cx, cy, r = rng.uniform(0, 256, 2).tolist() + [rng.uniform(10, 50)]
+            cell = 60 * np.exp(-((xx - cx) ** 2 + (yy - cy) ** 2) / (2 * r**2)) + rng.normal(0, 2, xx.shape)
+            dbz = np.maximum(dbz, cell)
+        radar.append(_tile_to_index(dbz, None, -30.0, 80.0))
+        phase = rng.uniform(0, 2 * math.pi)
+        kelvin = 255 + 40 * np.sin(xx / 40 + phase) * np.cos(yy / 55) + rng.normal(0, 0.5, xx.shape)
+        infrared.append(_tile_to_index(kelvin, None, 180.0, 330.0))
+    return {"nexrad_reflectivity": radar, "goes_ir_kelvin": infrared}
+
+
+def _cog_tiles(path: str, zoom: int, limit: int, lo: float, hi: float) -> list[np.ndarray]:
+    frame = read_frame(path, max_pixels=1 << 26)
+    if frame is None:
+        raise SystemExit(f"{path} is not a single-band EPSG:3857 raster")
+    res = 2 * MERCATOR_HALF_EXTENT_M / (256 * 2**zoom)
+    x0 = int((frame.left + MERCATOR_HALF_EXTENT_M) // (256 * res))
+    y0 = int((MERCATOR_HALF_EXTENT_M - frame.top) // (256 * res))
+    span_x = math.ceil(frame.data.shape[1] * frame.res_x / (256 * res)) + 1
+    span_y = math.ceil(frame.data.shape[0] * frame.res_y / (256 * res)) + 1
+    tiles = []
+    for ty in range(y0, y0 + span_y):
+        for tx in range(x0, x0 + span_x):
+            tile = frame.tile(zoom, tx, ty)
+            if tile is not None and tile[1].any():
+                data, mask = tile
+                tiles.append(_tile_to_index(data, mask, lo, hi, scale=frame.scale, offset=frame.offset))
+    return tiles[:limit]
+
+
+def _options(levels: list[int]) -> list[tuple[str, str, EncodingProfile]]:
+    options = [
+        (f"png level={level} filter={name}", "png", EncodingProfile(png_level=level, png_filter=name))
+        for level in levels
+        for name in ("none", "sub", "up")
+    ]
+    if webp_available():
+        options.append(("webp lossless", "webp", EncodingProfile(webp_lossless=True)))
+        for quality in (90, 75, 50):
+            options.append(
+                (f"webp lossy q={quality}", "webp", EncodingProfile(webp_lossless=False, webp_quality=quality))
+            )
+    return options
+
+
+def bench(tiles: list[np.ndarray], palette: np.ndarray, levels: list[int], repeat: int) -> None:
+    print(f"{'option':<28} {'ms/tile':>9} {'bytes/tile':>11}")
+    for label, fmt, profile in _options(levels):
+        sizes = [len(encode_tile(t, palette, fmt, profile)) for t in tiles]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for tile in tiles:
+                encode_tile(tile, palette, fmt, profile)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / (repeat * len(tiles))
+        print(f"{label:<28} {elapsed_ms:>9.2f} {sum(sizes) / len(sizes):>11.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cog", help="EPSG:3857 single-band COG to cut tiles from")
+    parser.add_argument("--zoom", type=int, default=7)
+    parser.add_argument("--colormap", default="nexrad_reflectivity")
+    parser.add_argument("--tiles", type=int, default=16, help="tiles per dataset")
+    parser.add_argument("--levels", default="1,6,9", help="comma-separated zlib levels")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    levels = [int(v) for v in args.levels.split(",")]
+
+    if args.cog:
+        lo, hi = get_colormap(args.colormap).default_range or (-30.0, 80.0)
+        datasets = {args.colormap: _cog_tiles(args.cog, args.zoom, args.tiles, lo, hi)}
+    else:
+        datasets = _synthetic_tiles(args.tiles)
+    for colormap, tiles in datasets.items():
+        cmap = get_colormap(colormap)
+        lo, hi = cmap.default_range or (-30.0, 80.0)
+        print(f"\n{colormap}: {len(tiles)} tiles")
+        bench(tiles, cmap.palette(lo, hi), levels, args.repeat)
+    if not webp_available():
+        print("\n(WebP rows skipped: Pillow is not installed)")
+
+
+if __name__ == "__main__":
+    main()
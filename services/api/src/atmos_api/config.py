@@ -3,7 +3,10 @@ from __future__ import annotations
 
 from pydantic import Field
 
-from atmos_common.config import CommonSettings
+try:
+    from atmos_common.config import CommonSettings
+except ImportError:  # pragma: no cover - running from a source checkout
+    from services.common.config import CommonSettings  # type: ignore[no-redef]
 
 
 class Settings(CommonSettings):
@@ -3,6 +3,8 @@
 Currently surfaces reflectivity metadata for NEXRAD ingested outputs.
 This reads the metadata JSON stored in the derived bucket (uploaded by the
 radar processing pipeline) and returns a trimmed structure suitable for UI legends.
+Palettes come from the colormap registry the tiler renders with, so legends always
+match the tiles.
 """
 from __future__ import annotations
 
@@ -15,6 +17,11 @@ from minio import Minio
 from ..config import Settings
 from ..deps import get_settings
 
+try:
+    from services.common.colormaps import COLORMAPS, NEXRAD_REFLECTIVITY  # type: ignore
+except ImportError:  # pragma: no cover - fallback for path issues
+    COLORMAPS, NEXRAD_REFLECTIVITY = {}, None  # type: ignore[assignment]
+
 router = APIRouter(prefix="/v1/legend", tags=["legend"])
 
 
@@ -61,7 +68,8 @@ def nexrad_legend(
         "product": meta.get("product"),
         "units": meta.get("units"),
         "rescale": meta.get("rescale"),
-        "palette": meta.get("color_palette"),
+        "palette": meta.get("color_palette")
+        or (NEXRAD_REFLECTIVITY.legend() if NEXRAD_REFLECTIVITY else None),
         "timestamp": meta.get("timestamp"),
         "site": meta.get("site"),
         "extent_km": meta.get("grid_info", {}).get("extent_km"),
@@ -70,4 +78,20 @@ def nexrad_legend(
     return {"legend": legend, "raw": meta}
 
 
+@router.get("/colormaps")
+def list_colormaps() -> dict[str, Any]:
+    """Return every colormap the tiler renders with (stops in data units)."""
+    return {"colormaps": [cmap.legend() for cmap in COLORMAPS.values()]}
+
+
+@router.get("/colormaps/{name}")
+def colormap_legend(
+    name: str = Path(..., description="Colormap name (e.g. nexrad_reflectivity, goes_ir_celsius)"),
+) -> dict[str, Any]:
+    cmap = COLORMAPS.get(name)
+    if cmap is None:
+        raise HTTPException(status_code=404, detail=f"Unknown colormap: {name}")
+    return cmap.legend()
+
+
 __all__ = ["router"]
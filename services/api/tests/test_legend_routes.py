@@ -0,0 +1,48 @@
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+from src import app as live_app
+from src.atmos_api.routers import legend as legend_router  # type: ignore
+
+
+class _Response(io.BytesIO):
+    def release_conn(self):
+        pass
+
+
+class _FakeMinio:
+    def __init__(self, objects):
+        self.objects = objects
+
+    def get_object(self, bucket, key):
+        if key not in self.objects:
+            raise KeyError(key)
+        return _Response(json.dumps(self.objects[key]).encode())
+
+
+def test_colormap_legends_come_from_the_tiler_registry():
+    client = TestClient(live_app)
+    names = [cmap["name"] for cmap in client.get("/v1/legend/colormaps").json()["colormaps"]]
+    assert {"nexrad_reflectivity", "goes_ir_kelvin", "goes_ir_celsius", "goes_ir_fahrenheit"} <= set(names)
+
+    reflectivity = client.get("/v1/legend/colormaps/nexrad_reflectivity").json()
+    assert reflectivity["units"] == "dBZ" and reflectivity["type"] == "stepped"
+    assert reflectivity["stops"][0] == {"value": 5.0, "color": "#04e9e7"}
+    celsius = client.get("/v1/legend/colormaps/goes_ir_celsius").json()
+    assert celsius["units"] == "°C" and celsius["type"] == "continuous" and len(celsius["range"]) == 2
+    assert client.get("/v1/legend/colormaps/nope").status_code == 404
+
+
+def test_nexrad_legend_falls_back_to_the_registry_palette(monkeypatch):
+    key = "nexrad/KTLX/20240101T000000Z/tilt0_reflectivity.json"
+    meta = {"product": "reflectivity", "units": "dBZ", "rescale": [-32, 80], "site": "KTLX"}
+    monkeypatch.setattr(legend_router, "_get_minio_client", lambda settings: _FakeMinio({key: meta}))
+    client = TestClient(live_app)
+
+    payload = client.get("/v1/legend/nexrad/ktlx/20240101T000000Z").json()
+    palette = payload["legend"]["palette"]
+    assert palette["name"] == "nexrad_reflectivity" and palette["stops"]
+    assert payload["raw"] == meta
+    assert client.get("/v1/legend/nexrad/KTLX/20990101T000000Z").status_code == 404
@@ -0,0 +1,173 @@
+"""Colormap registry shared by the tiler (rendering) and the API (legends).
+
+Each colormap is a list of ``(value, "#rrggbb[aa]")`` stops in data units. Rendering
+uses :meth:`Colormap.palette`, a 256-entry RGBA table for a display range: index 0 is
+reserved for transparent/no-data pixels and indices 1-255 cover ``lo..hi`` linearly,
+so a tile is coloured by a single vectorized lookup and can be written as an 8-bit
+indexed PNG. Legends use :meth:`Colormap.legend`, which returns the same stops.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+PALETTE_SIZE = 256
+# Index 0 is no-data; data values map onto 1..255.
+NODATA_INDEX = 0
+DATA_LEVELS = PALETTE_SIZE - 1
+
+
+def _rgba(color: str) -> tuple[int, int, int, int]:
+    color = color.lstrip("#")
+    if len(color) == 6:
+        color += "ff"
+    return tuple(int(color[i : i + 2], 16) for i in range(0, 8, 2))  # type: ignore[return-value]
+
+
+@dataclass(frozen=True)
+class Colormap:
+    """Ordered colour stops in data units.
+
+    ``stepped`` maps each value to the colour of the last stop at or below it (NWS
+    reflectivity bins); otherwise colours are interpolated between stops. Values below
+    the first stop are transparent when ``transparent_below`` is set, else clamped.
+    """
+
+    name: str
+    units: str
+    stops: tuple[tuple[float, str], ...]
+    stepped: bool = False
+    transparent_below: bool = False
+    default_range: tuple[float, float] | None = None
+
+    def colors_at(self, values: np.ndarray) -> np.ndarray:
+        """RGBA (uint8, shape ``values.shape + (4,)``) for an array of data values."""
+        values = np.asarray(values, dtype="float64")
+        positions = np.array([v for v, _ in self.stops], dtype="float64")
+        colors = np.array([_rgba(c) for _, c in self.stops], dtype="float64")
+        if self.stepped:
+            idx = np.clip(np.searchsorted(positions, values, side="right") - 1, 0, len(positions) - 1)
+            out = colors[idx]
+        else:
+            out = np.stack([np.interp(values, positions, colors[:, ch]) for ch in range(4)], axis=-1)
+        out = np.rint(out).astype("uint8")
+        if self.transparent_below:
+            out[values < positions[0]] = 0
+        return out
+
+    def palette(self, lo: float, hi: float) -> np.ndarray:
+        """256x4 RGBA table: index 0 transparent, indices 1..255 spanning ``lo..hi``."""
+        values = lo + (np.arange(DATA_LEVELS, dtype="float64") / (DATA_LEVELS - 1)) * (hi - lo)
+        table = np.zeros((PALETTE_SIZE, 4), dtype="uint8")
+        table[1:] = self.colors_at(values)
+        return table
+
+    def legend(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "units": self.units,
+            "type": "stepped" if self.stepped else "continuous",
+            "range": [round(v, 2) for v in self.default_range] if self.default_range else None,
+            "stops": [{"value": round(v, 2), "color": c} for v, c in self.stops],
+        }
+
+
+def _to_celsius(kelvin: float) -> float:
+    return kelvin - 273.15
+
+
+def _to_fahrenheit(kelvin: float) -> float:
+    return (kelvin - 273.15) * 9 / 5 + 32
+
+
+# NWS base reflectivity ramp, one colour per 5 dBZ bin; below 5 dBZ is left clear.
+NEXRAD_REFLECTIVITY = Colormap(
+    name="nexrad_reflectivity",
+    units="dBZ",
+    stops=(
+        (5.0, "#04e9e7"),
+        (10.0, "#019ff4"),
+        (15.0, "#0300f4"),
+        (20.0, "#02fd02"),
+        (25.0, "#01c501"),
+        (30.0, "#008e00"),
+        (35.0, "#fdf802"),
+        (40.0, "#e5bc00"),
+        (45.0, "#fd9500"),
+        (50.0, "#fd0000"),
+        (55.0, "#d40000"),
+        (60.0, "#bc0000"),
+        (65.0, "#f800fd"),
+        (70.0, "#9854c6"),
+        (75.0, "#fdfdfd"),
+    ),
+    stepped=True,
+    transparent_below=True,
+    default_range=(-30.0, 80.0),
+)
+
+# Enhanced IR: greyscale for warm surfaces and low cloud, colours for cold cloud tops.
+_IR_STOPS_K: tuple[tuple[float, str], ...] = (
+    (180.0, "#ffffff"),
+    (193.0, "#7f007f"),
+    (203.0, "#ff00ff"),
+    (213.0, "#ff0000"),
+    (223.0, "#ffff00"),
+    (233.0, "#00ff00"),
+    (243.0, "#0000ff"),
+    (253.0, "#00ffff"),
+    (254.0, "#e6e6e6"),
+    (330.0, "#000000"),
+)
+_IR_RANGE_K = (180.0, 330.0)
+
+GOES_IR_KELVIN = Colormap("goes_ir_kelvin", "K", _IR_STOPS_K, default_range=_IR_RANGE_K)
+GOES_IR_CELSIUS = Colormap(
+    "goes_ir_celsius",
+    "°C",
+    tuple((_to_celsius(v), c) for v, c in _IR_STOPS_K),
+    default_range=(_to_celsius(_IR_RANGE_K[0]), _to_celsius(_IR_RANGE_K[1])),
+)
+GOES_IR_FAHRENHEIT = Colormap(
+    "goes_ir_fahrenheit",
+    "°F",
+    tuple((_to_fahrenheit(v), c) for v, c in _IR_STOPS_K),
+    default_range=(_to_fahrenheit(_IR_RANGE_K[0]), _to_fahrenheit(_IR_RANGE_K[1])),
+)
+
+COLORMAPS: dict[str, Colormap] = {
+    cmap.name: cmap
+    for cmap in (NEXRAD_REFLECTIVITY, GOES_IR_KELVIN, GOES_IR_CELSIUS, GOES_IR_FAHRENHEIT)
+}
+
+_GOES_STYLES = {
+    "default": GOES_IR_KELVIN,
+    "kelvin": GOES_IR_KELVIN,
+    "celsius": GOES_IR_CELSIUS,
+    "fahrenheit": GOES_IR_FAHRENHEIT,
+}
+
+
+def get_colormap(name: str) -> Colormap:
+    """Return a registered colormap; raises ``KeyError`` for unknown names."""
+    return COLORMAPS[name]
+
+
+def colormap_for(dataset: str, style: str = "default") -> Colormap:
+    """Colormap used to render ``dataset`` (tiler dataset names, e.g. ``nexrad-KTLX``)."""
+    if dataset.startswith("goes-"):
+        return _GOES_STYLES.get(style, GOES_IR_KELVIN)
+    return NEXRAD_REFLECTIVITY
+
+
+__all__ = [
+    "COLORMAPS",
+    "Colormap",
+    "DATA_LEVELS",
+    "NODATA_INDEX",
+    "PALETTE_SIZE",
+    "colormap_for",
+    "get_colormap",
+]
@@ -36,12 +36,30 @@ export interface NexradIngestionDetail {
   meta_url?: string;
 }
 
+export interface ColormapStop {
+  value: number; // data units
+  color: string; // #rrggbb
+}
+
+// One colormap of the tiler's registry (/v1/legend/colormaps/{name}).
+export interface ColormapLegend {
+  name: string;
+  units: string;
+  type: "stepped" | "continuous";
+  range: [number, number] | null;
+  stops: ColormapStop[];
+}
+
+export interface ColormapListResponse {
+  colormaps: ColormapLegend[];
+}
+
 export interface NexradLegendResponse {
   legend: {
     product: string;
     units: string;
     rescale: [number, number];
-    palette: string;
+    palette: ColormapLegend | string | null; // legacy frames may carry a palette name
     timestamp: string;
     site: string;
     extent_km: number;
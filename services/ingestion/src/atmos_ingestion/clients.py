@@ -1,12 +1,15 @@
 """Client factories used by the ingestion service."""
 from __future__ import annotations
 
+from pathlib import Path
+
 import boto3
 from botocore import UNSIGNED
 from botocore.client import BaseClient
 from botocore.config import Config
 
 from .config import IngestionSettings
+from .rawcache import CachingS3Client, RawObjectCache, S3BlobStore, shared_raw_cache
 
 
 def build_source_s3_client(settings: IngestionSettings) -> BaseClient:
@@ -34,18 +37,39 @@ def build_minio_s3_client(settings: IngestionSettings) -> BaseClient:
     )
 
 
+def build_raw_cache(settings: IngestionSettings, store_client: BaseClient | None) -> RawObjectCache:
+    """Return the process-wide read-through cache in front of the public source buckets."""
+    return shared_raw_cache(
+        cache_dir=Path(settings.raw_cache_dir) if settings.raw_cache_dir else None,
+        max_bytes=settings.raw_cache_max_mb << 20,
+        store=S3BlobStore(store_client, settings.raw_bucket)
+        if settings.raw_cache_store and store_client is not None
+        else None,
+    )
+
+
 class ClientBundle:
     """A thin container that memoises expensive boto3 client creation."""
 
     def __init__(self, settings: IngestionSettings):
         self._settings = settings
-        self._source: BaseClient | None = None
+        self._source: BaseClient | CachingS3Client | None = None
         self._derived: BaseClient | None = None
+        self._raw_cache: RawObjectCache | None = None
+
+    @property
+    def raw_cache(self) -> RawObjectCache:
+        if self._raw_cache is None:
+            store_client = self.derived if self._settings.raw_cache_store else None
+            self._raw_cache = build_raw_cache(self._settings, store_client)
+        return self._raw_cache
 
     @property
-    def source(self) -> BaseClient:
+    def source(self) -> BaseClient | CachingS3Client:
         if self._source is None:
-            self._source = build_source_s3_client(self._settings)
+            client = build_source_s3_client(self._settings)
+            cache = self.raw_cache
+            self._source = CachingS3Client(client, cache) if cache.enabled else client
         return self._source
 
     @property
@@ -55,4 +79,4 @@ class ClientBundle:
         return self._derived
 
 
-__all__ = ["build_source_s3_client", "build_minio_s3_client", "ClientBundle"]
+__all__ = ["build_source_s3_client", "build_minio_s3_client", "build_raw_cache", "ClientBundle"]
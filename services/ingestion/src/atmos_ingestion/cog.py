@@ -0,0 +1,120 @@
+"""Single-pass Cloud Optimized GeoTIFF encoding shared by the ingestion jobs.
+
+Writing through GDAL's COG driver into a ``MemoryFile`` lets rasterio buffer the band
+in an uncompressed MEM dataset and compress it, with overviews, exactly once when the
+dataset closes. The encoded bytes are copied out of ``/vsimem`` a single time and
+handed to uploads through ``io.BytesIO``, which shares an immutable ``bytes`` buffer
+instead of copying it.
+"""
+from __future__ import annotations
+
+import io
+import logging
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from rasterio.io import MemoryFile
+
+logger = logging.getLogger("cog_writer")
+
+
+@dataclass
+class EncodedCog:
+    """An encoded COG payload plus the cost of producing it."""
+
+    payload: bytes
+    encode_seconds: float
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.payload)
+
+    def stream(self) -> io.BytesIO:
+        """Return a readable stream over the payload without copying it."""
+        return io.BytesIO(self.payload)
+
+
+@dataclass(frozen=True)
+class Quantization:
+    """Linear integer encoding of a physical field: ``value = code * scale + offset``."""
+
+    dtype: str
+    scale: float
+    offset: float
+    nodata: int
+
+    def encode(self, values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        """Quantize ``values``; pixels outside ``valid`` (or non-finite) become ``nodata``."""
+        info = np.iinfo(self.dtype)
+        lo, hi = info.min, info.max
+        # Keep the nodata code out of the valid range on whichever end it sits.
+        if self.nodata == lo:
+            lo += 1
+        elif self.nodata == hi:
+            hi -= 1
+        keep = valid & np.isfinite(values)
+        # Invalid cells get a finite placeholder first: casting NaN to an integer is undefined.
+        codes = np.rint((np.where(keep, values, self.offset) - self.offset) / self.scale)
+        np.clip(codes, lo, hi, out=codes)
+        out = codes.astype(self.dtype)
+        out[~keep] = self.nodata
+        return out
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        values = codes.astype("float32") * np.float32(self.scale) + np.float32(self.offset)
+        values[codes == self.nodata] = np.nan
+        return values
+
+    def describe(self) -> dict[str, Any]:
+        return {"dtype": self.dtype, "scale": self.scale, "offset": self.offset, "nodata": self.nodata}
+
+
+def encode_cog(
+    array: np.ndarray,
+    *,
+    transform: Any,
+    crs: Any,
+    nodata: float | int | None,
+    blocksize: int = 256,
+    compress: str = "DEFLATE",
+    overview_resampling: str = "average",
+    scale: float | None = None,
+    offset: float | None = None,
+    tags: Mapping[str, Any] | None = None,
+) -> EncodedCog:
+    """Encode a single-band ``array`` as an in-memory COG with overviews."""
+    if array.ndim != 2:
+        raise ValueError(f"encode_cog expects a 2-D array, got shape {array.shape}")
+    profile = {
+        "driver": "COG",
+        "height": array.shape[0],
+        "width": array.shape[1],
+        "count": 1,
+        "dtype": array.dtype.name,
+        "crs": crs,
+        "transform": transform,
+        "nodata": nodata,
+        "compress": compress,
+        "blocksize": blocksize,
+        "overview_resampling": overview_resampling,
+    }
+
+    started = time.perf_counter()
+    with MemoryFile() as mem:
+        with mem.open(**profile) as dst:
+            dst.write(array, 1)
+            if scale is not None or offset is not None:
+                dst.scales = (1.0 if scale is None else scale,)
+                dst.offsets = (0.0 if offset is None else offset,)
+            if tags:
+                dst.update_tags(**{k: str(v) for k, v in tags.items()})
+        payload = mem.read()
+    elapsed = time.perf_counter() - started
+    logger.debug("Encoded %sx%s COG (%d bytes) in %.3fs", array.shape[0], array.shape[1], len(payload), elapsed)
+    return EncodedCog(payload=payload, encode_seconds=elapsed)
+
+
+__all__ = ["EncodedCog", "Quantization", "encode_cog"]
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from functools import cached_property
 from pathlib import Path
+from typing import Literal
 from urllib.parse import urlparse
 
 from pydantic import Field
@@ -44,6 +45,30 @@ class IngestionSettings(BaseSettings):
         description="Bucket/prefix used to persist processed outputs.",
     )
 
+    raw_bucket: str = Field(
+        default="raw",
+        alias="S3_BUCKET_RAW",
+        description="Bucket that mirrors upstream source objects for the raw cache.",
+    )
+
+    # Raw source cache configuration
+    raw_cache_dir: str = Field(
+        default="/tmp/atmos/raw-cache",
+        alias="RAW_CACHE_DIR",
+        description="Local directory for cached upstream objects; empty disables the disk tier.",
+    )
+    raw_cache_max_mb: int = Field(
+        default=2048,
+        alias="RAW_CACHE_MAX_MB",
+        description="Size bound of the local raw cache; least recently used objects are evicted.",
+        ge=0,
+    )
+    raw_cache_store: bool = Field(
+        default=True,
+        alias="RAW_CACHE_STORE",
+        description="Also keep cached upstream objects in the raw bucket.",
+    )
+
     # Source data configuration
     nexrad_bucket: str = Field(
         default="unidata-nexrad-level2",
@@ -103,6 +128,20 @@ class IngestionSettings(BaseSettings):
         description="Maximum number of blocking ingestion jobs to execute concurrently.",
         ge=1,
     )
+    executor_backend: Literal["thread", "process"] = Field(
+        default="thread",
+        alias="INGESTION_EXECUTOR_BACKEND",
+        description=(
+            "Run jobs on a thread pool or on a pool of pre-warmed worker processes. "
+            "Use 'process' to scale GIL-bound decoding/encoding across cores."
+        ),
+    )
+    worker_max_tasks: int = Field(
+        default=50,
+        alias="INGESTION_WORKER_MAX_TASKS",
+        description="Recycle a worker process after this many jobs (process backend only).",
+        ge=1,
+    )
 
     @staticmethod
     def _discover_env_file() -> Path | None:
@@ -0,0 +1,454 @@
+"""Cached polar-to-grid lookup tables for single-sweep radar products.
+
+``pyart.map.grid_from_radars`` rebuilds its KD-tree and weighting machinery for every
+volume even though the radar position, gate geometry and output grid are effectively
+constant between scans of the same site. This module precomputes, once per
+(site, VCP, gate layout, grid config), the polar cell that feeds each output pixel and
+then grids every new sweep with a single vectorised NumPy gather.
+
+The index is expressed in (azimuth bin, gate) space rather than (ray, gate) so that the
+small azimuth jitter between volumes does not invalidate it; each sweep only needs an
+``O(n_rays)`` lookup from azimuth bin to its nearest ray.
+
+Output grids are either radar-centred planar (:class:`GridConfig`) or Web-Mercator
+rasters aligned to the XYZ tiles of one zoom level (:class:`MercatorGrid`); both just
+provide each pixel's east/north ground offset from the radar.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+import numpy as np
+
+logger = logging.getLogger("nexrad_gridding")
+
+EARTH_RADIUS_M = 6371000.0
+# Standard 4/3 effective earth radius model used for beam height / ground range.
+EFFECTIVE_RADIUS_M = EARTH_RADIUS_M * 4.0 / 3.0
+# Spherical (Web) Mercator, EPSG:3857.
+MERCATOR_RADIUS_M = 6378137.0
+MERCATOR_HALF_EXTENT_M = np.pi * MERCATOR_RADIUS_M
+INDEX_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class GridConfig:
+    """Output raster definition centred on the radar (local planar metres)."""
+
+    radius_km: float
+    resolution_km: float
+
+    @property
+    def size(self) -> int:
+        return int(self.radius_km / self.resolution_km * 2) + 1
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (self.size, self.size)
+
+    @property
+    def resolution_m(self) -> float:
+        return self.resolution_km * 1000.0
+
+    def pixel_centres(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(x, y)`` pixel-centre coordinates in metres, row 0 northmost."""
+        offsets = np.arange(self.size, dtype="float64") * self.resolution_m - self.radius_km * 1000.0
+        x = offsets[np.newaxis, :]
+        y = offsets[::-1, np.newaxis]
+        return np.broadcast_to(x, self.shape), np.broadcast_to(y, self.shape)
+
+    def pixel_offsets(self) -> tuple[np.ndarray, np.ndarray]:
+        """East/north ground offsets (metres) of each pixel centre from the radar."""
+        return self.pixel_centres()
+
+    @property
+    def origin_m(self) -> tuple[float, float]:
+        """Upper-left corner of the raster in radar-centred planar metres."""
+        half_extent = self.radius_km * 1000.0 + self.resolution_m / 2.0
+        return (-half_extent, half_extent)
+
+
+@dataclass(frozen=True)
+class MercatorGrid:
+    """A Web-Mercator raster covering whole XYZ tiles at ``zoom`` around one radar.
+
+    Pixels coincide with the tile pixels at ``zoom``, so each ``tile_size`` block of a COG
+    written on this grid is exactly one map tile.
+    """
+
+    zoom: int
+    tile_x0: int
+    tile_y0: int
+    tiles_x: int
+    tiles_y: int
+    latitude: float
+    longitude: float
+    tile_size: int = 256
+
+    @property
+    def resolution_m(self) -> float:
+        return 2.0 * MERCATOR_HALF_EXTENT_M / (self.tile_size * 2**self.zoom)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (self.tiles_y * self.tile_size, self.tiles_x * self.tile_size)
+
+    @property
+    def origin_m(self) -> tuple[float, float]:
+        """Upper-left corner of the raster in EPSG:3857 metres."""
+        span = self.tile_size * self.resolution_m
+        return (
+            -MERCATOR_HALF_EXTENT_M + self.tile_x0 * span,
+            MERCATOR_HALF_EXTENT_M - self.tile_y0 * span,
+        )
+
+    def pixel_lonlat(self) -> tuple[np.ndarray, np.ndarray]:
+        """Longitude/latitude (degrees) of every pixel centre, row 0 northmost."""
+        x0, y0 = self.origin_m
+        res = self.resolution_m
+        rows, cols = self.shape
+        mx = x0 + (np.arange(cols, dtype="float64") + 0.5) * res
+        my = y0 - (np.arange(rows, dtype="float64") + 0.5) * res
+        lon = np.degrees(mx / MERCATOR_RADIUS_M)
+        lat = np.degrees(2.0 * np.arctan(np.exp(my / MERCATOR_RADIUS_M)) - np.pi / 2.0)
+        return np.broadcast_to(lon[np.newaxis, :], self.shape), np.broadcast_to(lat[:, np.newaxis], self.shape)
+
+    def pixel_offsets(self) -> tuple[np.ndarray, np.ndarray]:
+        """East/north ground offsets (metres) from the radar along great circles."""
+        lon, lat = self.pixel_lonlat()
+        phi1 = np.radians(self.latitude)
+        phi2 = np.radians(lat)
+        dlon = np.radians(lon - self.longitude)
+        sin_dphi = np.sin((phi2 - phi1) / 2.0)
+        sin_dlon = np.sin(dlon / 2.0)
+        a = sin_dphi**2 + np.cos(phi1) * np.cos(phi2) * sin_dlon**2
+        distance = 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+        bearing = np.arctan2(
+            np.sin(dlon) * np.cos(phi2),
+            np.cos(phi1) * np.sin(phi2) - np.sin(phi1) * np.cos(phi2) * np.cos(dlon),
+        )
+        return distance * np.sin(bearing), distance * np.cos(bearing)
+
+
+@dataclass(frozen=True)
+class MercatorGridConfig:
+    """Tile-aligned Web-Mercator output: whole tiles at ``zoom`` covering ``radius_km``."""
+
+    zoom: int
+    radius_km: float
+    tile_size: int = 256
+    # Snap the tile window to multiples of this many tiles so COG blocks are whole tiles
+    # (2 for 512-px blocks: one block is one 512-px tile one zoom out).
+    align_tiles: int = 2
+
+    def for_site(self, latitude: float, longitude: float) -> MercatorGrid:
+        lat = round(float(latitude), 4)
+        lon = round(float(longitude), 4)
+        # Mercator stretches ground distances by 1 / cos(lat); use the poleward edge.
+        reach_deg = np.degrees(self.radius_km * 1000.0 / EARTH_RADIUS_M)
+        stretch = 1.0 / np.cos(np.radians(min(abs(lat) + reach_deg, 85.0)))
+        half = self.radius_km * 1000.0 * stretch
+        mx = np.radians(lon) * MERCATOR_RADIUS_M
+        my = MERCATOR_RADIUS_M * np.log(np.tan(np.pi / 4.0 + np.radians(lat) / 2.0))
+        span = 2.0 * MERCATOR_HALF_EXTENT_M / 2**self.zoom
+        n = self.align_tiles
+        x0 = int(np.floor((mx - half + MERCATOR_HALF_EXTENT_M) / span)) // n * n
+        x1 = -(-int(np.floor((mx + half + MERCATOR_HALF_EXTENT_M) / span) + 1) // n) * n
+        y0 = int(np.floor((MERCATOR_HALF_EXTENT_M - (my + half)) / span)) // n * n
+        y1 = -(-int(np.floor((MERCATOR_HALF_EXTENT_M - (my - half)) / span) + 1) // n) * n
+        return MercatorGrid(
+            zoom=self.zoom,
+            tile_x0=x0,
+            tile_y0=y0,
+            tiles_x=x1 - x0,
+            tiles_y=y1 - y0,
+            latitude=lat,
+            longitude=lon,
+            tile_size=self.tile_size,
+        )
+
+
+@dataclass
+class Sweep:
+    """A single radar sweep of one moment, decoupled from the decoder that produced it."""
+
+    site: str
+    vcp: int | None
+    elevation_deg: float
+    azimuths: np.ndarray  # (n_rays,) degrees clockwise from north
+    first_gate_m: float
+    gate_spacing_m: float
+    data: np.ndarray  # (n_rays, n_gates) float32, NaN where no valid echo
+    latitude: float = 0.0
+    longitude: float = 0.0
+
+    @property
+    def n_rays(self) -> int:
+        return int(self.data.shape[0])
+
+    @property
+    def n_gates(self) -> int:
+        return int(self.data.shape[1])
+
+    @property
+    def azimuth_bins(self) -> int:
+        # Super-resolution sweeps carry ~720 radials (0.5 deg); legacy sweeps ~360.
+        return 720 if self.n_rays > 400 else 360
+
+
+@dataclass(frozen=True)
+class GridIndexKey:
+    """Everything that determines the pixel -> polar cell mapping."""
+
+    site: str
+    vcp: int | None
+    n_gates: int
+    first_gate_m: float
+    gate_spacing_m: float
+    elevation_deg: float
+    azimuth_bins: int
+    grid: GridConfig | MercatorGrid
+
+    @classmethod
+    def for_sweep(cls, sweep: Sweep, grid: GridConfig | MercatorGrid) -> GridIndexKey:
+        return cls(
+            site=sweep.site.upper(),
+            vcp=sweep.vcp,
+            n_gates=sweep.n_gates,
+            first_gate_m=round(float(sweep.first_gate_m), 1),
+            gate_spacing_m=round(float(sweep.gate_spacing_m), 1),
+            # Fixed angles wobble by a few hundredths of a degree between volumes.
+            elevation_deg=round(float(sweep.elevation_deg), 1),
+            azimuth_bins=sweep.azimuth_bins,
+            grid=grid,
+        )
+
+    @property
+    def digest(self) -> str:
+        text = f"v{INDEX_FORMAT_VERSION}|{self!r}"
+        return hashlib.sha1(text.encode()).hexdigest()
+
+
+def ground_range_of_gates(ranges_m: np.ndarray, elevation_deg: float) -> np.ndarray:
+    """Return the great-circle ground distance of each gate under the 4/3 earth model."""
+    elev = np.deg2rad(elevation_deg)
+    r = np.asarray(ranges_m, dtype="float64")
+    height = np.sqrt(r**2 + EFFECTIVE_RADIUS_M**2 + 2.0 * r * EFFECTIVE_RADIUS_M * np.sin(elev))
+    height -= EFFECTIVE_RADIUS_M
+    return EFFECTIVE_RADIUS_M * np.arcsin(r * np.cos(elev) / (EFFECTIVE_RADIUS_M + height))
+
+
+class PolarGridIndex:
+    """Pixel -> (azimuth bin, gate) lookup table for one gate layout and grid."""
+
+    def __init__(
+        self,
+        key: GridIndexKey,
+        pixels: np.ndarray,
+        azimuth_bin: np.ndarray,
+        gate: np.ndarray,
+    ):
+        self.key = key
+        self.pixels = pixels
+        self.azimuth_bin = azimuth_bin
+        self.gate = gate
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.key.grid.shape
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.pixels.nbytes + self.azimuth_bin.nbytes + self.gate.nbytes)
+
+    @classmethod
+    def build(cls, key: GridIndexKey) -> PolarGridIndex:
+        x, y = key.grid.pixel_offsets()
+        return cls.from_offsets(key, x, y)
+
+    @classmethod
+    def from_offsets(cls, key: GridIndexKey, x: np.ndarray, y: np.ndarray) -> PolarGridIndex:
+        """Build an index from per-pixel east/north ground offsets (metres) from the radar."""
+        ground = np.hypot(x, y).ravel()
+        azimuth = np.mod(np.degrees(np.arctan2(x, y)), 360.0).ravel()
+
+        ranges = key.first_gate_m + key.gate_spacing_m * np.arange(key.n_gates, dtype="float64")
+        gate_ground = ground_range_of_gates(ranges, key.elevation_deg)
+        half = key.gate_spacing_m / 2.0
+        inside = (ground >= gate_ground[0] - half) & (ground <= gate_ground[-1] + half)
+
+        pixels = np.flatnonzero(inside).astype("int32")
+        gate_pos = np.interp(ground[pixels], gate_ground, np.arange(key.n_gates, dtype="float64"))
+        gate = np.rint(gate_pos).astype("int32")
+        bin_width = 360.0 / key.azimuth_bins
+        azimuth_bin = (np.floor(azimuth[pixels] / bin_width).astype("int32") % key.azimuth_bins).astype("uint16")
+        return cls(key, pixels, azimuth_bin, gate)
+
+    def ray_lookup(self, azimuths: np.ndarray, max_gap_deg: float = 1.5) -> np.ndarray:
+        """Map each azimuth bin centre to the index of its nearest ray (``-1`` when none)."""
+        nbins = self.key.azimuth_bins
+        centres = (np.arange(nbins, dtype="float64") + 0.5) * (360.0 / nbins)
+        az = np.mod(np.asarray(azimuths, dtype="float64"), 360.0)
+        order = np.argsort(az, kind="stable")
+        az_sorted = az[order]
+        n = az_sorted.size
+        upper = np.searchsorted(az_sorted, centres) % n
+        lower = (upper - 1) % n
+
+        def _gap(idx: np.ndarray) -> np.ndarray:
+            diff = np.abs(az_sorted[idx] - centres)
+            return np.minimum(diff, 360.0 - diff)
+
+        gap_upper = _gap(upper)
+        gap_lower = _gap(lower)
+        nearest = np.where(gap_lower <= gap_upper, lower, upper)
+        gap = np.minimum(gap_lower, gap_upper)
+        return np.where(gap <= max_gap_deg, order[nearest], -1).astype("int32")
+
+    def apply(self, sweep: Sweep, nodata: float = -9999.0) -> np.ndarray:
+        """Grid ``sweep`` onto the output raster with one vectorised gather."""
+        if sweep.n_gates < self.key.n_gates:
+            raise ValueError(
+                f"Sweep has {sweep.n_gates} gates but index expects {self.key.n_gates}"
+            )
+        out = np.full(self.shape[0] * self.shape[1], nodata, dtype="float32")
+        rays = self.ray_lookup(sweep.azimuths)[self.azimuth_bin]
+        ok = rays >= 0
+        values = sweep.data[rays[ok], self.gate[ok]]
+        out[self.pixels[ok]] = np.where(np.isfinite(values), values, nodata)
+        return out.reshape(self.shape)
+
+    def to_bytes(self) -> bytes:
+        buf = io.BytesIO()
+        np.savez(
+            buf,
+            digest=np.array(self.key.digest),
+            pixels=self.pixels,
+            azimuth_bin=self.azimuth_bin,
+            gate=self.gate,
+        )
+        return buf.getvalue()
+
+    @classmethod
+    def from_bytes(cls, key: GridIndexKey, payload: bytes) -> PolarGridIndex:
+        with np.load(io.BytesIO(payload), allow_pickle=False) as data:
+            if str(data["digest"]) != key.digest:
+                raise ValueError("Grid index digest mismatch")
+            return cls(key, data["pixels"], data["azimuth_bin"], data["gate"])
+
+
+class BlobStore(Protocol):
+    """Minimal persistence interface for serialised indexes (e.g. a MinIO prefix)."""
+
+    def load(self, name: str) -> bytes | None: ...
+
+    def save(self, name: str, payload: bytes) -> None: ...
+
+
+class GridIndexCache:
+    """Memory -> disk -> blob store -> build lookup for :class:`PolarGridIndex` objects."""
+
+    def __init__(
+        self,
+        *,
+        cache_dir: Path | None = None,
+        store: BlobStore | None = None,
+        max_entries: int = 16,
+    ):
+        self._cache_dir = cache_dir
+        self._store = store
+        self._max_entries = max_entries
+        self._entries: OrderedDict[GridIndexKey, PolarGridIndex] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "store_hits": 0, "builds": 0}
+
+    def get(self, key: GridIndexKey) -> PolarGridIndex:
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return index
+        index = self._load(key)
+        if index is None:
+            index = PolarGridIndex.build(key)
+            self.stats["builds"] += 1
+            logger.info("Built grid index %s for %s (%d pixels)", key.digest[:12], key.site, index.pixels.size)
+            self._persist(key, index)
+        with self._lock:
+            self._entries[key] = index
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def grid(self, sweep: Sweep, grid: GridConfig | MercatorGrid, nodata: float = -9999.0) -> np.ndarray:
+        return self.get(GridIndexKey.for_sweep(sweep, grid)).apply(sweep, nodata)
+
+    def _filename(self, key: GridIndexKey) -> str:
+        return f"{key.site}-{key.digest}.npz"
+
+    def _load(self, key: GridIndexKey) -> PolarGridIndex | None:
+        name = self._filename(key)
+        if self._cache_dir is not None:
+            path = self._cache_dir / name
+            try:
+                index = PolarGridIndex.from_bytes(key, path.read_bytes())
+                self.stats["disk_hits"] += 1
+                return index
+            except FileNotFoundError:
+                pass
+            except Exception:  # noqa: BLE001 - corrupt cache entries are simply rebuilt
+                logger.warning("Discarding unreadable grid index %s", path)
+        if self._store is not None:
+            try:
+                payload = self._store.load(name)
+                if payload is not None:
+                    index = PolarGridIndex.from_bytes(key, payload)
+                    self.stats["store_hits"] += 1
+                    self._write_disk(name, payload)
+                    return index
+            except Exception:  # noqa: BLE001
+                logger.warning("Failed to load grid index %s from store", name)
+        return None
+
+    def _persist(self, key: GridIndexKey, index: PolarGridIndex) -> None:
+        name = self._filename(key)
+        payload = index.to_bytes()
+        self._write_disk(name, payload)
+        if self._store is not None:
+            try:
+                self._store.save(name, payload)
+            except Exception:  # noqa: BLE001
+                logger.warning("Failed to persist grid index %s to store", name)
+
+    def _write_disk(self, name: str, payload: bytes) -> None:
+        if self._cache_dir is None:
+            return
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._cache_dir / f".{name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            tmp.write_bytes(payload)
+            tmp.replace(self._cache_dir / name)
+        except OSError:
+            logger.warning("Failed to write grid index %s to %s", name, self._cache_dir)
+
+
+__all__ = [
+    "GridConfig",
+    "GridIndexCache",
+    "GridIndexKey",
+    "MercatorGrid",
+    "MercatorGridConfig",
+    "PolarGridIndex",
+    "Sweep",
+    "ground_range_of_gates",
+]
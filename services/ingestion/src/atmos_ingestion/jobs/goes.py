@@ -8,6 +8,11 @@ from typing import Any
 
 from ..clients import ClientBundle
 from ..config import IngestionSettings
+from ..prewarm import request_prewarm
+
+# CONUS bands the tiler serves (goes-c13 in services/tiler/datasets.py); prewarming any
+# other band would only be refused with a 404.
+PREWARM_BANDS = frozenset({13})
 
 
 def _load_goes_handler_module():
@@ -136,6 +141,12 @@ class GoesIngestion:
             else self._format_timestamp(resolved_request_time or timestamp)
         )
 
+        # The tiler serves the CONUS sector, keyed like derived/goes/east/abi/c13/conus/<ts>/.
+        if resolved_sector == "CONUS" and resolved_band in PREWARM_BANDS:
+            request_prewarm(
+                f"goes-c{resolved_band:02d}", [result.get("timestamp_key") or f"{timestamp:%Y%m%dT%H%M%SZ}"]
+            )
+
         result.update(
             {
                 "band": resolved_band,
@@ -0,0 +1,282 @@
+"""Ingest-time multi-site NEXRAD reflectivity composite (an MRMS-style regional mosaic).
+
+Responsibilities:
+- Align the frames published by ``nexrad_level2`` for a configurable group of sites into
+  fixed time bins (``NEXRAD_COMPOSITE_BIN_MINUTES``, 2 or 5); each site contributes its
+  newest frame in the bin.
+- Paste the member frames onto one regional Web-Mercator grid. Site frames share
+  ``NEXRAD_GRID_ZOOM`` and are whole-tile windows, so each one is an array slice of the
+  regional grid and no resampling is needed.
+- Merge overlapping coverage per pixel by maximum reflectivity, one vectorized
+  ``numpy.fmax`` per member.
+- Publish the composite as a single COG, with metadata and a tile occupancy document,
+  under the key the tiler serves as ``mrms-reflq``, and keep a rolling frames index.
+
+Only the newest ``NEXRAD_COMPOSITE_BINS`` bins are considered per run. A bin is
+recomposited only when its member frames change (a late volume arrived), so the job can
+be triggered after every site ingest.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import io
+import json
+import logging
+import os
+
+import numpy as np
+from rasterio.io import MemoryFile
+from rasterio.transform import from_origin
+
+from ..cog import Quantization, encode_cog
+from ..gridding import MercatorGrid
+from ..occupancy import occupancy_document, tile_occupancy
+from ..prewarm import request_prewarm
+from . import nexrad_level2 as level2
+
+logger = logging.getLogger("nexrad_composite")
+
+COMPOSITE_SITES = [
+    s.strip().upper()
+    for s in os.getenv("NEXRAD_COMPOSITE_SITES", "KTLX,KINX,KVNX,KFDR,KICT,KSRX").split(",")
+    if s.strip()
+]
+BIN_MINUTES = int(os.getenv("NEXRAD_COMPOSITE_BIN_MINUTES", "5"))
+COMPOSITE_BINS = int(os.getenv("NEXRAD_COMPOSITE_BINS", "3"))
+# Served by the tiler as the ``mrms-reflq`` dataset.
+COMPOSITE_PREFIX = "derived/mrms/reflq"
+INDEX_KEY = "indices/radar/mrms/reflq/frames.json"
+TIMESTAMP_FORMAT = "%Y%m%d%H%M%SZ"  # frame timestamp keys written by nexrad_level2
+
+
+def bin_key(ts_key: str, minutes: int = BIN_MINUTES) -> str:
+    """Timestamp key of the start of the ``minutes`` bin holding frame ``ts_key``."""
+    if minutes <= 0 or 60 % minutes:
+        raise ValueError(f"composite bins must divide an hour, got {minutes} minutes")
+    ts = dt.datetime.strptime(ts_key, TIMESTAMP_FORMAT)
+    return ts.replace(minute=ts.minute - ts.minute % minutes, second=0).strftime(TIMESTAMP_FORMAT)
+
+
+def bin_members(indexes: dict[str, list[dict]], minutes: int = BIN_MINUTES) -> dict[str, dict[str, dict]]:
+    """``{bin: {site: frames-index entry}}`` with each site's newest frame per bin."""
+    bins: dict[str, dict[str, dict]] = {}
+    for site, frames in indexes.items():
+        for entry in sorted(frames, key=lambda f: f["timestamp_key"]):
+            bins.setdefault(bin_key(entry["timestamp_key"], minutes), {})[site] = entry
+    return bins
+
+
+def grid_from_meta(grid_meta: dict) -> MercatorGrid | None:
+    """The frame grid described by a frame's ``grid`` metadata; ``None`` unless mercator."""
+    if grid_meta.get("projection") != "mercator":
+        return None
+    x0, y0, tiles_x, tiles_y = grid_meta["tiles"]
+    return MercatorGrid(
+        zoom=grid_meta["zoom"],
+        tile_x0=x0,
+        tile_y0=y0,
+        tiles_x=tiles_x,
+        tiles_y=tiles_y,
+        latitude=0.0,
+        longitude=0.0,
+        tile_size=grid_meta.get("tile_size", 256),
+    )
+
+
+def regional_grid(grids: list[MercatorGrid]) -> MercatorGrid:
+    """Smallest grid holding every site grid; all of them must share zoom and tile size."""
+    zoom, tile_size = grids[0].zoom, grids[0].tile_size
+    if any(g.zoom != zoom or g.tile_size != tile_size for g in grids):
+        raise ValueError("composite members must share one grid zoom and tile size")
+    x0 = min(g.tile_x0 for g in grids)
+    y0 = min(g.tile_y0 for g in grids)
+    x1 = max(g.tile_x0 + g.tiles_x for g in grids)
+    y1 = max(g.tile_y0 + g.tiles_y for g in grids)
+    return MercatorGrid(
+        zoom=zoom,
+        tile_x0=x0,
+        tile_y0=y0,
+        tiles_x=x1 - x0,
+        tiles_y=y1 - y0,
+        latitude=float(np.mean([g.latitude for g in grids])),
+        longitude=float(np.mean([g.longitude for g in grids])),
+        tile_size=tile_size,
+    )
+
+
+def merge_frames(layers: list[tuple[MercatorGrid, np.ndarray]]) -> tuple[MercatorGrid, np.ndarray]:
+    """Maximum-reflectivity composite of ``(grid, dBZ)`` frames (NaN = no data)."""
+    grid = regional_grid([g for g, _ in layers])
+    merged = np.full(grid.shape, np.nan, dtype="float32")
+    size = grid.tile_size
+    for frame_grid, values in layers:
+        row = (frame_grid.tile_y0 - grid.tile_y0) * size
+        col = (frame_grid.tile_x0 - grid.tile_x0) * size
+        window = merged[row : row + values.shape[0], col : col + values.shape[1]]
+        np.fmax(window, values, out=window)
+    return grid, merged
+
+
+def _read_member(entry: dict) -> tuple[MercatorGrid, np.ndarray]:
+    """Grid and decoded dBZ values (NaN = no data) of one published site frame."""
+    meta = json.loads(level2.minio_client.get_object(level2.DERIVED_BUCKET, entry["meta_key"]).read())
+    grid = grid_from_meta(meta.get("grid", {}))
+    if grid is None:
+        raise ValueError(f"{entry['cog_key']} is not on a mercator grid")
+    payload = level2.minio_client.get_object(level2.DERIVED_BUCKET, entry["cog_key"]).read()
+    with MemoryFile(payload) as mem, mem.open() as src:
+        band = src.read(1)
+    encoding = meta["encoding"]
+    if encoding["dtype"] == "float32":
+        values = band.astype("float32", copy=False)
+        values[values == encoding["nodata"]] = np.nan
+    else:
+        values = Quantization(**encoding).decode(band)
+    return grid, values
+
+
+def _union_bbox(boxes: list[list[float]]) -> list[float]:
+    west, south, east, north = zip(*boxes, strict=True)
+    return [min(west), min(south), max(east), max(north)]
+
+
+def publish_composite(key: str, members: dict[str, dict]) -> dict | None:
+    """Composite and upload bin ``key`` from its member frames; return its index entry.
+
+    Members that cannot be read are left out; returns ``None`` when none can be.
+    """
+    layers, used = [], {}
+    for site, entry in sorted(members.items()):
+        try:
+            layers.append(_read_member(entry))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Leaving %s %s out of composite %s: %s", site, entry["timestamp_key"], key, exc)
+            continue
+        used[site] = entry
+    if not layers:
+        return None
+    grid, merged = merge_frames(layers)
+
+    valid = np.isfinite(merged)
+    quantization = level2.REFLECTIVITY_ENCODINGS.get(level2.OUTPUT_DTYPE)
+    if quantization is not None:
+        arr = quantization.encode(merged, valid)
+        nodata = quantization.nodata
+        encoding = quantization.describe()
+    else:
+        arr = np.where(valid, merged, np.float32(level2.FLOAT_NODATA))
+        nodata = level2.FLOAT_NODATA
+        encoding = {"dtype": "float32", "scale": 1.0, "offset": 0.0, "nodata": nodata}
+
+    cog_key = f"{COMPOSITE_PREFIX}/{key}/mosaic.tif"
+    meta_key = f"{COMPOSITE_PREFIX}/{key}/mosaic.json"
+    occupancy_key = f"{COMPOSITE_PREFIX}/{key}/mosaic_occupancy.json"
+    encoded = encode_cog(
+        arr,
+        transform=from_origin(*grid.origin_m, grid.resolution_m, grid.resolution_m),
+        crs="EPSG:3857",
+        nodata=nodata,
+        blocksize=level2.COG_BLOCKSIZE,
+        scale=encoding["scale"] if quantization else None,
+        offset=encoding["offset"] if quantization else None,
+        tags={"field": "reflectivity", "units": "dBZ", **{f"encoding_{k}": v for k, v in encoding.items()}},
+    )
+    boxes = [e["bbox"] for e in used.values() if e.get("bbox")]
+    occupancy = occupancy_document(
+        _union_bbox(boxes) if boxes else [-180.0, -85.0, 180.0, 85.0],
+        tile_occupancy(valid, grid, level2.OCCUPANCY_MIN_ZOOM, level2.OCCUPANCY_MAX_ZOOM),
+        valid_pixels=int(valid.sum()),
+    )
+    members_meta = {site: e["timestamp_key"] for site, e in used.items()}
+    meta = {
+        "timestamp_key": key,
+        "product": "NEXRAD Level II composite",
+        "field": "reflectivity",
+        "units": "dBZ",
+        "rescale": [-30, 75],
+        "encoding": encoding,
+        "grid": {
+            "projection": "mercator",
+            "zoom": grid.zoom,
+            "tile_size": grid.tile_size,
+            "blocksize": level2.COG_BLOCKSIZE,
+            "tiles": [grid.tile_x0, grid.tile_y0, grid.tiles_x, grid.tiles_y],
+            "resolution_m": grid.resolution_m,
+        },
+        "bin_minutes": BIN_MINUTES,
+        "members": members_meta,
+        "cog_key": cog_key,
+        "cog_bytes": encoded.nbytes,
+        "bbox": occupancy["bbox"],
+        "occupancy_key": occupancy_key,
+    }
+
+    client = level2.minio_client
+    client.put_object(level2.DERIVED_BUCKET, cog_key, encoded.stream(), encoded.nbytes, content_type="image/tiff")
+    for object_key, doc in ((meta_key, meta), (occupancy_key, occupancy)):
+        blob = json.dumps(doc, separators=(",", ":")).encode()
+        client.put_object(
+            level2.DERIVED_BUCKET, object_key, io.BytesIO(blob), len(blob), content_type="application/json"
+        )
+    logger.info(
+        "Published composite %s from %d sites (%d bytes, encoded in %.3fs)",
+        cog_key,
+        len(used),
+        encoded.nbytes,
+        encoded.encode_seconds,
+    )
+    return {
+        "timestamp_key": key,
+        "cog_key": cog_key,
+        "meta_key": meta_key,
+        "tile_template": f"/tiles/weather/mrms-reflq/{key}/{{z}}/{{x}}/{{y}}.png",
+        "bbox": occupancy["bbox"],
+        "members": members_meta,
+    }
+
+
+def load_composite_index() -> list[dict]:
+    try:
+        return json.loads(level2.minio_client.get_object(level2.DERIVED_BUCKET, INDEX_KEY).read())
+    except Exception:
+        return []
+
+
+def save_composite_index(frames: list[dict]) -> None:
+    payload = json.dumps(frames[-level2.MAX_FRAMES :], separators=(",", ":")).encode()
+    level2.minio_client.put_object(
+        level2.DERIVED_BUCKET, INDEX_KEY, io.BytesIO(payload), len(payload), content_type="application/json"
+    )
+
+
+def run_nexrad_composite(sites: list[str] | None = None, bins: int = COMPOSITE_BINS) -> dict:
+    """Composite the newest ``bins`` time bins of ``sites`` (default: the configured group)."""
+    sites = [s.upper() for s in (sites or COMPOSITE_SITES)]
+    binned = bin_members({site: level2.load_frames_index(site) for site in sites}, BIN_MINUTES)
+    existing = load_composite_index()
+    published = {f["timestamp_key"]: f.get("members") for f in existing}
+    added = []
+    for key in sorted(binned)[-bins:]:
+        members = binned[key]
+        if published.get(key) == {site: e["timestamp_key"] for site, e in members.items()}:
+            continue
+        entry = publish_composite(key, members)
+        if entry is None:
+            continue
+        existing = [f for f in existing if f["timestamp_key"] != key]
+        existing.append(entry)
+        added.append(entry)
+    existing.sort(key=lambda f: f["timestamp_key"])  # newest last
+    if added:
+        save_composite_index(existing)
+        request_prewarm("mrms-reflq", [f["timestamp_key"] for f in added])
+    return {
+        "sites": sites,
+        "bin_minutes": BIN_MINUTES,
+        "added": len(added),
+        "total_frames": len(existing),
+        "frames": existing[-level2.MAX_FRAMES :],
+    }
+
+
+__all__ = ["run_nexrad_composite"]
@@ -1,14 +1,21 @@
 """NEXRAD Level II ingestion pipeline using unsigned public AWS Open Data.
 
 Responsibilities:
-- Discover recent volume files for a radar site within lookback window.
-- Convert latest new volumes to gridded reflectivity arrays.
-- Write each frame as a COG (current: pseudo local planar CRS placeholder) to MinIO.
+- Discover recent volume files for a radar site within lookback window, listing
+  incrementally from a per-site cursor (see ``atmos_ingestion.listing``).
+- Convert latest new volumes to gridded reflectivity arrays via cached polar-to-grid
+  lookup tables (see ``atmos_ingestion.gridding``).
+- Write each frame as a COG to MinIO, by default on a Web-Mercator grid whose pixels
+  coincide with the XYZ tiles of ``NEXRAD_GRID_ZOOM`` and whose 512-px blocks are single
+  512-px (``@2x``) tiles one zoom out.
+- Cache upstream volumes locally and in the raw bucket so reprocessing never re-downloads.
+- Overlap download, decode/grid/encode and upload of new volumes in a bounded pipeline.
+- Publish a footprint and per-zoom tile occupancy bitmap with every frame so the tiler
+  can answer empty tiles without reading the COG (see ``atmos_ingestion.occupancy``).
 - Maintain a rolling frames index JSON for animation.
+- Ask the tiler to pre-render the tiles of newly indexed frames (see ``atmos_ingestion.prewarm``).
 
 Future improvements:
-- Reproject to real geographic / WebMercator coordinates.
-- Parallelization & performance tuning.
 - Multi-site orchestration & retention policy.
 """
 from __future__ import annotations
@@ -18,6 +25,9 @@ import io
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 
 import boto3
 import numpy as np
@@ -26,10 +36,17 @@ from botocore import UNSIGNED
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from minio import Minio  # type: ignore
-from rasterio.enums import Resampling
-from rasterio.io import MemoryFile
 from rasterio.transform import from_origin
 
+from ..cog import EncodedCog, Quantization, encode_cog
+from ..gridding import GridConfig, GridIndexCache, MercatorGrid, MercatorGridConfig, Sweep
+from ..level2 import Level2DecodeError, decompress_volume, read_lowest_sweep
+from ..listing import SiteListing
+from ..occupancy import footprint_bbox, occupancy_document, tile_occupancy
+from ..pipeline import Stage, run_pipeline
+from ..prewarm import request_prewarm
+from ..rawcache import RecordingReader, cache_name, shared_raw_cache
+
 
 class RadarSourceAccessError(Exception):
     """Raised when the upstream NEXRAD source bucket cannot be accessed with current configuration."""
@@ -44,13 +61,55 @@ MAX_FRAMES = int(os.getenv("NEXRAD_MAX_FRAMES", "10"))
 LOOKBACK_MINUTES_DEFAULT = int(os.getenv("NEXRAD_LOOKBACK_MINUTES", "60"))
 GRID_RES_KM = float(os.getenv("NEXRAD_GRID_RES_KM", "1"))
 GRID_RADIUS_KM = float(os.getenv("NEXRAD_GRID_RADIUS_KM", "300"))
+# "mercator": EPSG:3857 tile-aligned at NEXRAD_GRID_ZOOM (~1.2 km pixels at zoom 7);
+# "planar": radar-centred azimuthal equidistant grid at NEXRAD_GRID_RES_KM.
+GRID_PROJECTION = os.getenv("NEXRAD_GRID_PROJECTION", "mercator").lower()
+GRID_ZOOM = int(os.getenv("NEXRAD_GRID_ZOOM", "7"))
+# Mercator COG block size: 512 makes a 512-px tile one block read and a 256-px tile a
+# quarter of one; 256 matches 256-px tiles exactly. Multiple of 256.
+COG_BLOCKSIZE = int(os.getenv("NEXRAD_COG_BLOCKSIZE", "512"))
+# Tile occupancy bitmaps published next to each frame (mercator grid only).
+OCCUPANCY_MIN_ZOOM = int(os.getenv("NEXRAD_OCCUPANCY_MIN_ZOOM", "3"))
+OCCUPANCY_MAX_ZOOM = int(os.getenv("NEXRAD_OCCUPANCY_MAX_ZOOM", "10"))
 NEXRAD_BUCKET_NAME = os.getenv("NEXRAD_BUCKET_NAME", "unidata-nexrad-level2")
+GRID_CACHE_DIR = os.getenv("NEXRAD_GRID_CACHE_DIR", "/tmp/atmos/grid-index")
+GRID_CACHE_STORE = os.getenv("NEXRAD_GRID_CACHE_STORE", "true").lower() in ("1", "true", "yes")
+GRID_INDEX_PREFIX = "cache/grid-index"
+# "lean" streams only the lowest REF sweep (atmos_ingestion.level2); "pyart" decodes the full volume.
+DECODER = os.getenv("NEXRAD_DECODER", "lean").lower()
+# bzip2 releases the GIL, so LDM records are decompressed on a shared thread pool.
+DECOMPRESS_WORKERS = int(os.getenv("NEXRAD_DECOMPRESS_WORKERS", str(os.cpu_count() or 2)))
+# Frame storage: float32 dBZ, or integer codes (value = code * scale + offset, 0 = nodata).
+# uint8 matches the 0.5 dB resolution of Level II reflectivity, so it is lossless here.
+OUTPUT_DTYPE = os.getenv("NEXRAD_OUTPUT_DTYPE", "uint8").lower()
+REFLECTIVITY_ENCODINGS = {
+    "uint8": Quantization("uint8", scale=0.5, offset=-33.0, nodata=0),
+    "uint16": Quantization("uint16", scale=0.01, offset=-50.0, nodata=0),
+}
+FLOAT_NODATA = -9999.0
+# Read-through cache of upstream volumes (local disk LRU + the raw bucket).
+RAW_BUCKET = os.getenv("S3_BUCKET_RAW", "raw")
+RAW_CACHE_DIR = os.getenv("RAW_CACHE_DIR", "/tmp/atmos/raw-cache")
+RAW_CACHE_MAX_MB = int(os.getenv("RAW_CACHE_MAX_MB", "2048"))
+RAW_CACHE_STORE = os.getenv("RAW_CACHE_STORE", "true").lower() in ("1", "true", "yes")
+# Pipeline sizing: downloads and uploads are network bound, rendering is CPU bound.
+FETCH_WORKERS = int(os.getenv("NEXRAD_FETCH_WORKERS", "4"))
+RENDER_WORKERS = int(os.getenv("NEXRAD_RENDER_WORKERS", "2"))
+PUBLISH_WORKERS = int(os.getenv("NEXRAD_PUBLISH_WORKERS", "4"))
+PIPELINE_QUEUE_DEPTH = int(os.getenv("NEXRAD_PIPELINE_QUEUE_DEPTH", "2"))
 # Request payer and credentials are intentionally ignored; bucket must be fully public per local policy.
 
 logger = logging.getLogger("nexrad_level2")
 
 DERIVED_BUCKET = os.getenv("S3_BUCKET_DERIVED", "derived")
 
+if OUTPUT_DTYPE != "float32" and OUTPUT_DTYPE not in REFLECTIVITY_ENCODINGS:
+    logger.warning("Unknown NEXRAD_OUTPUT_DTYPE %r; writing float32 frames", OUTPUT_DTYPE)
+
+_decompress_executor = ThreadPoolExecutor(
+    max_workers=max(1, DECOMPRESS_WORKERS), thread_name_prefix="nexrad-bz2"
+)
+
 _unsigned_cfg = Config(signature_version=UNSIGNED, retries={"max_attempts": 5, "mode": "standard"})
 _s3_unsigned = None  # type: ignore
 
@@ -74,6 +133,52 @@ minio_client = Minio(
 )
 
 
+class _MinioBlobStore:
+    """Persist cache entries under a MinIO bucket prefix so fresh workers can reuse them."""
+
+    def __init__(self, bucket: str, prefix: str = ""):
+        self._bucket = bucket
+        self._prefix = prefix
+
+    def _key(self, name: str) -> str:
+        return f"{self._prefix}/{name}" if self._prefix else name
+
+    def load(self, name: str) -> bytes | None:
+        try:
+            return minio_client.get_object(self._bucket, self._key(name)).read()
+        except Exception:
+            return None
+
+    def save(self, name: str, payload: bytes) -> None:
+        minio_client.put_object(
+            self._bucket,
+            self._key(name),
+            io.BytesIO(payload),
+            len(payload),
+            content_type="application/octet-stream",
+        )
+
+
+site_listing = SiteListing(lambda: _get_s3(), NEXRAD_BUCKET_NAME)
+
+GRID_CONFIG = GridConfig(radius_km=GRID_RADIUS_KM, resolution_km=GRID_RES_KM)
+# Snap the tile window to whole blocks. Aligning the first overview's blocks too would
+# double the snap and inflate high-latitude grids past the tiler's whole-frame budget
+# (TILER_FRAME_MAX_PIXELS), and frames in that cache are cut from memory at every zoom.
+MERCATOR_GRID = MercatorGridConfig(
+    zoom=GRID_ZOOM, radius_km=GRID_RADIUS_KM, align_tiles=max(1, COG_BLOCKSIZE // 256)
+)
+grid_index_cache = GridIndexCache(
+    cache_dir=Path(GRID_CACHE_DIR) if GRID_CACHE_DIR else None,
+    store=_MinioBlobStore(DERIVED_BUCKET, GRID_INDEX_PREFIX) if GRID_CACHE_STORE else None,
+)
+raw_cache = shared_raw_cache(
+    cache_dir=Path(RAW_CACHE_DIR) if RAW_CACHE_DIR else None,
+    max_bytes=RAW_CACHE_MAX_MB << 20,
+    store=_MinioBlobStore(RAW_BUCKET) if RAW_CACHE_STORE else None,
+)
+
+
 def _frames_index_key(site: str) -> str:
     return f"{INDEX_PREFIX}/{site}/frames.json"
 
@@ -99,53 +204,21 @@ def save_frames_index(site: str, frames: list[dict]):
 def list_recent_site_objects(site: str, lookback_minutes: int) -> list[dict]:
     site = site.upper()
     now = dt.datetime.utcnow()
-    date = now.date()
-    prefix = f"{date:%Y/%m/%d}/{site}/"
-    # Anonymous listing only (no credential fallback by policy)
-    paginator = _get_s3().get_paginator("list_objects_v2")
-    objs: list[dict] = []
-
-    # First, collect ALL objects to sort them by timestamp (newest first)
-    all_objects = []
-    while True:
-        try:
-            paginate_kwargs = {"Bucket": NEXRAD_BUCKET_NAME, "Prefix": prefix}
-            for page in paginator.paginate(**paginate_kwargs):
-                for c in page.get("Contents", []):
-                    fname = c["Key"].rsplit("/", 1)[-1]
-                    try:
-                        ts_str = fname[len(site) : len(site) + 15]  # YYYYMMDD_HHMMSS
-                        ts = dt.datetime.strptime(ts_str, "%Y%m%d_%H%M%S")
-                        all_objects.append({"key": c["Key"], "ts": ts})
-                    except Exception:
-                        continue
-            break
-        except ClientError as e:
-            code = getattr(e, "response", {}).get("Error", {}).get("Code")
-            message = (
-                f"Failed to list objects in public bucket '{NEXRAD_BUCKET_NAME}' prefix '{prefix}' (code={code}). "
-                "Bucket must be publicly listable; local policy forbids credential fallback."
-            )
-            logger.error(message)
-            raise RadarSourceAccessError(message, code=code) from e
-
-    # Sort by timestamp (newest first) and filter efficiently
-    all_objects.sort(key=lambda o: o["ts"], reverse=True)
     cutoff_time = now - dt.timedelta(minutes=lookback_minutes)
+    # Anonymous listing only (no credential fallback by policy)
+    try:
+        found = site_listing.recent(site, cutoff_time, now)
+    except ClientError as e:
+        code = getattr(e, "response", {}).get("Error", {}).get("Code")
+        message = (
+            f"Failed to list objects in public bucket '{NEXRAD_BUCKET_NAME}' for site '{site}' (code={code}). "
+            "Bucket must be publicly listable; local policy forbids credential fallback."
+        )
+        logger.error(message)
+        raise RadarSourceAccessError(message, code=code) from e
 
-    for obj in all_objects:
-        if obj["ts"] >= cutoff_time:
-            objs.append(obj)
-        else:
-            # Since objects are sorted newest first, we can stop when we hit older data
-            break
-        # Also limit the total number of objects we consider
-        if len(objs) >= MAX_FRAMES * 2:
-            break
-
-    # Return in oldest -> newest order for processing
-    objs.reverse()
-    return objs
+    # Only the newest volumes are candidates; return them oldest -> newest for processing
+    return [{"key": key, "ts": ts} for ts, key in found[-MAX_FRAMES * 2 :]]
 
 
 def _timestamp_key(site: str, key: str) -> str:
@@ -158,7 +231,25 @@ def _already_have(frames: list[dict], ts_key: str) -> bool:
     return any(f["timestamp_key"] == ts_key for f in frames)
 
 
-def process_volume(site: str, key: str) -> dict:
+def _sweep_from_pyart(site: str, radar, field_name: str) -> Sweep:
+    """Extract the lowest sweep of ``field_name`` from a Py-ART radar object."""
+    sweep_slice = radar.get_slice(0)
+    data = np.ma.masked_invalid(np.ma.asarray(radar.fields[field_name]["data"][sweep_slice], dtype="float32"))
+    ranges = radar.range["data"]
+    return Sweep(
+        site=site,
+        vcp=radar.metadata.get("vcp_pattern"),
+        elevation_deg=float(radar.fixed_angle["data"][0]),
+        azimuths=np.asarray(radar.azimuth["data"][sweep_slice], dtype="float64"),
+        first_gate_m=float(ranges[0]),
+        gate_spacing_m=float(ranges[1] - ranges[0]),
+        data=data.filled(np.nan),
+        latitude=float(radar.latitude["data"][0]),
+        longitude=float(radar.longitude["data"][0]),
+    )
+
+
+def _get_source_object(key: str) -> dict:
     client = _get_s3()
     try:
         obj = client.get_object(Bucket=NEXRAD_BUCKET_NAME, Key=key)
@@ -170,8 +261,18 @@ def process_volume(site: str, key: str) -> dict:
         )
         logger.error(message)
         raise RadarSourceAccessError(message, code=code) from e
-    raw = io.BytesIO(obj["Body"].read())
-    radar = pyart.io.read_nexrad_archive(raw)
+    return obj
+
+
+def fetch_volume(key: str) -> bytes:
+    """Return the raw Archive II volume for ``key``, downloading it only on a cache miss."""
+    return raw_cache.fetch(NEXRAD_BUCKET_NAME, key, lambda: _get_source_object(key)["Body"].read())
+
+
+def decode_volume(site: str, raw: bytes) -> Sweep:
+    """Decode a full volume with Py-ART and return its lowest reflectivity sweep."""
+    # Hand Py-ART an already decompressed stream so it skips its serial bzip2 pass.
+    radar = pyart.io.read_nexrad_archive(io.BytesIO(decompress_volume(raw, _decompress_executor)))
     field_name = "reflectivity"
     if field_name not in radar.fields:
         # attempt alias
@@ -181,113 +282,208 @@ def process_volume(site: str, key: str) -> dict:
                 break
         else:
             raise RuntimeError("No reflectivity-like field found in radar volume")
+    return _sweep_from_pyart(site, radar, field_name)
 
-    grid = pyart.map.grid_from_radars(
-        (radar,),
-        grid_shape=(1, int(GRID_RADIUS_KM / GRID_RES_KM * 2) + 1, int(GRID_RADIUS_KM / GRID_RES_KM * 2) + 1),
-        grid_limits=(
-            (0, 0),
-            (-GRID_RADIUS_KM * 1000, GRID_RADIUS_KM * 1000),
-            (-GRID_RADIUS_KM * 1000, GRID_RADIUS_KM * 1000),
-        ),
-        fields=[field_name],
-        weighting_function="Nearest",
-    )
-    data = grid.fields[field_name]["data"][0]
-    arr_f = data.filled(np.nan)
-    nodata = -9999.0
-    arr = np.where(np.isfinite(arr_f), arr_f, nodata).astype("float32")
 
-    # Local planar transform placeholder (improvement: real projection + warp)
-    res_m = GRID_RES_KM * 1000
-    transform = from_origin(-GRID_RADIUS_KM * 1000, GRID_RADIUS_KM * 1000, res_m, res_m)
+def fetch_sweep(site: str, key: str) -> Sweep:
+    """Stream ``key`` and decode only its lowest REF sweep, abandoning the rest of the download.
+
+    The consumed prefix of the volume is cached, so reprocessing needs no upstream read.
+    Volumes the lean reader cannot handle (e.g. legacy Message 1 archives) are fetched in
+    full and decoded with Py-ART instead.
+    """
+    full_name = cache_name(NEXRAD_BUCKET_NAME, key)
+    prefix_name = cache_name(NEXRAD_BUCKET_NAME, key, "lowest-sweep")
+    cached = raw_cache.load([prefix_name, full_name])
+    if cached is not None:
+        try:
+            return read_lowest_sweep(io.BytesIO(cached), site, _decompress_executor)
+        except Level2DecodeError as exc:
+            logger.info("Lean Level II reader could not decode %s (%s); falling back to Py-ART", key, exc)
+        return decode_volume(site, fetch_volume(key))
+
+    body = RecordingReader(_get_source_object(key)["Body"])
+    try:
+        try:
+            sweep = read_lowest_sweep(body, site, _decompress_executor)
+        except Level2DecodeError as exc:
+            logger.info("Lean Level II reader could not decode %s (%s); falling back to Py-ART", key, exc)
+            # Finish the download we already started instead of requesting the volume again.
+            raw = body.recorded() + body.read()
+            raw_cache.count_upstream(len(raw))
+            raw_cache.save(full_name, raw)
+            return decode_volume(site, raw)
+        prefix = body.recorded()
+    finally:
+        body.close()
+    raw_cache.count_upstream(len(prefix))
+    raw_cache.save(prefix_name, prefix)
+    return sweep
+
+
+def fetch_source(site: str, key: str) -> bytes | Sweep:
+    """Fetch stage: a decoded sweep (lean decoder) or the raw volume bytes (Py-ART)."""
+    if DECODER == "lean":
+        return fetch_sweep(site, key)
+    return fetch_volume(key)
+
+
+@dataclass
+class RenderedFrame:
+    """A decoded, gridded and encoded frame that is ready to upload."""
+
+    site: str
+    ts_key: str
+    cog_key: str
+    meta_key: str
+    cog: EncodedCog
+    meta: dict
+    occupancy: dict | None = None
+
+    @property
+    def occupancy_key(self) -> str:
+        return self.cog_key.rsplit("/", 1)[0] + "/tilt0_occupancy.json"
+
+
+def _output_grid(sweep: Sweep) -> tuple[GridConfig | MercatorGrid, str, dict]:
+    """Return the output grid for ``sweep``, its CRS and a description for the metadata."""
+    if GRID_PROJECTION == "planar":
+        crs = (
+            f"+proj=aeqd +lat_0={sweep.latitude} +lon_0={sweep.longitude} "
+            "+x_0=0 +y_0=0 +R=6371000 +units=m +no_defs"
+        )
+        return GRID_CONFIG, crs, {"projection": "planar", "resolution_m": GRID_CONFIG.resolution_m}
+    grid = MERCATOR_GRID.for_site(sweep.latitude, sweep.longitude)
+    return grid, "EPSG:3857", {
+        "projection": "mercator",
+        "zoom": grid.zoom,
+        "tile_size": grid.tile_size,
+        "blocksize": COG_BLOCKSIZE,
+        "tiles": [grid.tile_x0, grid.tile_y0, grid.tiles_x, grid.tiles_y],
+        "resolution_m": grid.resolution_m,
+    }
+
+
+def render_volume(site: str, key: str, source: bytes | Sweep) -> RenderedFrame:
+    """Grid the lowest reflectivity sweep of ``source`` and encode the frame COG."""
+    sweep = source if isinstance(source, Sweep) else decode_volume(site, source)
+    grid, crs, grid_meta = _output_grid(sweep)
+    arr = grid_index_cache.grid(sweep, grid, FLOAT_NODATA)
+    valid = arr != FLOAT_NODATA
+    quantization = REFLECTIVITY_ENCODINGS.get(OUTPUT_DTYPE)
+    if quantization is not None:
+        arr = quantization.encode(arr, valid)
+        nodata = quantization.nodata
+        encoding = quantization.describe()
+    else:
+        nodata = FLOAT_NODATA
+        encoding = {"dtype": "float32", "scale": 1.0, "offset": 0.0, "nodata": nodata}
+
+    transform = from_origin(*grid.origin_m, grid.resolution_m, grid.resolution_m)
 
     ts_key = _timestamp_key(site, key)
     # Canonical object layout: nexrad/<SITE>/<TIMESTAMP>/tilt0_reflectivity.* inside the 'derived' bucket
     cog_key = f"nexrad/{site}/{ts_key}/tilt0_reflectivity.tif"
     meta_key = f"nexrad/{site}/{ts_key}/tilt0_reflectivity.json"
 
-    profile = {
-        "driver": "GTiff",
-        "height": arr.shape[0],
-        "width": arr.shape[1],
-        "count": 1,
-        "dtype": "float32",
-        "crs": "EPSG:3857",  # placeholder
-        "transform": transform,
-        "nodata": nodata,
-        "tiled": True,
-        "compress": "DEFLATE",
-        "blockxsize": 256,
-        "blockysize": 256,
-    }
+    encoded = encode_cog(
+        arr,
+        transform=transform,
+        crs=crs,
+        nodata=nodata,
+        blocksize=COG_BLOCKSIZE if isinstance(grid, MercatorGrid) else 256,
+        scale=encoding["scale"] if quantization else None,
+        offset=encoding["offset"] if quantization else None,
+        tags={"field": "reflectivity", "units": "dBZ", **{f"encoding_{k}": v for k, v in encoding.items()}},
+    )
 
-    with MemoryFile() as mem:
-        with mem.open(**profile) as dst:
-            dst.write(arr, 1)
-            dst.build_overviews([2, 4, 8, 16], Resampling.average)
-
-        # Create COG in memory using updated profile
-        cog_profile = profile.copy()
-        cog_profile.update({
-            "driver": "COG",
-            "compress": "DEFLATE",
-            "BLOCKSIZE": 256,
-        })
-
-        with MemoryFile() as cog_mem:
-            with cog_mem.open(**cog_profile) as cog_dst:
-                with mem.open() as src:
-                    cog_dst.write(src.read(1), 1)
-                    cog_dst.build_overviews([2, 4, 8, 16], Resampling.average)
-
-            payload = cog_mem.read()
-            minio_client.put_object(
-                DERIVED_BUCKET, cog_key, io.BytesIO(payload), len(payload), content_type="image/tiff"
-            )
+    bbox = footprint_bbox(sweep.latitude, sweep.longitude, GRID_RADIUS_KM)
+    zooms = (
+        tile_occupancy(valid, grid, OCCUPANCY_MIN_ZOOM, OCCUPANCY_MAX_ZOOM)
+        if isinstance(grid, MercatorGrid)
+        else None
+    )
+    occupancy = occupancy_document(bbox, zooms, valid_pixels=int(valid.sum()))
 
     meta = {
         "site": site,
         "timestamp_key": ts_key,
         "product": "NEXRAD Level II",
-        "field": field_name,
+        "field": "reflectivity",
         "units": "dBZ",
         "rescale": [-30, 75],
+        "encoding": encoding,
+        "grid": grid_meta,
         "cog_key": cog_key,
+        "cog_bytes": encoded.nbytes,
+        "bbox": occupancy["bbox"],
+        "occupancy_key": f"nexrad/{site}/{ts_key}/tilt0_occupancy.json",
     }
-    blob = json.dumps(meta, separators=(",", ":")).encode()
+    return RenderedFrame(site, ts_key, cog_key, meta_key, encoded, meta, occupancy)
+
+
+def publish_frame(frame: RenderedFrame) -> dict:
+    """Upload a rendered frame's COG and metadata; return its frames-index entry."""
     minio_client.put_object(
-        DERIVED_BUCKET, meta_key, io.BytesIO(blob), len(blob), content_type="application/json"
+        DERIVED_BUCKET, frame.cog_key, frame.cog.stream(), frame.cog.nbytes, content_type="image/tiff"
     )
-
+    logger.info(
+        "Published %s (%d bytes, encoded in %.3fs)", frame.cog_key, frame.cog.nbytes, frame.cog.encode_seconds
+    )
+    blob = json.dumps(frame.meta, separators=(",", ":")).encode()
+    minio_client.put_object(
+        DERIVED_BUCKET, frame.meta_key, io.BytesIO(blob), len(blob), content_type="application/json"
+    )
+    if frame.occupancy is not None:
+        blob = json.dumps(frame.occupancy, separators=(",", ":")).encode()
+        minio_client.put_object(
+            DERIVED_BUCKET, frame.occupancy_key, io.BytesIO(blob), len(blob), content_type="application/json"
+        )
     return {
-        "timestamp_key": ts_key,
-        "cog_key": cog_key,
-        "meta_key": meta_key,
-        "tile_template": f"/tiles/weather/nexrad-{site}/{ts_key}/{{z}}/{{x}}/{{y}}.png",
+        "timestamp_key": frame.ts_key,
+        "cog_key": frame.cog_key,
+        "meta_key": frame.meta_key,
+        "tile_template": f"/tiles/weather/nexrad-{frame.site}/{frame.ts_key}/{{z}}/{{x}}/{{y}}.png",
+        # Coverage footprint, used by the tiler to pick sites for nexrad-mosaic tiles.
+        "bbox": frame.meta.get("bbox"),
     }
 
 
+def process_volume(site: str, key: str) -> dict:
+    """Fetch, render and publish a single volume synchronously."""
+    return publish_frame(render_volume(site, key, fetch_source(site, key)))
+
+
+def _volume_stages(site: str) -> list[Stage]:
+    return [
+        Stage("fetch", lambda key: (key, fetch_source(site, key)), workers=FETCH_WORKERS),
+        Stage("render", lambda fetched: render_volume(site, *fetched), workers=RENDER_WORKERS),
+        Stage("publish", publish_frame, workers=PUBLISH_WORKERS),
+    ]
+
+
 def run_nexrad_level2(site: str, lookback_minutes: int, max_new: int) -> dict:
     site = site.upper()
     existing = load_frames_index(site)
     objects = list_recent_site_objects(site, lookback_minutes)
+    pending = [
+        o["key"] for o in objects if not _already_have(existing, _timestamp_key(site, o["key"]))
+    ]
     added = []
-    for o in objects:
-        ts_key = _timestamp_key(site, o["key"])
-        if _already_have(existing, ts_key):
-            continue
-        try:
-            frame = process_volume(site, o["key"])
-            existing.append(frame)
-            added.append(frame)
-        except Exception:
-            continue
-        if len(added) >= max_new:
-            break
+    # Volumes flow through fetch -> render -> publish concurrently; failed volumes are
+    # replaced from the remaining candidates until max_new frames have been produced.
+    while pending and len(added) < max_new:
+        wanted = max_new - len(added)
+        batch, pending = pending[:wanted], pending[wanted:]
+        for result in run_pipeline(batch, _volume_stages(site), queue_depth=PIPELINE_QUEUE_DEPTH):
+            if result.ok:
+                existing.append(result.value)
+                added.append(result.value)
     existing.sort(key=lambda f: f["timestamp_key"])  # newest last
     if added:
         save_frames_index(site, existing)
+        # Render the new frames' tiles before viewers switch to them.
+        request_prewarm(f"nexrad-{site}", [f["timestamp_key"] for f in added])
     return {"site": site, "added": len(added), "total_frames": len(existing), "frames": existing[-MAX_FRAMES:]}
 
 
@@ -0,0 +1,451 @@
+"""Lean NEXRAD Archive II reader for the lowest reflectivity sweep.
+
+The published product only needs REF from the first elevation cut, yet
+``pyart.io.read_nexrad_archive`` decompresses and decodes every record, sweep and
+moment in the volume. This reader walks the Archive II volume header and LDM records
+incrementally, parses Message 31 radials with NumPy structured dtypes, decodes only
+the ``REF`` moment of elevation 1 and stops as soon as that sweep is complete, so the
+remainder of the volume is neither decompressed nor (when reading from a network
+stream) downloaded.
+
+Structures follow the RDA/RPG ICD (2620002) Message 31 tables and mirror the layouts
+used by Py-ART, which remains the fallback decoder and the correctness oracle in tests.
+"""
+from __future__ import annotations
+
+import bz2
+import struct
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, Future
+from typing import BinaryIO
+
+import numpy as np
+
+from .gridding import Sweep
+
+VOLUME_HEADER_SIZE = 24
+CONTROL_WORD_SIZE = 4
+CTM_SIZE = 12
+RECORD_SIZE = 2432  # fixed-size (non Message 31) messages, including the CTM prefix
+UNCOMPRESSED_CHUNK = 1 << 18
+
+MSG_HEADER = np.dtype(
+    [
+        ("size", ">u2"),  # halfwords, including this 16-byte header
+        ("channels", "u1"),
+        ("type", "u1"),
+        ("seq_id", ">u2"),
+        ("date", ">u2"),
+        ("ms", ">u4"),
+        ("segments", ">u2"),
+        ("seg_num", ">u2"),
+    ]
+)
+
+MSG31_HEADER = np.dtype(
+    [
+        ("id", "S4"),
+        ("collect_ms", ">u4"),
+        ("collect_date", ">u2"),
+        ("azimuth_number", ">u2"),
+        ("azimuth_angle", ">f4"),
+        ("compress_flag", "u1"),
+        ("spare_0", "u1"),
+        ("radial_length", ">u2"),
+        ("azimuth_resolution", "u1"),
+        ("radial_status", "u1"),
+        ("elevation_number", "u1"),
+        ("cut_sector", "u1"),
+        ("elevation_angle", ">f4"),
+        ("radial_blanking", "u1"),
+        ("azimuth_mode", "i1"),
+        ("block_count", ">u2"),
+        ("block_pointers", ">u4", (10,)),
+    ]
+)
+
+GENERIC_DATA_BLOCK = np.dtype(
+    [
+        ("block_type", "S1"),
+        ("data_name", "S3"),
+        ("reserved", ">u4"),
+        ("ngates", ">u2"),
+        ("first_gate", ">i2"),
+        ("gate_spacing", ">i2"),
+        ("thresh", ">i2"),
+        ("snr_thres", ">i2"),
+        ("flags", "u1"),
+        ("word_size", "u1"),
+        ("scale", ">f4"),
+        ("offset", ">f4"),
+    ]
+)
+
+VOLUME_DATA_BLOCK = np.dtype(
+    [
+        ("block_type", "S1"),
+        ("data_name", "S3"),
+        ("lrtup", ">u2"),
+        ("version_major", "u1"),
+        ("version_minor", "u1"),
+        ("lat", ">f4"),
+        ("lon", ">f4"),
+        ("height", ">i2"),
+        ("feedhorn_height", ">u2"),
+        ("refl_calib", ">f4"),
+        ("power_h", ">f4"),
+        ("power_v", ">f4"),
+        ("diff_refl_calib", ">f4"),
+        ("init_phase", ">f4"),
+        ("vcp", ">u2"),
+        ("spare", "S2"),
+    ]
+)
+
+MSG5_HEADER = np.dtype(
+    [
+        ("msg_size", ">u2"),
+        ("pattern_type", ">u2"),
+        ("pattern_number", ">u2"),
+        ("num_cuts", ">u2"),
+        ("clutter_map_group", ">u2"),
+        ("doppler_vel_res", "u1"),
+        ("pulse_width", "u1"),
+        ("spare", "S10"),
+    ]
+)
+
+# Radial status codes (ICD Table XVII-A).
+END_OF_ELEVATION = 2
+END_OF_VOLUME = 4
+
+
+class Level2DecodeError(ValueError):
+    """Raised when a volume cannot be decoded by the lean reader (caller should fall back)."""
+
+
+def read_volume_header(stream: BinaryIO) -> dict[str, object]:
+    header = stream.read(VOLUME_HEADER_SIZE)
+    if len(header) < VOLUME_HEADER_SIZE or not header.startswith(b"AR2V"):
+        raise Level2DecodeError("Not an Archive II volume (missing AR2V header)")
+    tape, extension, date, ms, icao = struct.unpack(">9s3sII4s", header)
+    return {
+        "tape": tape.decode("ascii", "replace"),
+        "extension": extension.decode("ascii", "replace"),
+        "date": date,
+        "ms": ms,
+        "icao": icao.decode("ascii", "replace").strip("\x00 "),
+    }
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def iter_compressed_records(stream: BinaryIO) -> Iterator[bytes]:
+    """Yield the raw bzip2 payload of each LDM record following the volume header."""
+    while True:
+        control = _read_exact(stream, CONTROL_WORD_SIZE)
+        if len(control) < CONTROL_WORD_SIZE:
+            return
+        # The final record of a volume is flagged with a negative size.
+        size = abs(struct.unpack(">i", control)[0])
+        if size == 0:
+            return
+        payload = _read_exact(stream, size)
+        if len(payload) < size:
+            raise Level2DecodeError("Truncated LDM record")
+        yield payload
+
+
+def _decompress_record(payload: bytes | memoryview) -> bytes:
+    try:
+        return bz2.decompress(payload)
+    except (OSError, ValueError) as exc:
+        raise Level2DecodeError(f"Corrupt bzip2 record: {exc}") from exc
+
+
+def decompress_records(
+    records: Iterable[bytes | memoryview],
+    executor: Executor | None = None,
+    lookahead: int = 4,
+) -> Iterator[bytes]:
+    """Decompress LDM records in order, optionally fanning out across ``executor``.
+
+    ``bz2`` releases the GIL, so a thread pool decompresses records on several cores.
+    At most ``lookahead`` records are in flight, which bounds both memory and the work
+    wasted when the consumer stops early.
+    """
+    if executor is None:
+        for payload in records:
+            yield _decompress_record(payload)
+        return
+    window: deque[Future[bytes]] = deque()
+    try:
+        for payload in records:
+            window.append(executor.submit(_decompress_record, payload))
+            if len(window) >= max(1, lookahead):
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+    finally:
+        for future in window:
+            future.cancel()
+
+
+def is_compressed_volume(raw: bytes | memoryview) -> bool:
+    start = VOLUME_HEADER_SIZE + CONTROL_WORD_SIZE
+    return bytes(raw[start : start + 2]) == b"BZ"
+
+
+def split_compressed_records(raw: bytes | memoryview) -> list[memoryview]:
+    """Return zero-copy views of each bzip2 LDM record in an in-memory volume."""
+    view = memoryview(raw)
+    records: list[memoryview] = []
+    pos = VOLUME_HEADER_SIZE
+    while pos + CONTROL_WORD_SIZE <= len(view):
+        size = abs(struct.unpack_from(">i", view, pos)[0])
+        if size == 0:
+            break
+        start = pos + CONTROL_WORD_SIZE
+        if start + size > len(view):
+            raise Level2DecodeError("Truncated LDM record")
+        records.append(view[start : start + size])
+        pos = start + size
+    return records
+
+
+def decompress_volume(
+    raw: bytes,
+    executor: Executor | None = None,
+    lookahead: int = 8,
+) -> bytes:
+    """Return ``raw`` as an uncompressed Archive II volume, decompressing records in parallel.
+
+    The result keeps the original volume header followed by a zeroed 12-byte CTM prefix,
+    the layout Py-ART (and :func:`read_lowest_sweep`) treat as an uncompressed archive,
+    so downstream decoders skip their own serial bzip2 pass. Input that is already
+    uncompressed is returned unchanged.
+    """
+    if not is_compressed_volume(raw):
+        return raw
+    body = b"".join(decompress_records(split_compressed_records(raw), executor, lookahead))
+    return bytes(raw[:VOLUME_HEADER_SIZE]) + bytes(CTM_SIZE) + body[CTM_SIZE:]
+
+
+def iter_decompressed_records(
+    stream: BinaryIO,
+    executor: Executor | None = None,
+    lookahead: int = 4,
+) -> Iterator[bytes]:
+    """Yield decompressed message bytes for the volume, one LDM record at a time."""
+    first = _read_exact(stream, CONTROL_WORD_SIZE + 2)
+    if first[CONTROL_WORD_SIZE:] == b"BZ":
+        records = iter_compressed_records(_Prefixed(first, stream))
+        yield from decompress_records(records, executor, lookahead)
+    else:
+        # Uncompressed volume: messages follow the header directly.
+        yield first
+        while chunk := stream.read(UNCOMPRESSED_CHUNK):
+            yield chunk
+
+
+class _Prefixed:
+    """Re-prepend already consumed bytes to a stream."""
+
+    def __init__(self, prefix: bytes, stream: BinaryIO):
+        self._prefix = prefix
+        self._stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if not self._prefix:
+            return self._stream.read(size)
+        if size < 0:
+            data, self._prefix = self._prefix + self._stream.read(), b""
+            return data
+        data, self._prefix = self._prefix[:size], self._prefix[size:]
+        if len(data) < size:
+            data += self._stream.read(size - len(data))
+        return data
+
+
+class _SweepCollector:
+    """Accumulate elevation-1 REF radials from Message 31 records."""
+
+    def __init__(self) -> None:
+        self.azimuths: list[float] = []
+        self.elevations: list[float] = []
+        self.rows: list[np.ndarray] = []
+        self.moment: np.void | None = None
+        self.volume: np.void | None = None
+        self.vcp_from_msg5: int | None = None
+        self.fixed_angle_from_msg5: float | None = None
+        self.complete = False
+
+    def feed(self, buf: memoryview, pos: int, header: np.void) -> None:
+        start = pos + CTM_SIZE + MSG_HEADER.itemsize
+        end = pos + CTM_SIZE + int(header["size"]) * 2
+        msg = buf[start:end]
+        if len(msg) < MSG31_HEADER.itemsize:
+            raise Level2DecodeError("Truncated Message 31 header")
+        radial = np.frombuffer(msg, MSG31_HEADER, count=1)[0]
+        elevation = int(radial["elevation_number"])
+        if elevation > 1:
+            self.complete = bool(self.rows)
+            return
+        if elevation != 1:
+            return
+
+        ref = None
+        for pointer in radial["block_pointers"][: int(radial["block_count"])]:
+            pointer = int(pointer)
+            if pointer <= 0 or pointer + 4 > len(msg):
+                continue
+            name = bytes(msg[pointer + 1 : pointer + 4])
+            if name == b"VOL" and self.volume is None:
+                self.volume = np.frombuffer(msg, VOLUME_DATA_BLOCK, count=1, offset=pointer).copy()[0]
+            elif name == b"REF":
+                ref = np.frombuffer(msg, GENERIC_DATA_BLOCK, count=1, offset=pointer).copy()[0]
+                data_offset = pointer + GENERIC_DATA_BLOCK.itemsize
+                dtype = ">u2" if int(ref["word_size"]) == 16 else "u1"
+                gates = np.frombuffer(msg, dtype, count=int(ref["ngates"]), offset=data_offset).copy()
+        if ref is not None:
+            if self.moment is None:
+                self.moment = ref
+            self.azimuths.append(float(radial["azimuth_angle"]))
+            self.elevations.append(float(radial["elevation_angle"]))
+            self.rows.append(gates)
+        if int(radial["radial_status"]) in (END_OF_ELEVATION, END_OF_VOLUME) and self.rows:
+            self.complete = True
+
+    def feed_msg5(self, buf: memoryview, pos: int) -> None:
+        offset = pos + CTM_SIZE + MSG_HEADER.itemsize
+        if offset + MSG5_HEADER.itemsize + 2 > len(buf):
+            return
+        msg5 = np.frombuffer(buf, MSG5_HEADER, count=1, offset=offset)[0]
+        self.vcp_from_msg5 = int(msg5["pattern_number"])
+        if int(msg5["num_cuts"]) > 0:
+            code = int(np.frombuffer(buf, ">u2", count=1, offset=offset + MSG5_HEADER.itemsize)[0])
+            self.fixed_angle_from_msg5 = code * 360.0 / 65536.0
+
+    def to_sweep(self, site: str) -> Sweep:
+        if not self.rows or self.moment is None:
+            raise Level2DecodeError("No elevation 1 REF radials found")
+        ngates = max(len(row) for row in self.rows)
+        raw = np.ones((len(self.rows), ngates), dtype=self.rows[0].dtype.newbyteorder("="))
+        for i, row in enumerate(self.rows):
+            raw[i, : len(row)] = row
+        scale = np.float32(self.moment["scale"])
+        offset = np.float32(self.moment["offset"])
+        data = (raw - offset) / scale
+        data = np.where(raw <= 1, np.nan, data).astype("float32")
+        vcp = self.vcp_from_msg5
+        latitude = longitude = 0.0
+        if self.volume is not None:
+            latitude = float(self.volume["lat"])
+            longitude = float(self.volume["lon"])
+            if vcp is None:
+                vcp = int(self.volume["vcp"])
+        elevation = self.fixed_angle_from_msg5
+        if elevation is None:
+            elevation = float(np.median(self.elevations))
+        return Sweep(
+            site=site,
+            vcp=vcp,
+            elevation_deg=elevation,
+            azimuths=np.asarray(self.azimuths, dtype="float64"),
+            first_gate_m=float(self.moment["first_gate"]),
+            gate_spacing_m=float(self.moment["gate_spacing"]),
+            data=data,
+            latitude=latitude,
+            longitude=longitude,
+        )
+
+
+def _consume_messages(buf: bytes, collector: _SweepCollector) -> int:
+    """Parse complete messages at the front of ``buf``; return the bytes consumed."""
+    view = memoryview(buf)
+    pos = 0
+    total = len(buf)
+    while pos + CTM_SIZE + MSG_HEADER.itemsize <= total and not collector.complete:
+        header = np.frombuffer(view, MSG_HEADER, count=1, offset=pos + CTM_SIZE)[0]
+        msg_type = int(header["type"])
+        if msg_type == 31:
+            length = CTM_SIZE + int(header["size"]) * 2
+        elif msg_type == 29:
+            size = int(header["size"])
+            if size == 65535:
+                size = int(header["segments"]) << 16 | int(header["seg_num"])
+            length = CTM_SIZE + MSG_HEADER.itemsize + size
+        else:
+            length = RECORD_SIZE
+        if length <= CTM_SIZE:
+            raise Level2DecodeError("Invalid message length")
+        if pos + length > total:
+            break
+        if msg_type == 31:
+            collector.feed(view, pos, header)
+        elif msg_type == 5 and collector.vcp_from_msg5 is None:
+            collector.feed_msg5(view, pos)
+        elif msg_type == 1:
+            raise Level2DecodeError("Legacy Message 1 volume; use the Py-ART decoder")
+        pos += length
+    return pos
+
+
+def decode_lowest_sweep(records: Iterator[bytes], site: str) -> Sweep:
+    """Decode the elevation 1 REF sweep from an iterator of decompressed records."""
+    collector = _SweepCollector()
+    pending = b""
+    for record in records:
+        pending = pending + record if pending else record
+        consumed = _consume_messages(pending, collector)
+        pending = pending[consumed:]
+        if collector.complete:
+            break
+    if not collector.complete:
+        # A stream cut short mid-sweep must not pass for the volume's lowest sweep.
+        raise Level2DecodeError("Volume ended before elevation 1 was complete")
+    return collector.to_sweep(site)
+
+
+def read_lowest_sweep(
+    stream: BinaryIO,
+    site: str | None = None,
+    executor: Executor | None = None,
+) -> Sweep:
+    """Read an Archive II volume from ``stream`` and return its lowest REF sweep.
+
+    Reading stops at the end of elevation 1; the rest of ``stream`` is left unread. A
+    stream that ends before elevation 1 is complete raises :class:`Level2DecodeError`.
+    With an ``executor`` a few upcoming records are decompressed ahead in parallel.
+    """
+    header = read_volume_header(stream)
+    records = iter_decompressed_records(stream, executor)
+    try:
+        return decode_lowest_sweep(records, site or str(header["icao"]))
+    finally:
+        records.close()
+
+
+__all__ = [
+    "Level2DecodeError",
+    "decode_lowest_sweep",
+    "decompress_records",
+    "decompress_volume",
+    "is_compressed_volume",
+    "iter_compressed_records",
+    "iter_decompressed_records",
+    "read_lowest_sweep",
+    "read_volume_header",
+    "split_compressed_records",
+]
@@ -0,0 +1,119 @@
+"""Incremental listing of NEXRAD archive volumes.
+
+Archive keys look like ``YYYY/MM/DD/SITE/SITEYYYYMMDD_HHMMSS_V06`` and S3 returns them in
+lexicographic, hence chronological, order within a day prefix. Rather than paginating the
+whole day on every trigger, :class:`SiteListing` remembers the parsed objects and the last
+key seen per ``(site, day)`` and only asks S3 for keys after that cursor (``StartAfter``).
+Lookback windows that cross UTC midnight list every day prefix they touch; days that have
+been listed after they ended are treated as complete and are not listed again.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger("nexrad_listing")
+
+# Volumes can land in the archive a few minutes after their scan time.
+ARCHIVE_LATENCY = dt.timedelta(minutes=15)
+
+
+def parse_volume_time(site: str, key: str) -> dt.datetime | None:
+    """Return the scan time encoded in a volume key, or ``None`` for non-volume objects."""
+    fname = key.rsplit("/", 1)[-1]
+    if not fname.startswith(site) or fname.endswith("_MDM"):
+        return None
+    s = fname[len(site) : len(site) + 15]  # YYYYMMDD_HHMMSS
+    if len(s) != 15 or s[8] != "_" or not (s[:8].isdigit() and s[9:].isdigit()):
+        return None
+    try:
+        return dt.datetime(
+            int(s[0:4]), int(s[4:6]), int(s[6:8]), int(s[9:11]), int(s[11:13]), int(s[13:15])
+        )
+    except ValueError:
+        return None
+
+
+def day_prefix(site: str, day: dt.date) -> str:
+    return f"{day:%Y/%m/%d}/{site}/"
+
+
+@dataclass
+class _DayState:
+    cursor: str | None = None
+    objects: list[tuple[dt.datetime, str]] = field(default_factory=list)
+    complete: bool = False
+
+
+class SiteListing:
+    """Per-site cursors and parsed listings, kept between ingestion runs."""
+
+    def __init__(self, client_factory: Callable[[], Any], bucket: str):
+        self._client_factory = client_factory
+        self._bucket = bucket
+        self._days: dict[str, dict[dt.date, _DayState]] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+        self.list_calls = 0
+
+    def _lock(self, site: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(site, threading.Lock())
+
+    def _refresh(self, site: str, day: dt.date, state: _DayState, now: dt.datetime) -> None:
+        kwargs: dict[str, Any] = {"Bucket": self._bucket, "Prefix": day_prefix(site, day)}
+        if state.cursor:
+            kwargs["StartAfter"] = state.cursor
+        paginator = self._client_factory().get_paginator("list_objects_v2")
+        for page in paginator.paginate(**kwargs):
+            # Refreshes of different sites run concurrently under their own locks.
+            with self._guard:
+                self.list_calls += 1
+            for obj in page.get("Contents", []):
+                key = obj["Key"]
+                state.cursor = key
+                ts = parse_volume_time(site, key)
+                if ts is not None:
+                    state.objects.append((ts, key))
+        # A day listed once its last volumes can no longer arrive never changes again.
+        end_of_day = dt.datetime.combine(day + dt.timedelta(days=1), dt.time())
+        state.complete = now >= end_of_day + ARCHIVE_LATENCY
+
+    def recent(
+        self, site: str, since: dt.datetime, now: dt.datetime
+    ) -> list[tuple[dt.datetime, str]]:
+        """Return ``(scan_time, key)`` for volumes scanned at or after ``since``, oldest first."""
+        site = site.upper()
+        with self._lock(site):
+            days = self._days.setdefault(site, {})
+            # Forget days that have fallen out of every lookback window we are asked about.
+            for stale in [d for d in days if d < since.date()]:
+                del days[stale]
+            day = since.date()
+            while day <= now.date():
+                state = days.setdefault(day, _DayState())
+                if not state.complete:
+                    self._refresh(site, day, state, now)
+                day += dt.timedelta(days=1)
+            found = [
+                entry
+                for d in sorted(days)
+                for entry in days[d].objects
+                if entry[0] >= since
+            ]
+        found.sort()
+        return found
+
+    def reset(self, site: str | None = None) -> None:
+        with self._guard:
+            if site is None:
+                self._days.clear()
+            else:
+                self._days.pop(site.upper(), None)
+
+
+__all__ = ["SiteListing", "day_prefix", "parse_volume_time"]
@@ -0,0 +1,92 @@
+"""Per-frame footprints and XYZ tile occupancy bitmaps.
+
+Most map tiles around a radar are outside its coverage circle or hold only no-data. For
+each frame, ingestion writes a small JSON document next to the frame metadata. The
+tiler reads it once per frame and then answers empty tiles without touching the COG.
+The document holds:
+
+- ``bbox``: ``[west, south, east, north]`` of the coverage footprint in degrees.
+- ``zooms``: for each zoom, the tile window ``x0, y0, width, height`` and a row-major
+  bitmap (``numpy.packbits``, base64) with one bit per tile, set when the tile has any
+  valid pixel.
+
+Bitmaps are built at the finest zoom from the gridded frame, then OR-reduced zoom by zoom.
+"""
+from __future__ import annotations
+
+import base64
+import math
+
+import numpy as np
+
+from .gridding import EARTH_RADIUS_M, MercatorGrid
+
+OCCUPANCY_VERSION = 1
+
+
+def footprint_bbox(latitude: float, longitude: float, radius_km: float) -> list[float]:
+    """Lon/lat bounding box of a circle of ``radius_km`` around a site (clamped to the globe)."""
+    reach = math.degrees(radius_km * 1000.0 / EARTH_RADIUS_M)
+    south, north = max(latitude - reach, -90.0), min(latitude + reach, 90.0)
+    widest = max(abs(south), abs(north))
+    if widest >= 89.9:
+        return [-180.0, south, 180.0, north]
+    half_lon = min(reach / math.cos(math.radians(widest)), 180.0)
+    return [longitude - half_lon, south, longitude + half_lon, north]
+
+
+def _coarsen(bits: np.ndarray, x0: int, y0: int) -> tuple[np.ndarray, int, int]:
+    """OR-reduce a tile window by one zoom level; returns the parent window and origin."""
+    pad_left, pad_top = x0 % 2, y0 % 2
+    height, width = bits.shape
+    padded = np.zeros(
+        (pad_top + height + (pad_top + height) % 2, pad_left + width + (pad_left + width) % 2), dtype=bool
+    )
+    padded[pad_top : pad_top + height, pad_left : pad_left + width] = bits
+    parents = padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2).any(axis=(1, 3))
+    return parents, x0 // 2, y0 // 2
+
+
+def tile_occupancy(valid: np.ndarray, grid: MercatorGrid, min_zoom: int, max_zoom: int) -> dict[str, dict]:
+    """Occupancy windows for ``min_zoom..max_zoom`` of a frame gridded on ``grid``.
+
+    ``max_zoom`` is capped where a tile would be smaller than one grid pixel.
+    """
+    if valid.shape != grid.shape:
+        raise ValueError(f"mask shape {valid.shape} does not match grid shape {grid.shape}")
+    finest = min(max_zoom, grid.zoom + int(math.log2(grid.tile_size)))
+    block = grid.tile_size >> (finest - grid.zoom) if finest >= grid.zoom else grid.tile_size
+    rows, cols = grid.shape
+    bits = valid.reshape(rows // block, block, cols // block, block).any(axis=(1, 3))
+    scale = 1 << max(finest - grid.zoom, 0)
+    x0, y0 = grid.tile_x0 * scale, grid.tile_y0 * scale
+    zoom = max(finest, grid.zoom)
+    zooms: dict[str, dict] = {}
+    while zoom >= min_zoom:
+        if zoom <= finest:
+            zooms[str(zoom)] = {
+                "x0": x0,
+                "y0": y0,
+                "width": int(bits.shape[1]),
+                "height": int(bits.shape[0]),
+                "bits": base64.b64encode(np.packbits(bits, axis=None).tobytes()).decode("ascii"),
+            }
+        if zoom == 0:
+            break
+        bits, x0, y0 = _coarsen(bits, x0, y0)
+        zoom -= 1
+    return zooms
+
+
+def occupancy_document(
+    bbox: list[float], zooms: dict[str, dict] | None = None, *, valid_pixels: int | None = None
+) -> dict:
+    return {
+        "version": OCCUPANCY_VERSION,
+        "bbox": [round(v, 6) for v in bbox],
+        "valid_pixels": valid_pixels,
+        "zooms": zooms or {},
+    }
+
+
+__all__ = ["footprint_bbox", "occupancy_document", "tile_occupancy"]
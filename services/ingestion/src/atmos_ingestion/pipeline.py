@@ -0,0 +1,121 @@
+"""Bounded, multi-stage worker pipeline for ingestion jobs.
+
+Each stage owns a fixed number of worker threads and hands results to the next stage
+through a bounded queue, so network-bound stages (download, upload) overlap with the
+CPU-bound ones (decode, grid, encode) without buffering an unbounded number of
+volumes in memory. A failing item is recorded and dropped; the rest keep flowing.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger("ingestion_pipeline")
+
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One step of a pipeline: ``func`` maps the previous stage's output to its own."""
+
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+
+
+@dataclass
+class StageResult:
+    """Outcome for a single input item."""
+
+    item: Any
+    value: Any = None
+    error: BaseException | None = None
+    failed_stage: str | None = None
+    timings: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def run_pipeline(
+    items: Iterable[Any],
+    stages: Sequence[Stage],
+    *,
+    queue_depth: int = 2,
+) -> list[StageResult]:
+    """Push ``items`` through ``stages`` and return one result per item, in input order."""
+    if not stages:
+        raise ValueError("run_pipeline requires at least one stage")
+    for stage in stages:
+        if stage.workers < 1:
+            raise ValueError(f"Stage '{stage.name}' needs at least one worker")
+
+    queues = [queue.Queue(maxsize=max(1, queue_depth)) for _ in stages]
+    results: dict[int, StageResult] = {}
+
+    def _worker(position: int, stage: Stage, remaining: list[int], remaining_lock: threading.Lock) -> None:
+        inbox = queues[position]
+        outbox = queues[position + 1] if position + 1 < len(stages) else None
+        while True:
+            entry = inbox.get()
+            if entry is _DONE:
+                break
+            seq, result, value = entry
+            started = time.perf_counter()
+            try:
+                value = stage.func(value)
+            except Exception as exc:  # noqa: BLE001 - recorded per item
+                result.error = exc
+                result.failed_stage = stage.name
+                logger.warning("Pipeline stage '%s' failed for %r: %s", stage.name, result.item, exc)
+                continue
+            finally:
+                result.timings[stage.name] = time.perf_counter() - started
+            if outbox is None:
+                result.value = value
+            else:
+                outbox.put((seq, result, value))
+        with remaining_lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        # The last worker of a stage to exit tells every worker of the next stage to stop.
+        if last and outbox is not None:
+            for _ in range(stages[position + 1].workers):
+                outbox.put(_DONE)
+
+    threads: list[threading.Thread] = []
+    for position, stage in enumerate(stages):
+        remaining = [stage.workers]
+        remaining_lock = threading.Lock()
+        for n in range(stage.workers):
+            thread = threading.Thread(
+                target=_worker,
+                args=(position, stage, remaining, remaining_lock),
+                name=f"pipeline-{stage.name}-{n}",
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+
+    try:
+        for seq, item in enumerate(items):
+            result = StageResult(item=item)
+            results[seq] = result
+            queues[0].put((seq, result, item))
+    finally:
+        for _ in range(stages[0].workers):
+            queues[0].put(_DONE)
+        for thread in threads:
+            thread.join()
+
+    return [results[seq] for seq in sorted(results)]
+
+
+__all__ = ["Stage", "StageResult", "run_pipeline"]
@@ -0,0 +1,54 @@
+"""Ask the tiler to pre-render the tiles of newly committed frames.
+
+Every client switches to a new frame at the same moment, so without pre-warming the
+first viewers of each frame pay for every visible tile at once. After a frame is
+committed to its index (or a GOES frame is written), ingestion POSTs its dataset and
+timestamps to ``TILER_PREWARM_URL``. The tiler queues a rate-limited background render
+of the frame's occupied tiles into its tile cache.
+
+The notification is best effort: it uses a short timeout, and failures are logged and
+never fail the ingest. An empty ``TILER_PREWARM_URL`` disables it.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import urllib.request
+from collections.abc import Callable
+
+logger = logging.getLogger("ingestion_prewarm")
+
+PREWARM_URL = os.getenv("TILER_PREWARM_URL", "")
+PREWARM_TOKEN = os.getenv("TILER_PREWARM_TOKEN", "")
+PREWARM_TIMEOUT_SECONDS = float(os.getenv("TILER_PREWARM_TIMEOUT_SECONDS", "2"))
+
+
+def request_prewarm(
+    dataset: str,
+    timestamps: list[str],
+    *,
+    url: str | None = None,
+    opener: Callable[..., object] = urllib.request.urlopen,
+) -> bool:
+    """POST ``{dataset, timestamps}`` to the tiler; True if it accepted the request."""
+    target = PREWARM_URL if url is None else url
+    if not target or not timestamps:
+        return False
+    body = json.dumps({"dataset": dataset, "timestamps": timestamps}).encode()
+    headers = {"Content-Type": "application/json"}
+    if PREWARM_TOKEN:
+        headers["X-Prewarm-Token"] = PREWARM_TOKEN
+    request = urllib.request.Request(target, data=body, headers=headers, method="POST")
+    try:
+        with opener(request, timeout=PREWARM_TIMEOUT_SECONDS) as response:  # type: ignore[attr-defined]
+            accepted = 200 <= response.status < 300
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Tile prewarm request for %s %s failed: %s", dataset, timestamps, exc)
+        return False
+    if not accepted:
+        logger.warning("Tiler refused prewarm of %s %s (HTTP %s)", dataset, timestamps, response.status)
+    return accepted
+
+
+__all__ = ["request_prewarm"]
@@ -0,0 +1,307 @@
+"""Read-through cache for upstream source objects (NEXRAD volumes, GOES granules).
+
+Objects in the public archives are immutable, so a hash of ``bucket/key`` addresses their
+content. Entries live on local disk, bounded by total size with least-recently-used
+eviction, and optionally in an object-store tier (the ``raw`` MinIO bucket) that survives
+restarts and is shared between workers. Reprocessing a volume after a crash, a grid
+configuration change or a retry then costs no upstream bandwidth.
+"""
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from botocore.exceptions import ClientError
+
+from .gridding import BlobStore
+
+logger = logging.getLogger("raw_cache")
+
+
+def cache_name(bucket: str, key: str, part: str | None = None) -> str:
+    """Content address for ``bucket/key`` (``part`` names a derived slice such as a prefix)."""
+    digest = hashlib.sha256(f"{bucket}/{key}".encode()).hexdigest()
+    return f"{digest}.{part}" if part else digest
+
+
+class RawObjectCache:
+    """Disk LRU (bounded by bytes) -> blob store -> upstream lookup for raw objects.
+
+    The disk tier is bounded as a directory, not per instance: eviction rescans the files'
+    sizes and access times under an exclusive file lock, so every instance and worker
+    process sharing ``cache_dir`` enforces the same ``max_bytes``. Within a process, use
+    :func:`shared_raw_cache` so all callers share one instance and its stats.
+    """
+
+    def __init__(
+        self,
+        *,
+        cache_dir: Path | None = None,
+        max_bytes: int = 2 << 30,
+        store: BlobStore | None = None,
+    ):
+        self._cache_dir = cache_dir
+        self._max_bytes = max_bytes
+        self._store = store
+        self._lock = threading.Lock()
+        self._total = 0
+        self._last_touch = 0
+        self.stats = {"disk_hits": 0, "store_hits": 0, "misses": 0, "evictions": 0, "upstream_bytes": 0}
+        if self._cache_dir is not None and self._cache_dir.exists():
+            self._evict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._cache_dir is not None or self._store is not None
+
+    @property
+    def total_bytes(self) -> int:
+        """Size of the cache directory as of the last eviction pass."""
+        return self._total
+
+    def _path(self, name: str) -> Path:
+        assert self._cache_dir is not None
+        return self._cache_dir / name[:2] / name
+
+    @contextmanager
+    def _dir_lock(self) -> Iterator[None]:
+        """Exclusive lock on the cache directory, across threads, instances and processes."""
+        assert self._cache_dir is not None
+        with self._lock, open(self._cache_dir / ".lock", "a+b") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _scan(self) -> list[tuple[int, Path, int]]:
+        """``(mtime_ns, path, size)`` of every cached file; in-flight temp files are skipped."""
+        assert self._cache_dir is not None
+        found = []
+        for path in self._cache_dir.glob("??/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            found.append((st.st_mtime_ns, path, st.st_size))
+        return found
+
+    def _evict(self) -> None:
+        """Trim the directory to ``max_bytes``, least recently accessed files first."""
+        with self._dir_lock():
+            found = sorted(self._scan())
+            total = sum(size for *_, size in found)
+            for _, path, size in found:
+                if total <= self._max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    continue
+                total -= size
+                self.stats["evictions"] += 1
+            self._total = total
+
+    def _touch(self, path: Path) -> None:
+        """Stamp ``path`` as just accessed; the access time orders eviction across processes."""
+        # Explicit, strictly increasing stamps: file times set by the kernel are too coarse
+        # to order accesses made in quick succession.
+        with self._lock:
+            self._last_touch = stamp = max(time.time_ns(), self._last_touch + 1)
+        try:
+            os.utime(path, ns=(stamp, stamp))
+        except OSError:
+            pass
+
+    def _read_disk(self, name: str) -> bytes | None:
+        if self._cache_dir is None:
+            return None
+        path = self._path(name)
+        try:
+            payload = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            logger.warning("Failed to read cached object %s", path)
+            return None
+        self._touch(path)
+        return payload
+
+    def _write_disk(self, name: str, payload: bytes) -> None:
+        if self._cache_dir is None or len(payload) > self._max_bytes:
+            return
+        path = self._path(name)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.parent / f".{name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            tmp.write_bytes(payload)
+            tmp.replace(path)
+            self._touch(path)
+            self._evict()
+        except OSError:
+            logger.warning("Failed to write cached object %s to %s", name, self._cache_dir)
+
+    def load(self, names: str | Iterable[str]) -> bytes | None:
+        """Return the first cached entry among ``names``; counts one hit or one miss."""
+        names = [names] if isinstance(names, str) else list(names)
+        for name in names:
+            payload = self._read_disk(name)
+            if payload is not None:
+                self.stats["disk_hits"] += 1
+                return payload
+        if self._store is not None:
+            for name in names:
+                try:
+                    payload = self._store.load(name)
+                except Exception:  # noqa: BLE001 - the store tier is best effort
+                    logger.warning("Failed to load cached object %s from store", name)
+                    continue
+                if payload is not None:
+                    self.stats["store_hits"] += 1
+                    self._write_disk(name, payload)
+                    return payload
+        self.stats["misses"] += 1
+        return None
+
+    def save(self, name: str, payload: bytes) -> None:
+        self._write_disk(name, payload)
+        if self._store is not None:
+            try:
+                self._store.save(name, payload)
+            except Exception:  # noqa: BLE001
+                logger.warning("Failed to persist cached object %s to store", name)
+
+    def count_upstream(self, nbytes: int) -> None:
+        self.stats["upstream_bytes"] += nbytes
+
+    def fetch(self, bucket: str, key: str, upstream: Callable[[], bytes]) -> bytes:
+        """Return the object's bytes, calling ``upstream`` only on a cache miss."""
+        name = cache_name(bucket, key)
+        payload = self.load(name)
+        if payload is None:
+            payload = upstream()
+            self.count_upstream(len(payload))
+            self.save(name, payload)
+        return payload
+
+
+_shared: dict[Path | None, RawObjectCache] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_raw_cache(
+    *, cache_dir: Path | None, max_bytes: int, store: BlobStore | None = None
+) -> RawObjectCache:
+    """The process-wide :class:`RawObjectCache` of ``cache_dir``, created on first use.
+
+    Later callers get the same instance (and its store tier) whatever they pass as
+    ``max_bytes`` or ``store``; all of them point at the same settings in practice.
+    """
+    ident = cache_dir.resolve() if cache_dir is not None else None
+    with _shared_lock:
+        cache = _shared.get(ident)
+        if cache is None:
+            cache = _shared[ident] = RawObjectCache(cache_dir=cache_dir, max_bytes=max_bytes, store=store)
+        return cache
+
+
+class S3BlobStore:
+    """Store tier backed by a bucket prefix on an S3-compatible client (e.g. MinIO ``raw``)."""
+
+    def __init__(self, client: Any, bucket: str, prefix: str = ""):
+        self._client = client
+        self._bucket = bucket
+        self._prefix = prefix.strip("/")
+
+    def _key(self, name: str) -> str:
+        return f"{self._prefix}/{name}" if self._prefix else name
+
+    def load(self, name: str) -> bytes | None:
+        try:
+            return self._client.get_object(Bucket=self._bucket, Key=self._key(name))["Body"].read()
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+
+    def save(self, name: str, payload: bytes) -> None:
+        self._client.put_object(
+            Bucket=self._bucket,
+            Key=self._key(name),
+            Body=payload,
+            ContentType="application/octet-stream",
+        )
+
+
+class RecordingReader:
+    """Wrap a stream and keep a copy of every byte read from it."""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._buffer = io.BytesIO()
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._stream.read(size)
+        self._buffer.write(chunk)
+        return chunk
+
+    def recorded(self) -> bytes:
+        return self._buffer.getvalue()
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+class CachingS3Client:
+    """boto3 S3 client proxy whose whole-object reads go through a :class:`RawObjectCache`.
+
+    Ranged or conditional ``get_object`` calls and every other client method are passed
+    straight through to the wrapped client.
+    """
+
+    def __init__(self, client: Any, cache: RawObjectCache):
+        self._client = client
+        self._cache = cache
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def _fetch(self, bucket: str, key: str) -> bytes:
+        return self._cache.fetch(
+            bucket, key, lambda: self._client.get_object(Bucket=bucket, Key=key)["Body"].read()
+        )
+
+    def get_object(self, *, Bucket: str, Key: str, **kwargs: Any) -> dict[str, Any]:  # noqa: N803
+        if kwargs:
+            return self._client.get_object(Bucket=Bucket, Key=Key, **kwargs)
+        payload = self._fetch(Bucket, Key)
+        return {"Body": io.BytesIO(payload), "ContentLength": len(payload)}
+
+    def download_fileobj(self, Bucket: str, Key: str, Fileobj: BinaryIO, **_kwargs: Any) -> None:  # noqa: N803
+        Fileobj.write(self._fetch(Bucket, Key))
+
+    def download_file(self, Bucket: str, Key: str, Filename: str, **_kwargs: Any) -> None:  # noqa: N803
+        Path(Filename).write_bytes(self._fetch(Bucket, Key))
+
+
+__all__ = [
+    "CachingS3Client",
+    "RawObjectCache",
+    "RecordingReader",
+    "S3BlobStore",
+    "cache_name",
+    "shared_raw_cache",
+]
@@ -2,14 +2,31 @@
 from __future__ import annotations
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 
 from .clients import ClientBundle
 from .config import IngestionSettings
 from .jobs.goes import GoesIngestion
+from .jobs.nexrad_composite import COMPOSITE_BINS, run_nexrad_composite
 from .jobs.nexrad_level2 import run_nexrad_level2
+from .workers import initialise_worker, run_composite_job, run_goes_job, run_nexrad_job
+
+
+def _build_executor(settings: IngestionSettings) -> Executor:
+    if settings.executor_backend == "process":
+        # ``max_tasks_per_child`` is incompatible with fork; spawn also keeps workers
+        # free of any state (event loop, sockets) inherited from the API process.
+        return ProcessPoolExecutor(
+            max_workers=settings.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=initialise_worker,
+            initargs=(settings.model_dump(by_alias=True),),
+            max_tasks_per_child=settings.worker_max_tasks,
+        )
+    return ThreadPoolExecutor(max_workers=settings.max_workers)
 
 
 class IngestionService:
@@ -18,12 +35,18 @@ class IngestionService:
     def __init__(self, settings: IngestionSettings):
         self._settings = settings
         self._clients = ClientBundle(settings)
-        self._executor = ThreadPoolExecutor(max_workers=settings.max_workers)
+        self._executor = _build_executor(settings)
         self._goes = GoesIngestion(settings, self._clients)
 
+    @property
+    def uses_processes(self) -> bool:
+        return isinstance(self._executor, ProcessPoolExecutor)
+
     async def run_nexrad(self, site: str | None, target_time: datetime | None) -> dict[str, Any]:
         # Use the unified NEXRAD Level 2 implementation with single frame
         loop = asyncio.get_running_loop()
+        if self.uses_processes:
+            return await loop.run_in_executor(self._executor, run_nexrad_job, site, None, 1)
         def _runner() -> dict[str, Any]:
             return run_nexrad_level2(site or self._settings.default_site,
                                    self._settings.default_minutes_lookback, 1)
@@ -31,10 +54,24 @@ class IngestionService:
 
     async def run_nexrad_frames(self, site: str, frames: int, lookback_minutes: int) -> dict[str, Any]:
         loop = asyncio.get_running_loop()
+        if self.uses_processes:
+            return await loop.run_in_executor(
+                self._executor, run_nexrad_job, site, lookback_minutes, frames
+            )
         def _runner() -> dict[str, Any]:
             return run_nexrad_level2(site, lookback_minutes, frames)
         return await loop.run_in_executor(self._executor, _runner)
 
+    async def run_nexrad_composite(self, sites: list[str] | None, bins: int | None) -> dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        if self.uses_processes:
+            return await loop.run_in_executor(self._executor, run_composite_job, sites, bins)
+
+        def _runner() -> dict[str, Any]:
+            return run_nexrad_composite(sites, COMPOSITE_BINS if bins is None else bins)
+
+        return await loop.run_in_executor(self._executor, _runner)
+
     async def run_goes(
         self,
         band: int | None,
@@ -42,6 +79,8 @@ class IngestionService:
         target: datetime | str | None,
     ) -> dict[str, Any]:
         loop = asyncio.get_running_loop()
+        if self.uses_processes:
+            return await loop.run_in_executor(self._executor, run_goes_job, band, sector, target)
 
         def _runner() -> dict[str, Any]:
             return self._goes.run(band, sector, target)
@@ -0,0 +1,76 @@
+"""Process-pool entry points for the ingestion service.
+
+Worker processes import the heavy scientific stack once at start-up, keep their S3 and
+MinIO clients for their whole lifetime and are recycled by the pool after
+``INGESTION_WORKER_MAX_TASKS`` jobs to bound memory growth.
+"""
+from __future__ import annotations
+
+import importlib
+import logging
+from datetime import datetime
+from typing import Any
+
+from .clients import ClientBundle
+from .config import IngestionSettings
+from .jobs.goes import GoesIngestion
+
+logger = logging.getLogger("ingestion_worker")
+
+PRELOAD_MODULES = ("pyart", "rasterio", "satpy")
+
+_state: dict[str, Any] = {}
+
+
+def initialise_worker(settings_payload: dict[str, Any]) -> None:
+    """Pool initializer: import heavy modules and build long-lived clients."""
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            logger.info("Optional module %s not installed; skipping preload", name)
+
+    settings = IngestionSettings(**settings_payload)
+    clients = ClientBundle(settings)
+    _ = clients.source, clients.derived
+
+    from .jobs import nexrad_level2
+
+    nexrad_level2._get_s3()  # noqa: SLF001 - warm the module-level anonymous client
+
+    _state["settings"] = settings
+    _state["clients"] = clients
+    _state["goes"] = GoesIngestion(settings, clients)
+
+
+def _settings() -> IngestionSettings:
+    if "settings" not in _state:
+        raise RuntimeError("Ingestion worker used before initialise_worker() ran")
+    return _state["settings"]
+
+
+def run_nexrad_job(site: str | None, lookback_minutes: int | None, frames: int) -> dict[str, Any]:
+    from .jobs.nexrad_level2 import run_nexrad_level2
+
+    settings = _settings()
+    lookback = settings.default_minutes_lookback if lookback_minutes is None else lookback_minutes
+    return run_nexrad_level2(site or settings.default_site, lookback, frames)
+
+
+def run_composite_job(sites: list[str] | None, bins: int | None) -> dict[str, Any]:
+    from .jobs.nexrad_composite import COMPOSITE_BINS, run_nexrad_composite
+
+    _settings()
+    return run_nexrad_composite(sites, COMPOSITE_BINS if bins is None else bins)
+
+
+def run_goes_job(
+    band: int | None,
+    sector: str | None,
+    target: datetime | str | None,
+) -> dict[str, Any]:
+    _settings()
+    return _state["goes"].run(band, sector, target)
+
+
+__all__ = ["initialise_worker", "run_nexrad_job", "run_composite_job", "run_goes_job", "PRELOAD_MODULES"]
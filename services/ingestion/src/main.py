@@ -54,6 +54,19 @@ class NexradFramesTrigger(BaseModel):
     )
 
 
+class NexradCompositeTrigger(BaseModel):
+    sites: list[str] | None = Field(
+        default=None,
+        description="Radar sites to composite. Defaults to the configured NEXRAD_COMPOSITE_SITES group.",
+    )
+    bins: int | None = Field(
+        default=None,
+        ge=1,
+        le=24,
+        description="How many of the newest time bins to (re)composite. Defaults to NEXRAD_COMPOSITE_BINS.",
+    )
+
+
 class TriggerResponse(BaseModel):
     status: str
     detail: dict[str, Any]
@@ -103,6 +116,18 @@ async def trigger_nexrad_frames(payload: NexradFramesTrigger):
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
+@app.post("/trigger/nexrad/composite", response_model=TriggerResponse)
+async def trigger_nexrad_composite(payload: NexradCompositeTrigger):
+    try:
+        result = await ingestion_service.run_nexrad_composite(payload.sites, payload.bins)
+        return TriggerResponse(status="ok", detail=result)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:  # pragma: no cover - surfaced via HTTP
+        logger.exception("NEXRAD composite failed")
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
 @app.post("/trigger/goes", response_model=TriggerResponse)
 async def trigger_goes(payload: GoesTrigger):
     try:
@@ -46,6 +46,19 @@ class IngestionAppTest(unittest.TestCase):
         self.assertEqual(body["detail"], mock_result)
         mock_run.assert_awaited_once()
 
+    def test_trigger_nexrad_composite_uses_service(self):
+        mock_result = {"sites": ["KTLX", "KINX"], "bin_minutes": 5, "added": 1}
+        with patch.object(
+            ingestion_app.state.ingestion_service,
+            "run_nexrad_composite",
+            AsyncMock(return_value=mock_result),
+        ) as mock_run:
+            response = self.client.post("/trigger/nexrad/composite", json={"sites": ["KTLX", "KINX"], "bins": 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["detail"], mock_result)
+        mock_run.assert_awaited_once_with(["KTLX", "KINX"], 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,151 @@
+import warnings
+
+import numpy as np
+import pytest
+from rasterio.io import MemoryFile
+from rasterio.transform import from_origin
+
+from src.atmos_ingestion.cog import Quantization, encode_cog
+
+TRANSFORM = from_origin(-300500, 300500, 1000, 1000)
+
+
+def _read(payload: bytes):
+    with MemoryFile(payload) as mem, mem.open() as src:
+        return src.read(1), src.profile, src.overviews(1), src.scales, src.offsets, src.tags()
+
+
+def test_float_round_trip_with_overviews():
+    arr = np.linspace(-30, 75, 601 * 601, dtype="float32").reshape(601, 601)
+    arr[:10] = -9999.0
+    encoded = encode_cog(arr, transform=TRANSFORM, crs="EPSG:3857", nodata=-9999.0)
+
+    data, profile, overviews, *_ = _read(encoded.payload)
+    np.testing.assert_array_equal(data, arr)
+    assert profile["blockxsize"] == profile["blockysize"] == 256
+    assert profile["nodata"] == -9999.0
+    assert overviews == [2, 4]
+    assert encoded.nbytes == len(encoded.payload) > 0
+    assert encoded.encode_seconds > 0
+    assert encoded.stream().read() == encoded.payload
+
+
+def test_integer_encoding_records_scale_offset_and_tags():
+    arr = np.arange(512 * 512, dtype="uint32").reshape(512, 512).astype("uint8")
+    encoded = encode_cog(
+        arr,
+        transform=TRANSFORM,
+        crs="EPSG:3857",
+        nodata=0,
+        blocksize=512,
+        scale=0.5,
+        offset=-32.0,
+        tags={"units": "dBZ"},
+    )
+    data, profile, _, scales, offsets, tags = _read(encoded.payload)
+    np.testing.assert_array_equal(data, arr)
+    assert profile["blockxsize"] == 512
+    assert scales == (0.5,)
+    assert offsets == (-32.0,)
+    assert tags["units"] == "dBZ"
+
+
+def test_rejects_multiband_arrays():
+    with pytest.raises(ValueError):
+        encode_cog(np.zeros((2, 4, 4), "float32"), transform=TRANSFORM, crs="EPSG:3857", nodata=None)
+
+
+def test_quantization_round_trips_half_db_reflectivity():
+    q = Quantization("uint8", scale=0.5, offset=-33.0, nodata=0)
+    values = np.array([[-32.5, -10.0, 0.0], [42.5, 200.0, -9999.0]], dtype="float32")
+    codes = q.encode(values, values != -9999.0)
+    assert codes.dtype == np.uint8
+    assert codes.tolist() == [[1, 46, 66], [151, 255, 0]]
+    decoded = q.decode(codes)
+    np.testing.assert_array_equal(decoded[0], values[0])
+    assert decoded[1, 0] == 42.5
+    assert np.isnan(decoded[1, 2])
+    # Values below the code range clamp to the lowest valid code, never to nodata.
+    assert q.encode(np.array([-80.0]), np.array([True])).tolist() == [1]
+    # Non-finite cells become nodata without ever being cast (no invalid-cast warning).
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        nonfinite = np.array([np.nan, np.inf, 10.0], dtype="float32")
+        assert q.encode(nonfinite, np.array([True, True, False])).tolist() == [0, 0, 0]
+    assert q.describe() == {"dtype": "uint8", "scale": 0.5, "offset": -33.0, "nodata": 0}
+
+
+def test_nexrad_frames_store_quantized_reflectivity(monkeypatch):
+    from src.atmos_ingestion.gridding import GridConfig, GridIndexCache, Sweep
+    from src.atmos_ingestion.jobs import nexrad_level2 as module
+
+    data = np.full((360, 80), -10.0, dtype="float32")
+    data[:, 40:] = 42.5
+    data[:, 60:] = np.nan
+    sweep = Sweep(
+        site="KTLX",
+        vcp=212,
+        elevation_deg=0.5,
+        azimuths=np.arange(360) + 0.5,
+        first_gate_m=2125.0,
+        gate_spacing_m=250.0,
+        data=data,
+    )
+    monkeypatch.setattr(module, "grid_index_cache", GridIndexCache())
+    monkeypatch.setattr(module, "GRID_CONFIG", GridConfig(radius_km=20, resolution_km=1))
+    monkeypatch.setattr(module, "GRID_PROJECTION", "planar")
+    monkeypatch.setattr(module, "OUTPUT_DTYPE", "uint8")
+    frame = module.render_volume("KTLX", "2024/05/01/KTLX/KTLX20240501_120000_V06", sweep)
+
+    codes, profile, _, scales, offsets, tags = _read(frame.cog.payload)
+    assert profile["dtype"] == "uint8"
+    assert profile["nodata"] == 0
+    assert scales == (0.5,) and offsets == (-33.0,)
+    assert tags["encoding_scale"] == "0.5"
+    assert frame.meta["encoding"] == {"dtype": "uint8", "scale": 0.5, "offset": -33.0, "nodata": 0}
+    assert set(np.unique(codes)) == {0, 46, 151}
+
+    monkeypatch.setattr(module, "OUTPUT_DTYPE", "float32")
+    frame = module.render_volume("KTLX", "2024/05/01/KTLX/KTLX20240501_120000_V06", sweep)
+    values, profile, *_ = _read(frame.cog.payload)
+    assert profile["dtype"] == "float32"
+    assert frame.meta["encoding"]["nodata"] == -9999.0
+    assert set(np.unique(values)) == {-9999.0, -10.0, 42.5}
+
+
+@pytest.mark.parametrize("blocksize", [256, 512])
+def test_nexrad_mercator_frames_are_tile_aligned(monkeypatch, blocksize):
+    from src.atmos_ingestion.gridding import GridIndexCache, MercatorGridConfig, Sweep
+    from src.atmos_ingestion.jobs import nexrad_level2 as module
+
+    sweep = Sweep(
+        site="KTLX",
+        vcp=212,
+        elevation_deg=0.5,
+        azimuths=np.arange(360) + 0.5,
+        first_gate_m=2125.0,
+        gate_spacing_m=250.0,
+        data=np.full((360, 400), 20.0, dtype="float32"),
+        latitude=35.3331,
+        longitude=-97.2778,
+    )
+    monkeypatch.setattr(module, "grid_index_cache", GridIndexCache())
+    monkeypatch.setattr(module, "GRID_PROJECTION", "mercator")
+    monkeypatch.setattr(module, "COG_BLOCKSIZE", blocksize)
+    monkeypatch.setattr(
+        module, "MERCATOR_GRID", MercatorGridConfig(zoom=9, radius_km=100, align_tiles=blocksize // 256)
+    )
+    frame = module.render_volume("KTLX", "2024/05/01/KTLX/KTLX20240501_120000_V06", sweep)
+
+    with MemoryFile(frame.cog.payload) as mem, mem.open() as src:
+        assert src.crs.to_epsg() == 3857
+        assert src.block_shapes == [(blocksize, blocksize)]
+        assert src.width % blocksize == 0 and src.height % blocksize == 0
+        x0, y0, _, _ = frame.meta["grid"]["tiles"]
+        # Each block is one whole blocksize-px tile (zoom 9 for 256, its parent zoom for 512).
+        assert x0 % (blocksize // 256) == 0 and y0 % (blocksize // 256) == 0
+        span = 2 * 20037508.342789244 / 2**9
+        assert src.bounds.left == pytest.approx(-20037508.342789244 + x0 * span)
+        assert src.bounds.top == pytest.approx(20037508.342789244 - y0 * span)
+        assert src.res[0] == pytest.approx(span / 256)
+    assert frame.meta["grid"]["projection"] == "mercator"
@@ -77,6 +77,22 @@ class GoesIngestionJobTest(unittest.TestCase):
         self.assertIsNone(args[2].tzinfo)
         self.assertEqual(result["requested_time"], "2024-08-10T00:00:00Z")
 
+    def test_only_bands_served_by_the_tiler_are_prewarmed(self):
+        timestamp = datetime(2024, 8, 10, 0, 40)
+        for band, sector in ((13, "CONUS"), (8, "CONUS"), (13, "FULL")):
+            with patch(
+                "src.atmos_ingestion.jobs.goes.find_latest_goes_data",
+                return_value=(timestamp, "path/to/file.nc"),
+            ), patch(
+                "src.atmos_ingestion.jobs.goes.process_goes_file",
+                return_value={},
+            ), patch("src.atmos_ingestion.jobs.goes.request_prewarm") as prewarm:
+                self.job.run(band, sector, None)
+            if band == 13 and sector == "CONUS":
+                prewarm.assert_called_once_with("goes-c13", ["20240810T004000Z"])
+            else:
+                prewarm.assert_not_called()
+
     def test_run_rejects_invalid_timestamp_string(self):
         with self.assertRaises(ValueError):
             self.job.run(None, None, "2024-08-10T00:00:00Z")
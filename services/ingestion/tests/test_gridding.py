@@ -0,0 +1,158 @@
+import numpy as np
+
+from src.atmos_ingestion.gridding import (
+    GridConfig,
+    GridIndexCache,
+    GridIndexKey,
+    MercatorGridConfig,
+    PolarGridIndex,
+    Sweep,
+    ground_range_of_gates,
+)
+
+GRID = GridConfig(radius_km=20, resolution_km=1)
+
+
+def _sweep(n_rays: int = 720, n_gates: int = 100, jitter: float = 0.0) -> Sweep:
+    azimuths = (np.arange(n_rays) + 0.5) * (360.0 / n_rays) + jitter
+    # Encode ray and gate in the value so the gather can be checked exactly.
+    data = (np.arange(n_rays)[:, None] * 1000 + np.arange(n_gates)[None, :]).astype("float32")
+    data[:, 50] = np.nan
+    return Sweep(
+        site="KTLX",
+        vcp=212,
+        elevation_deg=0.5,
+        azimuths=azimuths,
+        first_gate_m=2125.0,
+        gate_spacing_m=250.0,
+        data=data,
+    )
+
+
+def _expected(sweep: Sweep, grid: GridConfig, nodata: float) -> np.ndarray:
+    x, y = grid.pixel_centres()
+    ground = np.hypot(x, y)
+    azimuth = np.mod(np.degrees(np.arctan2(x, y)), 360.0)
+    ranges = sweep.first_gate_m + sweep.gate_spacing_m * np.arange(sweep.n_gates)
+    gate_ground = ground_range_of_gates(ranges, sweep.elevation_deg)
+    out = np.full(grid.shape, nodata, dtype="float32")
+    bin_width = 360.0 / sweep.azimuth_bins
+    for (i, j), dist in np.ndenumerate(ground):
+        if dist < gate_ground[0] - 125 or dist > gate_ground[-1] + 125:
+            continue
+        centre = (np.floor(azimuth[i, j] / bin_width) + 0.5) * bin_width
+        diff = np.abs(sweep.azimuths - centre)
+        ray = int(np.argmin(np.minimum(diff, 360 - diff)))
+        gate = int(np.rint(np.interp(dist, gate_ground, np.arange(sweep.n_gates))))
+        value = sweep.data[ray, gate]
+        out[i, j] = value if np.isfinite(value) else nodata
+    return out
+
+
+def test_index_matches_brute_force_nearest_lookup():
+    sweep = _sweep()
+    index = PolarGridIndex.build(GridIndexKey.for_sweep(sweep, GRID))
+    result = index.apply(sweep, nodata=-9999.0)
+    np.testing.assert_array_equal(result, _expected(sweep, GRID, -9999.0))
+
+
+def test_row_zero_is_north():
+    sweep = _sweep()
+    result = PolarGridIndex.build(GridIndexKey.for_sweep(sweep, GRID)).apply(sweep)
+    north = result[0, GRID.size // 2]
+    south = result[-1, GRID.size // 2]
+    # Rays are numbered clockwise from north: ray 0 points north, ray ~360 points south.
+    assert north // 1000 in (0, 719)
+    assert 355 <= south // 1000 <= 365
+
+
+def test_cache_reuses_index_across_azimuth_jitter_and_persists(tmp_path):
+    cache = GridIndexCache(cache_dir=tmp_path)
+    first = cache.grid(_sweep(), GRID)
+    second = cache.grid(_sweep(jitter=0.1), GRID)
+    assert cache.stats["builds"] == 1
+    assert cache.stats["memory_hits"] == 1
+    assert (first != -9999.0).sum() == (second != -9999.0).sum()
+    assert len(list(tmp_path.glob("KTLX-*.npz"))) == 1
+
+    fresh = GridIndexCache(cache_dir=tmp_path)
+    np.testing.assert_array_equal(fresh.grid(_sweep(), GRID), first)
+    assert fresh.stats["disk_hits"] == 1
+    assert fresh.stats["builds"] == 0
+
+
+def test_different_gate_layout_builds_new_index(tmp_path):
+    cache = GridIndexCache(cache_dir=tmp_path)
+    cache.grid(_sweep(), GRID)
+    cache.grid(_sweep(n_gates=120), GRID)
+    assert cache.stats["builds"] == 2
+
+
+def _destination(lat, lon, bearing_deg, distance_m, radius=6371000.0):
+    phi1, lam1, theta = np.radians(lat), np.radians(lon), np.radians(bearing_deg)
+    delta = distance_m / radius
+    phi2 = np.arcsin(np.sin(phi1) * np.cos(delta) + np.cos(phi1) * np.sin(delta) * np.cos(theta))
+    lam2 = lam1 + np.arctan2(
+        np.sin(theta) * np.sin(delta) * np.cos(phi1), np.cos(delta) - np.sin(phi1) * np.sin(phi2)
+    )
+    return np.degrees(phi2), np.degrees(lam2)
+
+
+def test_mercator_grid_is_tile_aligned_and_covers_the_radar_range():
+    grid = MercatorGridConfig(zoom=7, radius_km=300).for_site(35.3331, -97.2778)
+    assert grid.shape == (grid.tiles_y * 256, grid.tiles_x * 256)
+    assert grid.tile_x0 % 2 == 0 and grid.tile_y0 % 2 == 0
+    assert grid.tiles_x % 2 == 0 and grid.tiles_y % 2 == 0
+    # Tile indices match the standard XYZ scheme: KTLX (Oklahoma) sits in tile (29, 50) at z7.
+    assert grid.tile_x0 <= 29 < grid.tile_x0 + grid.tiles_x
+    assert grid.tile_y0 <= 50 < grid.tile_y0 + grid.tiles_y
+
+    x, y = grid.pixel_offsets()
+    ground = np.hypot(x, y)
+    assert ground.min() < grid.resolution_m
+    # Every edge pixel lies beyond the radar range, so the whole range is on the raster.
+    edges = np.concatenate([ground[0], ground[-1], ground[:, 0], ground[:, -1]])
+    assert edges.min() > 300_000
+
+
+def test_default_grids_fit_the_tiler_frame_cache():
+    from src.atmos_ingestion.jobs import nexrad_level2
+
+    # TILER_FRAME_MAX_PIXELS default: larger frames fall back to per-tile COG reads.
+    frame_max_pixels = 2048 * 2048
+    # Mercator stretch grows with latitude: Fairbanks (PAPD) and Anchorage (PAFC) are the worst.
+    for lat, lon in [(65.0353, -147.5014), (60.7259, -151.3515), (41.9558, -71.1369), (35.3331, -97.2778)]:
+        grid = nexrad_level2.MERCATOR_GRID.for_site(lat, lon)
+        assert grid.shape[0] * grid.shape[1] <= frame_max_pixels
+        assert grid.tile_x0 % 2 == 0 and grid.tiles_x % 2 == 0  # whole 512-px blocks
+
+
+def test_mercator_offsets_match_great_circle_geometry():
+    lat0, lon0 = 47.1158, -124.1069  # KATX-ish, where Mercator stretch is large
+    grid = MercatorGridConfig(zoom=8, radius_km=250).for_site(lat0, lon0)
+    lon, lat = grid.pixel_lonlat()
+    x, y = grid.pixel_offsets()
+    for bearing, distance in ((0, 100_000), (90, 150_000), (225, 200_000)):
+        plat, plon = _destination(lat0, lon0, bearing, distance)
+        i = int(np.argmin(np.abs(lat[:, 0] - plat)))
+        j = int(np.argmin(np.abs(lon[0] - plon)))
+        expected_x = distance * np.sin(np.radians(bearing))
+        expected_y = distance * np.cos(np.radians(bearing))
+        # Within one (ground-projected) pixel of the exact point.
+        tolerance = grid.resolution_m * np.cos(np.radians(plat))
+        assert abs(x[i, j] - expected_x) < tolerance
+        assert abs(y[i, j] - expected_y) < tolerance
+
+
+def test_mercator_index_is_cached_per_site(tmp_path):
+    config = MercatorGridConfig(zoom=9, radius_km=20)
+    sweep = _sweep()
+    grid = config.for_site(35.3331, -97.2778)
+    cache = GridIndexCache(cache_dir=tmp_path)
+    first = cache.grid(sweep, grid)
+    assert first.shape == grid.shape
+    assert (first != -9999.0).any()
+    np.testing.assert_array_equal(GridIndexCache(cache_dir=tmp_path).grid(sweep, grid), first)
+    other_site = config.for_site(41.6044, -88.0847)
+    cache.grid(sweep, other_site)
+    assert cache.stats["builds"] == 2
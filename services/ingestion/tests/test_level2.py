@@ -0,0 +1,162 @@
+"""Lean Level II reader checked against Py-ART on the sample volumes it ships."""
+from __future__ import annotations
+
+import bz2
+import io
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pyart
+import pytest
+from pyart.testing import (
+    NEXRAD_ARCHIVE_MSG1_FILE,
+    NEXRAD_ARCHIVE_MSG31_COMPRESSED_FILE,
+    NEXRAD_ARCHIVE_MSG31_FILE,
+)
+
+from src.atmos_ingestion.jobs import nexrad_level2
+from src.atmos_ingestion.level2 import (
+    Level2DecodeError,
+    decompress_volume,
+    read_lowest_sweep,
+    split_compressed_records,
+)
+from src.atmos_ingestion.rawcache import RawObjectCache
+
+
+class _CountingStream(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.consumed = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+@pytest.fixture(scope="module")
+def full_volume() -> bytes:
+    """A complete, uncompressed Archive II volume (720 radials per super-res sweep)."""
+    with open(NEXRAD_ARCHIVE_MSG31_FILE, "rb") as fh:
+        return bz2.decompress(fh.read())
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
+def _pack(header: bytes, body: bytes, chunk: int = 1_000_000) -> bytearray:
+    out = bytearray(header)
+    for i in range(0, len(body), chunk):
+        packed = bz2.compress(body[i : i + chunk])
+        out += struct.pack(">i", len(packed)) + packed
+    return out
+
+
+def _pyart_sweep(raw: bytes):
+    radar = pyart.io.read_nexrad_archive(io.BytesIO(raw))
+    return nexrad_level2._sweep_from_pyart("KATX", radar, "reflectivity")  # noqa: SLF001
+
+
+def _assert_matches_pyart(sweep, raw: bytes) -> None:
+    oracle = _pyart_sweep(raw)
+    assert sweep.vcp == oracle.vcp
+    assert sweep.elevation_deg == pytest.approx(oracle.elevation_deg)
+    assert sweep.first_gate_m == oracle.first_gate_m
+    assert sweep.gate_spacing_m == oracle.gate_spacing_m
+    assert sweep.latitude == pytest.approx(oracle.latitude)
+    assert sweep.longitude == pytest.approx(oracle.longitude)
+    np.testing.assert_allclose(sweep.azimuths, oracle.azimuths)
+    np.testing.assert_array_equal(sweep.data, oracle.data[:, : sweep.n_gates])
+
+
+def test_compressed_volume_matches_pyart(full_volume):
+    raw = bytes(_pack(full_volume[:24], full_volume[24:]))
+    sweep = read_lowest_sweep(io.BytesIO(raw), "KATX")
+    assert sweep.n_rays == 720
+    _assert_matches_pyart(sweep, full_volume)
+
+
+def test_full_volume_matches_pyart_and_stops_after_first_sweep(full_volume):
+    stream = _CountingStream(full_volume)
+    sweep = read_lowest_sweep(stream)
+    assert sweep.site == "KATX"
+    assert sweep.n_rays == 720
+    assert stream.consumed < len(full_volume) // 5
+    _assert_matches_pyart(sweep, full_volume)
+
+
+def test_compressed_records_after_first_sweep_are_never_decompressed(full_volume):
+    # Re-pack the leading messages into bzip2 LDM records, then append a corrupt record.
+    # Reaching it would raise, so a clean decode proves the reader stopped early.
+    out = _pack(full_volume[:24], full_volume[24 : 24 + 6_000_000])
+    out += struct.pack(">i", -16) + b"BZh9" + b"\x00" * 12
+    sweep = read_lowest_sweep(io.BytesIO(bytes(out)))
+    assert sweep.n_rays == 720
+    _assert_matches_pyart(sweep, full_volume)
+
+
+def test_parallel_decompression_matches_serial(executor):
+    with open(NEXRAD_ARCHIVE_MSG31_COMPRESSED_FILE, "rb") as fh:
+        raw = fh.read()
+    records = split_compressed_records(raw)
+    assert len(records) > 1
+    serial = pyart.io.nexrad_level2._decompress_records(io.BytesIO(raw))  # noqa: SLF001
+    parallel = decompress_volume(raw, executor)
+    assert parallel[:24] == raw[:24]
+    assert parallel[36:] == serial
+    assert decompress_volume(parallel, executor) is parallel
+
+
+def test_parallel_reader_matches_pyart_and_ignores_records_past_the_sweep(full_volume, executor):
+    out = _pack(full_volume[:24], full_volume[24 : 24 + 6_000_000])
+    out += struct.pack(">i", -16) + b"BZh9" + b"\x00" * 12
+    sweep = read_lowest_sweep(io.BytesIO(bytes(out)), executor=executor)
+    assert sweep.n_rays == 720
+    _assert_matches_pyart(sweep, full_volume)
+
+
+def test_decompress_volume_rejects_corrupt_records(executor):
+    raw = b"AR2V0006.001" + bytes(12) + struct.pack(">i", -16) + b"BZh9" + b"\x00" * 12
+    with pytest.raises(Level2DecodeError):
+        decompress_volume(raw, executor)
+
+
+def test_rejects_non_archive_input():
+    with pytest.raises(Level2DecodeError):
+        read_lowest_sweep(io.BytesIO(b"not a radar volume at all"))
+
+
+def test_fetch_sweep_falls_back_to_pyart_for_message_1_volumes(monkeypatch, tmp_path):
+    with open(NEXRAD_ARCHIVE_MSG1_FILE, "rb") as fh:
+        raw = bz2.decompress(fh.read())
+    with pytest.raises(Level2DecodeError):
+        read_lowest_sweep(io.BytesIO(raw))
+
+    monkeypatch.setattr(nexrad_level2, "raw_cache", RawObjectCache(cache_dir=tmp_path))
+    monkeypatch.setattr(
+        nexrad_level2, "_get_source_object", lambda _key: {"Body": io.BytesIO(raw)}
+    )
+    sweep = nexrad_level2.fetch_sweep("KLOT", "any/key")
+    assert sweep.n_rays > 0
+    assert np.isfinite(sweep.data).any()
+
+
+def test_truncated_volume_is_rejected_not_returned_as_a_partial_sweep(full_volume, monkeypatch, tmp_path):
+    # The compressed sample stops after 120 radials of elevation 1; so does this cut.
+    with open(NEXRAD_ARCHIVE_MSG31_COMPRESSED_FILE, "rb") as fh:
+        sample = fh.read()
+    truncated = full_volume[: len(full_volume) // 40]
+    for raw in (sample, truncated):
+        with pytest.raises(Level2DecodeError, match="before elevation 1 was complete"):
+            read_lowest_sweep(io.BytesIO(raw))
+
+    calls = []
+    monkeypatch.setattr(nexrad_level2, "raw_cache", RawObjectCache(cache_dir=tmp_path))
+    monkeypatch.setattr(nexrad_level2, "_get_source_object", lambda _key: {"Body": io.BytesIO(truncated)})
+    monkeypatch.setattr(nexrad_level2, "decode_volume", lambda *args: calls.append(args) or "pyart")
+    assert nexrad_level2.fetch_sweep("KATX", "any/key") == "pyart" and calls
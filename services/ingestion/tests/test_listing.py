@@ -0,0 +1,83 @@
+import datetime as dt
+
+import pytest
+from botocore.exceptions import ClientError
+
+from src.atmos_ingestion.jobs import nexrad_level2 as module
+from src.atmos_ingestion.listing import SiteListing, parse_volume_time
+
+
+class _FakeS3:
+    """Lexicographically ordered listing with ``StartAfter`` and 2-key pages."""
+
+    def __init__(self, keys):
+        self.keys = sorted(keys)
+        self.calls = []
+
+    def get_paginator(self, _name):
+        return self
+
+    def paginate(self, Bucket, Prefix, StartAfter=None):  # noqa: N803 - boto3 signature
+        self.calls.append((Prefix, StartAfter))
+        matched = [k for k in self.keys if k.startswith(Prefix) and (StartAfter is None or k > StartAfter)]
+        for i in range(0, len(matched), 2):
+            yield {"Contents": [{"Key": k} for k in matched[i : i + 2]]}
+
+
+def _key(site, ts: dt.datetime, suffix="_V06"):
+    return f"{ts:%Y/%m/%d}/{site}/{site}{ts:%Y%m%d_%H%M%S}{suffix}"
+
+
+def test_parse_volume_time_skips_metadata_and_garbage():
+    ts = dt.datetime(2024, 5, 1, 23, 58, 7)
+    assert parse_volume_time("KTLX", _key("KTLX", ts)) == ts
+    assert parse_volume_time("KTLX", _key("KTLX", ts, "_V06_MDM")) is None
+    assert parse_volume_time("KTLX", "2024/05/01/KTLX/KTLX2024050x_235807_V06") is None
+    assert parse_volume_time("KTLX", "2024/05/01/KTLX/NOTKTLX") is None
+
+
+def test_listing_spans_midnight_and_resumes_from_cursor():
+    base = dt.datetime(2024, 5, 1, 23, 40)
+    keys = [_key("KTLX", base + dt.timedelta(minutes=5 * i)) for i in range(6)]  # 23:40 .. 00:05
+    s3 = _FakeS3(keys)
+    listing = SiteListing(lambda: s3, "bucket")
+
+    now = dt.datetime(2024, 5, 2, 0, 6)
+    found = listing.recent("ktlx", now - dt.timedelta(minutes=25), now)
+    assert [k for _, k in found] == keys[1:]
+    assert {prefix for prefix, _ in s3.calls} == {"2024/05/01/KTLX/", "2024/05/02/KTLX/"}
+
+    # A later trigger only asks for keys after the last one seen on each open day.
+    s3.keys.append(_key("KTLX", dt.datetime(2024, 5, 2, 0, 10)))
+    s3.calls.clear()
+    later = dt.datetime(2024, 5, 2, 0, 11)
+    found = listing.recent("KTLX", later - dt.timedelta(minutes=30), later)
+    assert found[-1][1] == s3.keys[-1]
+    assert ("2024/05/02/KTLX/", keys[-1]) in s3.calls
+    assert ("2024/05/01/KTLX/", keys[3]) in s3.calls
+
+    # Once yesterday is past the archive latency it is complete and never listed again.
+    s3.calls.clear()
+    much_later = dt.datetime(2024, 5, 2, 0, 30)
+    listing.recent("KTLX", much_later - dt.timedelta(minutes=60), much_later)
+    listing.recent("KTLX", much_later - dt.timedelta(minutes=60), much_later)
+    assert [prefix for prefix, _ in s3.calls].count("2024/05/01/KTLX/") == 1
+
+
+def test_list_recent_site_objects_uses_listing_and_maps_errors(monkeypatch):
+    now = dt.datetime.utcnow().replace(microsecond=0)
+    keys = [_key("KABC", now - dt.timedelta(minutes=m)) for m in (90, 20, 10, 1)]
+    s3 = _FakeS3(keys)
+    monkeypatch.setattr(module, "site_listing", SiteListing(lambda: s3, "bucket"))
+    objects = module.list_recent_site_objects("kabc", 60)
+    assert [o["key"] for o in objects] == keys[1:]
+    assert [o["ts"] for o in objects] == sorted(o["ts"] for o in objects)
+
+    class _Denied:
+        def get_paginator(self, _name):
+            raise ClientError({"Error": {"Code": "AccessDenied"}}, "ListObjectsV2")
+
+    monkeypatch.setattr(module, "site_listing", SiteListing(lambda: _Denied(), "bucket"))
+    with pytest.raises(module.RadarSourceAccessError) as info:
+        module.list_recent_site_objects("KABC", 60)
+    assert info.value.code == "AccessDenied"
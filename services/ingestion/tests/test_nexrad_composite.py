@@ -0,0 +1,135 @@
+"""Composite job: time binning, regional grid merge and publication against an in-memory store."""
+from __future__ import annotations
+
+import io
+import json
+
+import numpy as np
+import pytest
+from rasterio.io import MemoryFile
+from rasterio.transform import from_origin
+
+from src.atmos_ingestion.gridding import MercatorGrid
+from src.atmos_ingestion.jobs import nexrad_composite as composite
+from src.atmos_ingestion.jobs import nexrad_level2 as level2
+
+
+class _MemObj:
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def read(self):
+        return self._data
+
+
+class _MemMinio:
+    def __init__(self):
+        self.store: dict[str, bytes] = {}
+        self.puts = 0
+
+    def get_object(self, bucket: str, key: str):
+        return _MemObj(self.store[f"{bucket}/{key}"])
+
+    def put_object(self, bucket: str, key: str, data, length: int, content_type: str):
+        self.puts += 1
+        self.store[f"{bucket}/{key}"] = data.read()
+
+
+# Two z7 sites whose 4x4-tile windows overlap by two tile columns.
+WEST = MercatorGrid(zoom=7, tile_x0=28, tile_y0=48, tiles_x=4, tiles_y=4, latitude=35.3, longitude=-97.3)
+EAST = MercatorGrid(zoom=7, tile_x0=30, tile_y0=48, tiles_x=4, tiles_y=4, latitude=35.3, longitude=-92.0)
+
+
+def test_bin_members_keeps_each_sites_newest_frame_per_bin():
+    indexes = {
+        "KTLX": [{"timestamp_key": "20240501120130Z"}, {"timestamp_key": "20240501120430Z"}],
+        "KINX": [{"timestamp_key": "20240501120300Z"}, {"timestamp_key": "20240501120700Z"}],
+    }
+    bins = composite.bin_members(indexes, 5)
+    assert sorted(bins) == ["20240501120000Z", "20240501120500Z"]
+    assert {s: e["timestamp_key"] for s, e in bins["20240501120000Z"].items()} == {
+        "KTLX": "20240501120430Z",
+        "KINX": "20240501120300Z",
+    }
+    assert composite.bin_key("20240501120359Z", 2) == "20240501120200Z"
+    with pytest.raises(ValueError):
+        composite.bin_key("20240501120359Z", 7)
+
+
+def test_merge_frames_pastes_sites_on_a_regional_grid_and_keeps_the_max():
+    west = np.full(WEST.shape, np.nan, dtype="float32")
+    east = np.full(EAST.shape, np.nan, dtype="float32")
+    west[0, 512] = 20.0  # overlap column, weaker here
+    east[0, 0] = 45.0
+    west[5, 5] = 10.0  # only the west site covers this pixel
+    grid, merged = composite.merge_frames([(WEST, west), (EAST, east)])
+    assert (grid.tile_x0, grid.tile_y0, grid.tiles_x, grid.tiles_y) == (28, 48, 6, 4)
+    assert merged[0, 512] == 45.0 and merged[5, 5] == 10.0
+    assert np.isnan(merged[100, 1400])
+    with pytest.raises(ValueError):
+        composite.regional_grid([WEST, MercatorGrid(8, 56, 96, 8, 8, 35.3, -97.3)])
+
+
+def _publish_site_frame(client: _MemMinio, site: str, ts_key: str, grid: MercatorGrid, dbz: float) -> dict:
+    quantization = level2.REFLECTIVITY_ENCODINGS["uint8"]
+    values = np.full(grid.shape, np.nan, dtype="float32")
+    values[:256, :256] = dbz
+    codes = quantization.encode(values, np.isfinite(values))
+    profile = dict(
+        driver="GTiff", height=grid.shape[0], width=grid.shape[1], count=1, dtype="uint8", crs="EPSG:3857",
+        transform=from_origin(*grid.origin_m, grid.resolution_m, grid.resolution_m), nodata=0,
+    )
+    with MemoryFile() as mem:
+        with mem.open(**profile) as dst:
+            dst.write(codes, 1)
+        payload = mem.read()
+    cog_key = f"nexrad/{site}/{ts_key}/tilt0_reflectivity.tif"
+    meta_key = f"nexrad/{site}/{ts_key}/tilt0_reflectivity.json"
+    meta = {
+        "encoding": quantization.describe(),
+        "grid": {"projection": "mercator", "zoom": grid.zoom, "tile_size": 256,
+                 "tiles": [grid.tile_x0, grid.tile_y0, grid.tiles_x, grid.tiles_y]},
+    }
+    client.put_object(level2.DERIVED_BUCKET, cog_key, io.BytesIO(payload), len(payload), "image/tiff")
+    blob = json.dumps(meta).encode()
+    client.put_object(level2.DERIVED_BUCKET, meta_key, io.BytesIO(blob), len(blob), "application/json")
+    return {"timestamp_key": ts_key, "cog_key": cog_key, "meta_key": meta_key, "bbox": [-100.0, 32.0, -90.0, 38.0]}
+
+
+def test_run_nexrad_composite_publishes_mosaic_and_skips_unchanged_bins(monkeypatch):
+    client = _MemMinio()
+    monkeypatch.setattr(level2, "minio_client", client)
+    monkeypatch.setattr(level2, "OUTPUT_DTYPE", "uint8")
+    indexes = {
+        "KTLX": [_publish_site_frame(client, "KTLX", "20240501120130Z", WEST, 30.0)],
+        "KINX": [_publish_site_frame(client, "KINX", "20240501120300Z", EAST, 50.0)],
+    }
+    monkeypatch.setattr(level2, "load_frames_index", lambda site: indexes.get(site, []))
+
+    result = composite.run_nexrad_composite(["KTLX", "KINX", "KFDR"], bins=3)
+    assert result["added"] == 1
+    entry = result["frames"][-1]
+    assert entry["timestamp_key"] == "20240501120000Z"
+    assert entry["cog_key"] == "derived/mrms/reflq/20240501120000Z/mosaic.tif"
+    assert entry["members"] == {"KINX": "20240501120300Z", "KTLX": "20240501120130Z"}
+
+    payload = client.store[f"{level2.DERIVED_BUCKET}/{entry['cog_key']}"]
+    with MemoryFile(payload) as mem, mem.open() as src:
+        assert (src.width, src.height) == (6 * 256, 4 * 256)
+        codes = src.read(1)
+        scale, offset = src.scales[0], src.offsets[0]
+    assert codes[0, 0] * scale + offset == pytest.approx(30.0)
+    assert codes[0, 512] * scale + offset == pytest.approx(50.0)
+    assert codes[300, 300] == 0
+    occupancy = json.loads(client.store[f"{level2.DERIVED_BUCKET}/derived/mrms/reflq/20240501120000Z/mosaic_occupancy.json"])
+    assert occupancy["valid_pixels"] == 2 * 256 * 256
+
+    puts = client.puts
+    assert composite.run_nexrad_composite(["KTLX", "KINX", "KFDR"], bins=3)["added"] == 0
+    assert client.puts == puts
+
+    # A late volume changes the bin's members, so it is recomposited.
+    indexes["KTLX"].append(_publish_site_frame(client, "KTLX", "20240501120430Z", WEST, 60.0))
+    again = composite.run_nexrad_composite(["KTLX", "KINX"], bins=3)
+    assert again["added"] == 1 and again["total_frames"] == 1
+    assert again["frames"][0]["members"]["KTLX"] == "20240501120430Z"
@@ -40,16 +40,7 @@ class _MemMinio:
 
 
 def test_run_nexrad_level2_index_flow(monkeypatch):
-    # Import the module directly via spec to avoid side-effects from goes handler resolution
-    import importlib.util
-    import pathlib
-    import sys
-    base = pathlib.Path(__file__).resolve().parents[1] / "src" / "atmos_ingestion" / "jobs" / "nexrad_level2.py"
-    spec = importlib.util.spec_from_file_location("nexrad_level2", base)
-    module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
-    assert spec and spec.loader
-    sys.modules[spec.name] = module
-    spec.loader.exec_module(module)  # type: ignore[attr-defined]
+    from src.atmos_ingestion.jobs import nexrad_level2 as module
 
     bucket = module.DERIVED_BUCKET
     mem_minio = _MemMinio()
@@ -68,17 +59,23 @@ def test_run_nexrad_level2_index_flow(monkeypatch):
     fake_s3 = _build_fake_s3(keys)
     monkeypatch.setattr(module, "_get_s3", lambda: fake_s3)
 
-    # Stub process_volume so we don't depend on pyart / rasterio heavy stack
-    def _fake_process(site_arg: str, key: str):
+    # Stub fetch/render so we don't depend on the network or the pyart / rasterio heavy stack;
+    # publishing runs for real against the in-memory store.
+    monkeypatch.setattr(module, "fetch_source", lambda _site, key: key.encode())
+
+    def _fake_render(site_arg: str, key: str, raw: bytes):
+        assert raw == key.encode()
         ts_key = module._timestamp_key(site_arg, key)  # noqa: SLF001
-        return {
-            "timestamp_key": ts_key,
-            "cog_key": f"nexrad/{site_arg}/{ts_key}/tilt0_reflectivity.tif",
-            "meta_key": f"nexrad/{site_arg}/{ts_key}/tilt0_reflectivity.json",
-            "tile_template": f"/tiles/weather/nexrad-{site_arg}/{ts_key}/{{z}}/{{x}}/{{y}}.png",
-        }
+        return module.RenderedFrame(
+            site=site_arg,
+            ts_key=ts_key,
+            cog_key=f"nexrad/{site_arg}/{ts_key}/tilt0_reflectivity.tif",
+            meta_key=f"nexrad/{site_arg}/{ts_key}/tilt0_reflectivity.json",
+            cog=module.EncodedCog(b"cog", 0.0),
+            meta={"timestamp_key": ts_key},
+        )
 
-    monkeypatch.setattr(module, "process_volume", _fake_process)
+    monkeypatch.setattr(module, "render_volume", _fake_render)
 
     result = module.run_nexrad_level2(site, lookback_minutes=120, max_new=5)
     assert result["added"] == 2
@@ -95,3 +92,68 @@ def test_run_nexrad_level2_index_flow(monkeypatch):
     # Ensure index file persisted in in-memory store
     stored_keys = list(mem_minio.store.keys())
     assert any(k.startswith(f"{bucket}/indices/radar/nexrad/{site}/frames.json") for k in stored_keys)
+    assert sum(k.endswith("tilt0_reflectivity.tif") for k in stored_keys) == 2
+
+
+def test_run_nexrad_level2_replaces_failed_volumes(monkeypatch):
+    from src.atmos_ingestion.jobs import nexrad_level2 as module
+
+    monkeypatch.setattr(module, "minio_client", _MemMinio())
+    now = dt.datetime.utcnow()
+    site = "KTLX"
+    keys = [
+        f"{now:%Y/%m/%d}/{site}/{site}{(now - dt.timedelta(minutes=m)):%Y%m%d_%H%M%S}_V06"
+        for m in (3, 2, 1)
+    ]
+    monkeypatch.setattr(module, "_get_s3", lambda: _build_fake_s3(keys))
+
+    def _fetch(_site: str, key: str) -> bytes:
+        if key == keys[0]:
+            raise RuntimeError("corrupt volume")
+        return b""
+
+    monkeypatch.setattr(module, "fetch_source", _fetch)
+    monkeypatch.setattr(
+        module,
+        "publish_frame",
+        lambda frame: {"timestamp_key": frame.ts_key},
+    )
+    monkeypatch.setattr(
+        module,
+        "render_volume",
+        lambda site_arg, key, raw: module.RenderedFrame(
+            site_arg, module._timestamp_key(site_arg, key), "", "", module.EncodedCog(b"", 0.0), {}  # noqa: SLF001
+        ),
+    )
+
+    result = module.run_nexrad_level2(site, lookback_minutes=120, max_new=2)
+    assert result["added"] == 2
+    assert [f["timestamp_key"] for f in result["frames"]] == [
+        module._timestamp_key(site, k) for k in keys[1:]  # noqa: SLF001
+    ]
+
+
+def test_nexrad_job_prewarms_only_newly_indexed_frames(monkeypatch):
+    from src.atmos_ingestion.jobs import nexrad_level2 as module
+
+    # A site of its own: listing cursors are module state shared with the tests above.
+    monkeypatch.setattr(module, "minio_client", _MemMinio())
+    now = dt.datetime.utcnow()
+    keys = [f"{now:%Y/%m/%d}/KPRW/KPRW{(now - dt.timedelta(minutes=m)):%Y%m%d_%H%M%S}_V06" for m in (2, 1)]
+    monkeypatch.setattr(module, "_get_s3", lambda: _build_fake_s3(keys))
+    monkeypatch.setattr(module, "fetch_source", lambda _site, key: b"")
+    monkeypatch.setattr(module, "publish_frame", lambda frame: {"timestamp_key": frame.ts_key})
+    monkeypatch.setattr(
+        module,
+        "render_volume",
+        lambda site, key, raw: module.RenderedFrame(
+            site, module._timestamp_key(site, key), "", "", module.EncodedCog(b"", 0.0), {}  # noqa: SLF001
+        ),
+    )
+    calls = []
+    monkeypatch.setattr(module, "request_prewarm", lambda dataset, timestamps: calls.append((dataset, timestamps)))
+
+    module.run_nexrad_level2("KPRW", lookback_minutes=120, max_new=5)
+    module.run_nexrad_level2("KPRW", lookback_minutes=120, max_new=5)
+    assert len(calls) == 1 and calls[0][0] == "nexrad-KPRW"
+    assert sorted(calls[0][1]) == [module._timestamp_key("KPRW", k) for k in keys]  # noqa: SLF001
@@ -0,0 +1,56 @@
+import base64
+
+import numpy as np
+import pytest
+
+from src.atmos_ingestion.gridding import MercatorGrid
+from src.atmos_ingestion.occupancy import footprint_bbox, occupancy_document, tile_occupancy
+
+# 4x4 z7 tiles starting at (28, 48); grid pixels are z7 tile pixels.
+GRID = MercatorGrid(zoom=7, tile_x0=28, tile_y0=48, tiles_x=4, tiles_y=4, latitude=35.3, longitude=-97.3)
+
+
+def _bits(window):
+    packed = np.frombuffer(base64.b64decode(window["bits"]), dtype="uint8")
+    count = window["width"] * window["height"]
+    return np.unpackbits(packed)[:count].reshape(window["height"], window["width"]).astype(bool)
+
+
+def test_occupancy_marks_tiles_with_valid_pixels_at_every_zoom():
+    valid = np.zeros(GRID.shape, dtype=bool)
+    valid[256 + 10, 256 + 200] = True  # z7 tile (29, 49), in its top-right z8 child (59, 98)
+    zooms = tile_occupancy(valid, GRID, min_zoom=3, max_zoom=8)
+    assert sorted(zooms, key=int) == ["3", "4", "5", "6", "7", "8"]
+
+    z7 = zooms["7"]
+    assert (z7["x0"], z7["y0"], z7["width"], z7["height"]) == (28, 48, 4, 4)
+    assert np.argwhere(_bits(z7)).tolist() == [[1, 1]]
+
+    z8 = zooms["8"]
+    assert (z8["x0"], z8["y0"], z8["width"]) == (56, 96, 8)
+    assert np.argwhere(_bits(z8)).tolist() == [[2, 3]]
+
+    z6 = zooms["6"]
+    assert (z6["x0"], z6["y0"], z6["width"], z6["height"]) == (14, 24, 2, 2)
+    assert np.argwhere(_bits(z6)).tolist() == [[0, 0]]
+    assert (zooms["3"]["x0"], zooms["3"]["y0"], zooms["3"]["width"]) == (1, 3, 1)
+    assert _bits(zooms["3"]).all()
+
+
+def test_odd_windows_are_padded_when_coarsening():
+    grid = MercatorGrid(zoom=7, tile_x0=29, tile_y0=49, tiles_x=1, tiles_y=1, latitude=0.0, longitude=0.0)
+    valid = np.ones(grid.shape, dtype=bool)
+    z6 = tile_occupancy(valid, grid, min_zoom=6, max_zoom=7)["6"]
+    assert (z6["x0"], z6["y0"], z6["width"], z6["height"]) == (14, 24, 1, 1)
+    assert _bits(z6).all()
+    with pytest.raises(ValueError):
+        tile_occupancy(valid[:10], grid, 6, 7)
+
+
+def test_footprint_bbox_and_document():
+    west, south, east, north = footprint_bbox(35.0, -97.0, 300.0)
+    assert south == pytest.approx(35.0 - 2.698, abs=1e-3) and north == pytest.approx(35.0 + 2.698, abs=1e-3)
+    assert east - west > north - south  # longitude degrees are shorter away from the equator
+    assert footprint_bbox(89.0, 0.0, 300.0)[0::2] == [-180.0, 180.0]
+    doc = occupancy_document([west, south, east, north], valid_pixels=0)
+    assert doc["version"] == 1 and doc["zooms"] == {}
@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+
+from src.atmos_ingestion.pipeline import Stage, run_pipeline
+
+
+def test_results_keep_input_order_and_values():
+    stages = [
+        Stage("double", lambda v: v * 2, workers=3),
+        Stage("jitter", lambda v: (time.sleep(0.01 * (v % 3)), v + 1)[1], workers=2),
+    ]
+    results = run_pipeline(range(10), stages)
+    assert [r.item for r in results] == list(range(10))
+    assert [r.value for r in results] == [v * 2 + 1 for v in range(10)]
+    assert all(r.ok for r in results)
+    assert set(results[0].timings) == {"double", "jitter"}
+
+
+def test_failures_are_recorded_and_skip_later_stages():
+    seen = []
+
+    def _explode(v):
+        if v == 2:
+            raise ValueError("boom")
+        return v
+
+    results = run_pipeline(range(4), [Stage("check", _explode), Stage("sink", seen.append)])
+    assert [r.ok for r in results] == [True, True, False, True]
+    assert results[2].failed_stage == "check"
+    assert isinstance(results[2].error, ValueError)
+    assert sorted(seen) == [0, 1, 3]
+
+
+def test_stages_overlap():
+    active = {"fetch": 0, "render": 0}
+    overlap = threading.Event()
+    lock = threading.Lock()
+
+    def _make(name, other):
+        def _run(v):
+            with lock:
+                active[name] += 1
+                if active[other]:
+                    overlap.set()
+            time.sleep(0.02)
+            with lock:
+                active[name] -= 1
+            return v
+
+        return _run
+
+    run_pipeline(
+        range(6),
+        [Stage("fetch", _make("fetch", "render"), workers=2), Stage("render", _make("render", "fetch"))],
+        queue_depth=1,
+    )
+    assert overlap.is_set()
+
+
+def test_requires_stages():
+    with pytest.raises(ValueError):
+        run_pipeline([1], [])
+
+
+def test_invalid_stage_is_rejected_before_any_worker_starts():
+    before = threading.active_count()
+    with pytest.raises(ValueError):
+        run_pipeline([1], [Stage("fetch", lambda v: v, workers=2), Stage("render", lambda v: v, workers=0)])
+    assert threading.active_count() == before
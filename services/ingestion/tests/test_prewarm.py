@@ -0,0 +1,44 @@
+"""Tile prewarm notifications sent to the tiler after frames are committed."""
+from __future__ import annotations
+
+import json
+
+from src.atmos_ingestion import prewarm
+
+
+class _Response:
+    def __init__(self, status: int):
+        self.status = status
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+
+def test_request_prewarm_posts_dataset_and_timestamps(monkeypatch):
+    sent = []
+
+    def opener(request, timeout):
+        sent.append((request, timeout))
+        return _Response(202)
+
+    monkeypatch.setattr(prewarm, "PREWARM_TOKEN", "secret")
+    assert prewarm.request_prewarm("nexrad-KTLX", ["20240501120000Z"], url="http://tiler/prewarm", opener=opener)
+    request, timeout = sent[0]
+    assert request.get_method() == "POST" and request.full_url == "http://tiler/prewarm"
+    assert json.loads(request.data) == {"dataset": "nexrad-KTLX", "timestamps": ["20240501120000Z"]}
+    assert request.get_header("X-prewarm-token") == "secret" and timeout == prewarm.PREWARM_TIMEOUT_SECONDS
+
+
+def test_request_prewarm_is_best_effort(monkeypatch):
+    def unreachable(request, timeout):
+        raise OSError("connection refused")
+
+    assert not prewarm.request_prewarm("nexrad-KTLX", ["t"], url="http://tiler/prewarm", opener=unreachable)
+    assert not prewarm.request_prewarm("nexrad-KTLX", ["t"], url="http://tiler/prewarm", opener=lambda r, timeout: _Response(503))
+    # Disabled without a URL, and nothing to do without timestamps.
+    assert not prewarm.request_prewarm("nexrad-KTLX", ["t"], url="", opener=unreachable)
+    assert not prewarm.request_prewarm("nexrad-KTLX", [], url="http://tiler/prewarm", opener=unreachable)
+
@@ -0,0 +1,139 @@
+import bz2
+import io
+import struct
+
+import numpy as np
+from pyart.testing import NEXRAD_ARCHIVE_MSG31_FILE
+
+from src.atmos_ingestion.jobs import nexrad_level2
+from src.atmos_ingestion.rawcache import (
+    CachingS3Client,
+    RawObjectCache,
+    cache_name,
+    shared_raw_cache,
+)
+
+
+class _MemoryStore:
+    def __init__(self):
+        self.blobs = {}
+
+    def load(self, name):
+        return self.blobs.get(name)
+
+    def save(self, name, payload):
+        self.blobs[name] = payload
+
+
+class _FakeS3:
+    def __init__(self, objects):
+        self.objects = objects
+        self.gets = []
+
+    def get_object(self, Bucket, Key, **kwargs):  # noqa: N803 - boto3 signature
+        self.gets.append((Bucket, Key, kwargs))
+        data = self.objects[Key]
+        if "Range" in kwargs:
+            data = data[:4]
+        return {"Body": io.BytesIO(data)}
+
+    def list_objects_v2(self, **_kwargs):
+        return {"Contents": []}
+
+
+def test_read_through_counts_hits_and_promotes_store_entries(tmp_path):
+    store = _MemoryStore()
+    cache = RawObjectCache(cache_dir=tmp_path / "a", store=store)
+    calls = []
+
+    def upstream():
+        calls.append(1)
+        return b"volume-bytes"
+
+    assert cache.fetch("bucket", "k", upstream) == b"volume-bytes"
+    assert cache.fetch("bucket", "k", upstream) == b"volume-bytes"
+    assert len(calls) == 1
+    assert cache.stats["misses"] == 1 and cache.stats["disk_hits"] == 1
+    assert cache.stats["upstream_bytes"] == len(b"volume-bytes")
+    assert cache_name("bucket", "k") in store.blobs
+
+    # A fresh worker with an empty disk is served by the store and repopulates its disk.
+    other = RawObjectCache(cache_dir=tmp_path / "b", store=store)
+    assert other.fetch("bucket", "k", upstream) == b"volume-bytes"
+    assert len(calls) == 1
+    assert other.stats["store_hits"] == 1
+    assert other.load(cache_name("bucket", "k")) == b"volume-bytes"
+    assert other.stats["disk_hits"] == 1
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = RawObjectCache(cache_dir=tmp_path, max_bytes=25)
+    for key in ("a", "b"):
+        cache.fetch("bucket", key, lambda: b"x" * 10)
+    cache.fetch("bucket", "a", lambda: b"unused")  # touch "a" so "b" is the oldest
+    cache.fetch("bucket", "c", lambda: b"x" * 10)
+    assert cache.stats["evictions"] == 1
+    assert cache.total_bytes == 20
+    assert cache.load(cache_name("bucket", "b")) is None
+    assert cache.load(cache_name("bucket", "a")) is not None
+
+    # The LRU state survives a restart.
+    reopened = RawObjectCache(cache_dir=tmp_path, max_bytes=25)
+    assert reopened.total_bytes == 20
+
+
+def test_instances_sharing_a_directory_enforce_one_bound(tmp_path):
+    # e.g. the NEXRAD job's cache and a worker process's cache on one RAW_CACHE_DIR
+    first = RawObjectCache(cache_dir=tmp_path, max_bytes=25)
+    second = RawObjectCache(cache_dir=tmp_path, max_bytes=25)
+    first.fetch("bucket", "a", lambda: b"x" * 10)
+    second.fetch("bucket", "b", lambda: b"x" * 10)
+    first.fetch("bucket", "c", lambda: b"x" * 10)
+    assert first.total_bytes == 20 and first.stats["evictions"] == 1
+    assert sum(p.stat().st_size for p in tmp_path.glob("??/*")) == 20
+    # "a" was the oldest file in the directory, whichever instance wrote it.
+    assert second.load(cache_name("bucket", "a")) is None
+    assert first.load(cache_name("bucket", "b")) == b"x" * 10
+
+    assert shared_raw_cache(cache_dir=tmp_path / "s", max_bytes=25) is shared_raw_cache(
+        cache_dir=tmp_path / "s" / ".." / "s", max_bytes=25
+    )
+
+
+def test_caching_client_passes_through_ranged_reads_and_other_methods(tmp_path):
+    inner = _FakeS3({"k": b"payload"})
+    client = CachingS3Client(inner, RawObjectCache(cache_dir=tmp_path))
+    assert client.get_object(Bucket="b", Key="k")["Body"].read() == b"payload"
+    assert client.get_object(Bucket="b", Key="k")["Body"].read() == b"payload"
+    assert client.get_object(Bucket="b", Key="k", Range="bytes=0-3")["Body"].read() == b"payl"
+    buf = io.BytesIO()
+    client.download_fileobj("b", "k", buf)
+    assert buf.getvalue() == b"payload"
+    assert client.list_objects_v2(Bucket="b") == {"Contents": []}
+    assert [kwargs for *_, kwargs in inner.gets] == [{}, {"Range": "bytes=0-3"}]
+
+
+def test_nexrad_reprocessing_reads_the_cached_sweep_prefix(monkeypatch, tmp_path):
+    with open(NEXRAD_ARCHIVE_MSG31_FILE, "rb") as fh:
+        volume = bz2.decompress(fh.read())
+    # Re-pack as bzip2 LDM records, as volumes are published upstream.
+    raw = volume[:24]
+    for i in range(24, len(volume), 1_000_000):
+        packed = bz2.compress(volume[i : i + 1_000_000])
+        raw += struct.pack(">i", len(packed)) + packed
+    cache = RawObjectCache(cache_dir=tmp_path)
+    downloads = []
+
+    def _source(key):
+        downloads.append(key)
+        return {"Body": io.BytesIO(raw)}
+
+    monkeypatch.setattr(nexrad_level2, "raw_cache", cache)
+    monkeypatch.setattr(nexrad_level2, "_get_source_object", _source)
+    first = nexrad_level2.fetch_sweep("KATX", "2013/07/17/KATX/vol")
+    second = nexrad_level2.fetch_sweep("KATX", "2013/07/17/KATX/vol")
+    assert downloads == ["2013/07/17/KATX/vol"]
+    assert cache.stats["disk_hits"] == 1
+    assert 0 < cache.stats["upstream_bytes"] < len(raw)
+    assert second.n_rays == first.n_rays
+    np.testing.assert_array_equal(second.data, first.data)
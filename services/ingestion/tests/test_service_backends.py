@@ -0,0 +1,67 @@
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from src.atmos_ingestion import workers
+from src.atmos_ingestion.config import IngestionSettings
+from src.atmos_ingestion.service import IngestionService
+
+
+def _settings(**overrides):
+    values = {
+        "MINIO_ENDPOINT": "http://localhost:9000",
+        "GOES_SOURCE_BUCKET": "goes-bucket",
+        "INGESTION_MAX_WORKERS": 1,
+    }
+    values.update(overrides)
+    return IngestionSettings(**values)
+
+
+class ServiceBackendTest(unittest.TestCase):
+    def test_thread_backend_is_default(self):
+        service = IngestionService(_settings())
+        try:
+            self.assertFalse(service.uses_processes)
+            self.assertIsInstance(service._executor, ThreadPoolExecutor)  # noqa: SLF001
+        finally:
+            service.close()
+
+    def test_process_backend_runs_jobs_in_initialised_workers(self):
+        service = IngestionService(
+            _settings(INGESTION_EXECUTOR_BACKEND="process", INGESTION_WORKER_MAX_TASKS=2)
+        )
+        try:
+            self.assertTrue(service.uses_processes)
+            # Without the legacy GOES handler the worker's lookup finds nothing; the error
+            # proves the job ran inside an initialised worker and crossed the process boundary.
+            with self.assertRaises(FileNotFoundError):
+                asyncio.run(service.run_goes(None, "CONUS", None))
+        finally:
+            service.close()
+
+
+class WorkerStateTest(unittest.TestCase):
+    def tearDown(self):
+        workers._state.clear()  # noqa: SLF001
+
+    def test_jobs_require_initialisation(self):
+        workers._state.clear()  # noqa: SLF001
+        with self.assertRaises(RuntimeError):
+            workers.run_goes_job(None, None, None)
+
+    def test_initialised_worker_reuses_clients_and_defaults(self):
+        workers.initialise_worker(_settings().model_dump(by_alias=True))
+        clients = workers._state["clients"]  # noqa: SLF001
+        self.assertIs(workers._state["goes"]._clients, clients)  # noqa: SLF001
+
+        with patch(
+            "src.atmos_ingestion.jobs.nexrad_level2.run_nexrad_level2",
+            return_value={"added": 0},
+        ) as runner:
+            workers.run_nexrad_job(None, None, 1)
+        runner.assert_called_once_with("KTLX", 10, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
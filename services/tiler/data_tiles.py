@@ -0,0 +1,99 @@
+"""Raw data tiles: a tile's values, compressed, for colourizing on the client (GPU).
+
+A data tile carries the band values instead of colours, so every palette, threshold,
+``rescale`` and temperature unit is applied by the client and one cached tile serves
+them all. The body is a zlib stream (``DecompressionStream("deflate")`` in browsers) of
+a row-major, little-endian ``height x width`` array. Its layout is described by headers:
+
+- ``X-Data-Dtype``: ``uint8``/``uint16`` codes of a quantized COG, or ``float16``.
+- ``X-Data-Scale``/``X-Data-Offset``: ``value = code * scale + offset``.
+- ``X-Data-Nodata``: the code of masked pixels (``nan`` for ``float16``).
+- ``X-Data-Shape``: ``height,width``.
+"""
+from __future__ import annotations
+
+import json
+import zlib
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+DATA_MEDIA_TYPE = "application/octet-stream"
+DATA_HEADERS = ("X-Data-Dtype", "X-Data-Scale", "X-Data-Offset", "X-Data-Nodata", "X-Data-Shape")
+
+
+@dataclass(frozen=True)
+class DataTile:
+    dtype: str
+    scale: float
+    offset: float
+    nodata: float
+    height: int
+    width: int
+    body: bytes  # zlib-compressed array
+
+    def headers(self) -> dict[str, str]:
+        return {
+            "X-Data-Dtype": self.dtype,
+            "X-Data-Scale": repr(self.scale),
+            "X-Data-Offset": repr(self.offset),
+            "X-Data-Nodata": "nan" if np.isnan(self.nodata) else repr(self.nodata),
+            "X-Data-Shape": f"{self.height},{self.width}",
+        }
+
+    def array(self) -> np.ndarray:
+        raw = zlib.decompress(self.body)
+        return np.frombuffer(raw, dtype=np.dtype(self.dtype).newbyteorder("<")).reshape(self.height, self.width)
+
+    def pack(self) -> bytes:
+        """Single blob for the tile cache: a length-prefixed JSON header, then the body."""
+        meta = {k: v for k, v in asdict(self).items() if k != "body"}
+        if np.isnan(self.nodata):
+            meta["nodata"] = None
+        header = json.dumps(meta, separators=(",", ":")).encode()
+        return len(header).to_bytes(4, "big") + header + self.body
+
+    @classmethod
+    def unpack(cls, blob: bytes) -> DataTile:
+        length = int.from_bytes(blob[:4], "big")
+        meta = json.loads(blob[4 : 4 + length])
+        if meta["nodata"] is None:
+            meta["nodata"] = float("nan")
+        return cls(**meta, body=blob[4 + length :])
+
+
+def encode_data_tile(
+    data,
+    mask,
+    *,
+    scale: float = 1.0,
+    offset: float = 0.0,
+    nodata: float | None = None,
+    level: int = 6,
+) -> DataTile:
+    """Data tile of a ``(bands, h, w)`` or ``(h, w)`` tile and its mask (0 = masked).
+
+    Unsigned integer codes (quantized COGs) are passed through with their scale/offset and
+    masked pixels set to ``nodata`` (0 when the source has none). Anything else is sent as
+    float16 physical values with NaN for masked pixels.
+    """
+    band = np.asarray(data)
+    if band.ndim == 3:
+        band = band[0]
+    masked = np.asarray(mask) == 0 if mask is not None else np.zeros(band.shape, dtype=bool)
+    if band.dtype.kind == "u" and band.dtype.itemsize <= 2:
+        code = band.dtype.type(0 if nodata is None or np.isnan(nodata) else nodata)
+        values = np.where(masked, code, band).astype(band.dtype.newbyteorder("<"), copy=False)
+        dtype, out_scale, out_offset, out_nodata = band.dtype.name, float(scale), float(offset), float(code)
+    else:
+        physical = np.asarray(band, dtype="float32") * float(scale) + float(offset)
+        if nodata is not None and not np.isnan(nodata):
+            masked |= np.asarray(band) == nodata
+        values = np.where(masked, np.float16("nan"), physical).astype("<f2")
+        dtype, out_scale, out_offset, out_nodata = "float16", 1.0, 0.0, float("nan")
+    height, width = values.shape
+    body = zlib.compress(np.ascontiguousarray(values).tobytes(), level)
+    return DataTile(dtype, out_scale, out_offset, out_nodata, height, width, body)
+
+
+__all__ = ["DATA_HEADERS", "DATA_MEDIA_TYPE", "DataTile", "encode_data_tile"]
@@ -0,0 +1,116 @@
+"""Tiler dataset registry: object keys, display ranges and coverage of each dataset.
+
+Datasets are addressed as ``<name>`` (``goes-c13``) or, for per-site products, as
+``<family>-<SITE>`` (``nexrad-KTLX``). ``bounds`` is the fixed lon/lat coverage of the
+product, used to answer tiles outside it without any object-store I/O. Per-site
+products instead publish a per-frame occupancy document (``occupancy_template``). Datasets
+with an ingestion frames index (``index_template``) can be animated and drilled by time range.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """How to find and render one dataset. Templates take ``{site}`` and ``{timestamp}``."""
+
+    name: str
+    key_template: str
+    rescale: tuple[float, float]
+    temperature: bool = False
+    bounds: tuple[float, float, float, float] | None = None
+    occupancy_template: str | None = None
+    per_site: bool = False
+    index_template: str | None = None
+    # Frames can be rewritten at the same timestamp (recomposited as late inputs arrive), so
+    # their tiles are revalidated instead of being served as immutable.
+    revisable: bool = False
+    # Composited at request time from the frames of the per-site dataset ``mosaic_of``.
+    mosaic_of: str | None = None
+
+    def key(self, timestamp: str, site: str | None = None) -> str:
+        return self.key_template.format(site=site, timestamp=timestamp)
+
+    def index_key(self, site: str | None = None) -> str | None:
+        if self.index_template is None:
+            return None
+        return self.index_template.format(site=site)
+
+    def occupancy_key(self, timestamp: str, site: str | None = None) -> str | None:
+        if self.occupancy_template is None:
+            return None
+        return self.occupancy_template.format(site=site, timestamp=timestamp)
+
+
+DATASETS: dict[str, DatasetSpec] = {
+    spec.name: spec
+    for spec in (
+        DatasetSpec(
+            "goes-c13",
+            "derived/goes/east/abi/c13/conus/{timestamp}/bt_c13.tif",
+            (180.0, 330.0),
+            temperature=True,
+            bounds=(-152.1, 14.0, -52.9, 56.8),
+        ),
+        # Written by the ingestion multi-site composite job (atmos_ingestion.jobs.nexrad_composite).
+        DatasetSpec(
+            "mrms-reflq",
+            "derived/mrms/reflq/{timestamp}/mosaic.tif",
+            (-30.0, 80.0),
+            bounds=(-130.0, 20.0, -60.0, 55.0),
+            occupancy_template="derived/mrms/reflq/{timestamp}/mosaic_occupancy.json",
+            index_template="indices/radar/mrms/reflq/frames.json",
+            revisable=True,
+        ),
+        # Canonical NEXRAD layout (inside derived bucket): nexrad/<SITE>/<TIMESTAMP>/...
+        DatasetSpec(
+            "nexrad",
+            "nexrad/{site}/{timestamp}/tilt0_reflectivity.tif",
+            (-30.0, 80.0),
+            occupancy_template="nexrad/{site}/{timestamp}/tilt0_occupancy.json",
+            per_site=True,
+            index_template="indices/radar/nexrad/{site}/frames.json",
+        ),
+        DatasetSpec(
+            "nexrad-mosaic",
+            "nexrad/{site}/{timestamp}/tilt0_reflectivity.tif",
+            (-30.0, 80.0),
+            mosaic_of="nexrad",
+            revisable=True,
+        ),
+    )
+}
+
+
+def lookup(dataset: str) -> tuple[DatasetSpec, str | None] | None:
+    """``(spec, site)`` for a dataset name, or ``None`` when it is not registered."""
+    spec = DATASETS.get(dataset)
+    if spec is not None and not spec.per_site:
+        return spec, None
+    family, _, site = dataset.partition("-")
+    spec = DATASETS.get(family)
+    if spec is None or not spec.per_site or not site:
+        return None
+    return spec, site.upper()
+
+
+def tile_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """``(west, south, east, north)`` of an XYZ tile in degrees."""
+    n = 2**z
+
+    def lat(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return x / n * 360.0 - 180.0, lat(y + 1), (x + 1) / n * 360.0 - 180.0, lat(y)
+
+
+def tile_outside(bounds: tuple[float, float, float, float] | list[float], z: int, x: int, y: int) -> bool:
+    """True when tile ``z/x/y`` does not intersect the lon/lat box ``bounds``."""
+    west, south, east, north = tile_bounds(z, x, y)
+    b_west, b_south, b_east, b_north = bounds
+    return west >= b_east or east <= b_west or south >= b_north or north <= b_south
+
+
+__all__ = ["DATASETS", "DatasetSpec", "lookup", "tile_bounds", "tile_outside"]
@@ -0,0 +1,171 @@
+"""Tile output formats: indexed PNG and (when Pillow is installed) WebP.
+
+Each dataset family has an :class:`EncodingProfile` with its PNG zlib level and row
+filter and its WebP mode. Radar ramps are a handful of flat colours that compress
+best losslessly, while smooth IR imagery tolerates lossy WebP. The defaults can be
+overridden per family with ``TILE_ENCODING_<FAMILY>`` (for example
+``TILE_ENCODING_GOES="png_level=9,png_filter=up,webp_lossless=0,webp_quality=70"``).
+"""
+from __future__ import annotations
+
+import io
+import os
+from dataclasses import dataclass, fields, replace
+
+import numpy as np
+from services.tiler.png import FILTERS, encode_indexed_apng, encode_indexed_png
+
+try:  # Pillow is optional; without it only PNG is served
+    from PIL import Image  # type: ignore
+except ImportError:  # pragma: no cover - executed only when Pillow is absent
+    Image = None  # type: ignore
+
+MEDIA_TYPES = {"png": "image/png", "webp": "image/webp"}
+# Multi-frame tile stacks: APNG, animated WebP, or length-prefixed single-frame images.
+STACK_MEDIA_TYPES = {"apng": "image/apng", "webp": "image/webp", "bin": "application/octet-stream"}
+
+
+def webp_available() -> bool:
+    return Image is not None
+
+
+@dataclass(frozen=True)
+class EncodingProfile:
+    png_level: int = 6
+    png_filter: str = "none"
+    webp_lossless: bool = True
+    webp_quality: int = 80
+    webp_method: int = 4
+
+    def __post_init__(self):
+        if self.png_filter not in FILTERS:
+            raise ValueError(f"png_filter must be one of {sorted(FILTERS)}, got {self.png_filter!r}")
+        if not 0 <= self.png_level <= 9:
+            raise ValueError(f"png_level must be 0-9, got {self.png_level}")
+
+    @classmethod
+    def parse(cls, spec: str, base: EncodingProfile | None = None) -> EncodingProfile:
+        """Override ``base`` with ``key=value`` pairs separated by commas."""
+        types = {f.name: f.type for f in fields(cls)}
+        overrides: dict[str, object] = {}
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            name, _, value = item.partition("=")
+            name = name.strip()
+            if name not in types:
+                raise ValueError(f"unknown encoding option {name!r}")
+            if types[name] == "bool":
+                overrides[name] = value.strip().lower() in ("1", "true", "yes")
+            elif types[name] == "int":
+                overrides[name] = int(value)
+            else:
+                overrides[name] = value.strip()
+        return replace(base or cls(), **overrides)
+
+
+# See scripts/bench_tile_encoding.py: "sub" trims radar PNGs by ~20% at no extra cost, and
+# zlib levels above 2 buy smooth IR fields little beyond much longer encodes.
+DEFAULT_PROFILES = {
+    "nexrad": EncodingProfile(png_filter="sub"),
+    "mrms": EncodingProfile(png_filter="sub"),
+    "goes": EncodingProfile(png_level=2, png_filter="up", webp_lossless=False, webp_quality=80),
+}
+
+
+def _family(dataset: str) -> str:
+    return dataset.split("-", 1)[0]
+
+
+def load_profiles() -> dict[str, EncodingProfile]:
+    """Defaults with any ``TILE_ENCODING_<FAMILY>`` overrides applied."""
+    profiles = dict(DEFAULT_PROFILES)
+    for family, profile in DEFAULT_PROFILES.items():
+        spec = os.getenv(f"TILE_ENCODING_{family.upper()}")
+        if spec:
+            profiles[family] = EncodingProfile.parse(spec, profile)
+    return profiles
+
+
+def profile_for(profiles: dict[str, EncodingProfile], dataset: str) -> EncodingProfile:
+    return profiles.get(_family(dataset), EncodingProfile())
+
+
+def encode_tile(indices: np.ndarray, palette: np.ndarray, fmt: str, profile: EncodingProfile) -> bytes:
+    """Encode palette ``indices`` as ``fmt`` (``png`` or ``webp``) using ``profile``."""
+    if fmt == "png":
+        return encode_indexed_png(indices, palette, profile.png_level, profile.png_filter)
+    if fmt == "webp":
+        if Image is None:
+            raise RuntimeError("WebP encoding requires Pillow")
+        rgba = np.asarray(palette, dtype="uint8")[indices]
+        buffer = io.BytesIO()
+        Image.fromarray(rgba).save(
+            buffer,
+            format="WEBP",
+            lossless=profile.webp_lossless,
+            quality=profile.webp_quality,
+            method=profile.webp_method,
+            exact=True,
+        )
+        return buffer.getvalue()
+    raise ValueError(f"unsupported tile format {fmt!r}")
+
+
+def encode_stack(
+    frames: list[np.ndarray],
+    palette: np.ndarray,
+    fmt: str,
+    profile: EncodingProfile,
+    delay_ms: int = 250,
+) -> bytes:
+    """Encode same-sized palette index frames as one animation or packed stack.
+
+    ``bin`` is each frame encoded as a single PNG, prefixed by its length as a big-endian
+    uint32, in frame order. Clients can then hand frames to the map as ordinary images.
+    """
+    if fmt == "apng":
+        return encode_indexed_apng(frames, palette, delay_ms, profile.png_level, profile.png_filter)
+    if fmt == "bin":
+        blobs = [encode_tile(frame, palette, "png", profile) for frame in frames]
+        return b"".join(len(blob).to_bytes(4, "big") + blob for blob in blobs)
+    if fmt == "webp":
+        if Image is None:
+            raise RuntimeError("WebP encoding requires Pillow")
+        lut = np.asarray(palette, dtype="uint8")
+        images = [Image.fromarray(lut[frame]) for frame in frames]
+        buffer = io.BytesIO()
+        images[0].save(
+            buffer,
+            format="WEBP",
+            save_all=True,
+            append_images=images[1:],
+            duration=delay_ms,
+            loop=0,
+            lossless=profile.webp_lossless,
+            quality=profile.webp_quality,
+            method=profile.webp_method,
+        )
+        return buffer.getvalue()
+    raise ValueError(f"unsupported stack format {fmt!r}")
+
+
+def negotiate_format(suffix: str | None, accept: str | None) -> str:
+    """Explicit suffix wins; otherwise WebP when the client accepts it (and we can encode it)."""
+    if suffix:
+        return suffix
+    if accept and "image/webp" in accept and webp_available():
+        return "webp"
+    return "png"
+
+
+__all__ = [
+    "DEFAULT_PROFILES",
+    "EncodingProfile",
+    "MEDIA_TYPES",
+    "STACK_MEDIA_TYPES",
+    "encode_stack",
+    "encode_tile",
+    "load_profiles",
+    "negotiate_format",
+    "profile_for",
+    "webp_available",
+]
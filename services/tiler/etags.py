@@ -0,0 +1,121 @@
+"""Entity tags for tile responses, derived from the source COG's object ETag.
+
+A tile is a pure function of its source object and its render parameters, so its strong
+ETag is a hash of the two: it can be computed, and a conditional request answered with
+``304 Not Modified``, without reading or rendering anything. Source ETags are looked up
+with an object-store ``HEAD`` and kept for ``ttl`` seconds, so an object that ingestion
+rewrites (a recomposited bin) gets a new tag within that time.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger("tiler.etags")
+
+
+def tile_etag(source: str, *params: object) -> str:
+    """Strong (quoted) ETag of a response rendered from ``source`` with ``params``."""
+    text = "|".join([source, *map(str, params)])
+    return '"' + hashlib.sha1(text.encode()).hexdigest()[:32] + '"'
+
+
+def source_digest(source_etag: str | None) -> str | None:
+    """Short id of a source object version, for tile cache keys."""
+    if source_etag is None:
+        return None
+    return hashlib.sha1(source_etag.encode()).hexdigest()[:12]
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True when an ``If-None-Match`` header matches ``etag`` (weak comparison, RFC 9110)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag.removeprefix("W/"):
+            return True
+    return False
+
+
+class SourceETags:
+    """LRU of object ETags keyed by ``(bucket, key)``, each kept for ``ttl`` seconds.
+
+    ``loader`` returns the object's ETag; failures (missing objects, store errors) are
+    remembered as ``None`` for the same time so they are not retried per tile.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str, str], str],
+        *,
+        ttl: float = 300.0,
+        max_entries: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._loader = loader
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], tuple[float, str | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "loads": 0, "missing": 0}
+
+    def peek(self, bucket: str, key: str) -> tuple[bool, str | None]:
+        """``(found, etag)`` without loading; usable on the event loop."""
+        ident = (bucket, key)
+        with self._lock:
+            entry = self._entries.get(ident)
+            if entry is None or self._clock() - entry[0] >= self._ttl:
+                return False, None
+            self._entries.move_to_end(ident)
+            self.stats["hits"] += 1
+            return True, entry[1]
+
+    def last_known(self, bucket: str, key: str) -> str | None:
+        """Last loaded ETag of ``bucket/key`` however old, without loading; usable on the loop.
+
+        Only for objects that never change once written, whose ETag cannot go stale.
+        """
+        ident = (bucket, key)
+        with self._lock:
+            entry = self._entries.get(ident)
+            if entry is None or entry[1] is None:
+                return None
+            self._entries.move_to_end(ident)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def get(self, bucket: str, key: str) -> str | None:
+        """Current ETag of ``bucket/key``, loading it when unknown or stale (blocking)."""
+        found, etag = self.peek(bucket, key)
+        if found:
+            return etag
+        try:
+            etag = self._loader(bucket, key).strip('"')
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("ETag of %s/%s unavailable: %s", bucket, key, exc)
+            etag = None
+        with self._lock:
+            self.stats["loads" if etag is not None else "missing"] += 1
+            self._entries[(bucket, key)] = (self._clock(), etag)
+            self._entries.move_to_end((bucket, key))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return etag
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries)}
+
+
+__all__ = ["SourceETags", "etag_matches", "source_digest", "tile_etag"]
@@ -0,0 +1,199 @@
+"""Whole-frame array cache for small single-band rasters (NEXRAD frames).
+
+A NEXRAD frame is one small band on the Web-Mercator tile grid, so instead of a GDAL
+windowed read over HTTP per tile, the whole band is read once into memory and every
+tile of it is cut out by index arithmetic (nearest-neighbour resampling). Rasters that
+are not EPSG:3857, have several bands or exceed a pixel budget are reported as
+ineligible and stay on the regular COG reader path.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger("tiler.frames")
+
+MERCATOR_RADIUS_M = 6378137.0
+MERCATOR_HALF_EXTENT_M = math.pi * MERCATOR_RADIUS_M
+MERCATOR_MAX_LAT = 85.0511287798
+
+
+@dataclass(frozen=True)
+class Frame:
+    """A decoded band and its north-up EPSG:3857 georeferencing."""
+
+    data: np.ndarray
+    left: float
+    top: float
+    res_x: float
+    res_y: float
+    nodata: float | None = None
+    scale: float = 1.0
+    offset: float = 0.0
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.data.nbytes)
+
+    def tile(self, z: int, x: int, y: int, tile_size: int = 256) -> tuple[np.ndarray, np.ndarray] | None:
+        """Return ``(data, mask)`` shaped like rio-tiler's output, or ``None`` if disjoint.
+
+        ``data`` is ``(1, tile_size, tile_size)`` in the frame's own dtype (so quantized codes
+        stay codes) and ``mask`` is uint8, 255 where the pixel is inside and valid.
+        """
+        res = 2 * MERCATOR_HALF_EXTENT_M / (tile_size * 2**z)
+        centers = np.arange(tile_size, dtype="float64") + 0.5
+        mx = -MERCATOR_HALF_EXTENT_M + (x * tile_size + centers) * res
+        my = MERCATOR_HALF_EXTENT_M - (y * tile_size + centers) * res
+        height, width = self.data.shape
+        cols = np.floor((mx - self.left) / self.res_x).astype(np.int64)
+        rows = np.floor((self.top - my) / self.res_y).astype(np.int64)
+        col_ok = (cols >= 0) & (cols < width)
+        row_ok = (rows >= 0) & (rows < height)
+        if not col_ok.any() or not row_ok.any():
+            return None
+        # The grid is axis-aligned, so the 2-D gather separates into row and column indices.
+        data = self.data[np.ix_(np.clip(rows, 0, height - 1), np.clip(cols, 0, width - 1))]
+        valid = np.outer(row_ok, col_ok)
+        if self.nodata is not None and not math.isnan(self.nodata):
+            valid &= data != self.nodata
+        if data.dtype.kind == "f":
+            valid &= ~np.isnan(data)
+        return data[np.newaxis], valid.astype("uint8") * 255
+
+    def sample(self, lon: float, lat: float) -> float | None:
+        """Value (``code * scale + offset``) of the pixel holding ``lon/lat``; ``None`` if no data."""
+        if not -MERCATOR_MAX_LAT <= lat <= MERCATOR_MAX_LAT:
+            return None
+        mx = math.radians(lon) * MERCATOR_RADIUS_M
+        my = MERCATOR_RADIUS_M * math.log(math.tan(math.pi / 4 + math.radians(lat) / 2))
+        col = math.floor((mx - self.left) / self.res_x)
+        row = math.floor((self.top - my) / self.res_y)
+        height, width = self.data.shape
+        if not (0 <= row < height and 0 <= col < width):
+            return None
+        value = self.data[row, col]
+        if (self.nodata is not None and value == self.nodata) or (self.data.dtype.kind == "f" and np.isnan(value)):
+            return None
+        return float(value) * self.scale + self.offset
+
+
+def read_frame(path: str, max_pixels: int) -> Frame | None:
+    """Read a whole raster with rasterio, or return ``None`` when it is not eligible."""
+    import rasterio  # type: ignore
+
+    with rasterio.open(path) as ds:
+        transform = ds.transform
+        eligible = (
+            ds.count == 1
+            and ds.width * ds.height <= max_pixels
+            and ds.crs is not None
+            and ds.crs.to_epsg() == 3857
+            and transform.b == 0
+            and transform.d == 0
+            and transform.e < 0
+        )
+        if not eligible:
+            return None
+        return Frame(
+            data=ds.read(1),
+            left=transform.c,
+            top=transform.f,
+            res_x=transform.a,
+            res_y=-transform.e,
+            nodata=ds.nodata,
+            scale=(ds.scales or (1.0,))[0],
+            offset=(ds.offsets or (0.0,))[0],
+        )
+
+
+class FrameCache:
+    """Byte-bounded LRU of :class:`Frame` objects keyed by ``(bucket, key)``.
+
+    Each object is loaded at most once at a time; concurrent tiles of a new frame wait
+    for the first load. Ineligible objects are remembered so they are not reopened.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str, str], Frame | None],
+        *,
+        max_bytes: int = 256 << 20,
+        max_ineligible: int = 1024,
+    ):
+        self._loader = loader
+        self._max_bytes = max_bytes
+        self._max_ineligible = max_ineligible
+        self._frames: OrderedDict[tuple[str, str], Frame] = OrderedDict()
+        self._ineligible: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self._loading: dict[tuple[str, str], threading.Lock] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "loads": 0, "ineligible": 0, "evictions": 0}
+
+    def _lookup(self, ident: tuple[str, str]) -> tuple[bool, Frame | None]:
+        with self._lock:
+            frame = self._frames.get(ident)
+            if frame is not None:
+                self._frames.move_to_end(ident)
+                self.stats["hits"] += 1
+                return True, frame
+            if ident in self._ineligible:
+                return True, None
+            return False, None
+
+    def get(self, bucket: str, key: str) -> Frame | None:
+        """Return the cached frame, loading it on first use; ``None`` if ineligible."""
+        ident = (bucket, key)
+        found, frame = self._lookup(ident)
+        if found:
+            return frame
+        with self._lock:
+            load_lock = self._loading.setdefault(ident, threading.Lock())
+        with load_lock:
+            found, frame = self._lookup(ident)
+            if found:
+                return frame
+            try:
+                return self._store(ident, self._loader(bucket, key))
+            finally:
+                with self._lock:
+                    self._loading.pop(ident, None)
+
+    def _store(self, ident: tuple[str, str], frame: Frame | None) -> Frame | None:
+        with self._lock:
+            if frame is None or frame.nbytes > self._max_bytes:
+                logger.debug("%s/%s is not eligible for the frame cache", *ident)
+                self.stats["ineligible"] += 1
+                self._ineligible[ident] = None
+                while len(self._ineligible) > self._max_ineligible:
+                    self._ineligible.popitem(last=False)
+                return None
+            self.stats["loads"] += 1
+            self._frames[ident] = frame
+            self._bytes += frame.nbytes
+            while self._bytes > self._max_bytes:
+                _, old = self._frames.popitem(last=False)
+                self._bytes -= old.nbytes
+                self.stats["evictions"] += 1
+            return frame
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self._ineligible.clear()
+            self._bytes = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "frames": len(self._frames), "bytes": self._bytes}
+
+
+__all__ = ["Frame", "FrameCache", "read_frame"]
@@ -0,0 +1,193 @@
+"""Per-process cache of presigned COG URLs and open dataset handles.
+
+Opening a COG over HTTP costs a connection setup plus GDAL's header and IFD range reads
+before any pixel arrives. Handles are therefore kept open between requests, keyed by
+``(bucket, key)``, together with the presigned URL they were opened with. A handle is
+retired shortly before its URL expires, so GDAL never issues a range read with an
+expired signature. Objects that are rewritten in place (revisable frames) are checked out
+with their source ``version``: a new version re-signs the URL and retires every handle
+opened on the old one, so neither the handles' caches nor GDAL's per-URL range cache can
+serve the previous object's bytes.
+
+Dataset handles are not safe for concurrent reads, so each key keeps a small pool of
+idle handles: a request checks one out (opening another when all are busy) and returns
+it when done.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+logger = logging.getLogger("tiler.handles")
+
+
+class PresignError(RuntimeError):
+    """Raised when a presigned URL for a COG cannot be produced."""
+
+
+@dataclass
+class _Handle:
+    dataset: Any
+    expires_at: float
+
+
+@dataclass
+class _Entry:
+    url: str
+    url_expires_at: float
+    version: str | None = None
+    idle: list[_Handle] = field(default_factory=list)
+    busy: int = 0
+
+
+class DatasetHandleCache:
+    """Bounded, thread-safe cache of presigned URLs and open handles per object."""
+
+    def __init__(
+        self,
+        sign: Callable[[str, str, timedelta], str],
+        opener: Callable[[str], Any],
+        *,
+        max_entries: int = 64,
+        max_idle_per_key: int = 4,
+        presign_ttl: timedelta = timedelta(hours=1),
+        refresh_margin: timedelta = timedelta(minutes=5),
+        benign_errors: tuple[type[BaseException], ...] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._sign = sign
+        self._opener = opener
+        self._max_entries = max_entries
+        self._max_idle = max_idle_per_key
+        self._ttl = presign_ttl
+        self._margin = refresh_margin.total_seconds()
+        self._benign = benign_errors
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"url_hits": 0, "url_signs": 0, "handle_hits": 0, "handle_opens": 0, "handle_closes": 0}
+
+    def _close(self, handle: _Handle) -> None:
+        self.stats["handle_closes"] += 1
+        try:
+            handle.dataset.close()
+        except Exception:  # noqa: BLE001
+            logger.debug("Error closing dataset handle", exc_info=True)
+
+    def _fresh(self, expires_at: float) -> bool:
+        return self._clock() < expires_at - self._margin
+
+    def _entry(self, bucket: str, key: str, version: str | None) -> _Entry:
+        """Entry for ``(bucket, key)`` at ``version``, with a URL that is still comfortably valid."""
+        ident = (bucket, key)
+        stale: list[_Handle] = []
+        with self._lock:
+            entry = self._entries.get(ident)
+            if entry is not None and entry.version == version and self._fresh(entry.url_expires_at):
+                self._entries.move_to_end(ident)
+                self.stats["url_hits"] += 1
+                return entry
+        try:
+            url = self._sign(bucket, key, self._ttl)
+        except Exception as exc:  # noqa: BLE001
+            raise PresignError(str(exc)) from exc
+        expires_at = self._clock() + self._ttl.total_seconds()
+        with self._lock:
+            self.stats["url_signs"] += 1
+            entry = self._entries.get(ident)
+            if entry is None or entry.version != version:
+                # Handles of another object version are closed now (idle) or on release (busy).
+                if entry is not None:
+                    stale.extend(entry.idle)
+                entry = _Entry(url, expires_at, version)
+                self._entries[ident] = entry
+            else:
+                # Idle handles keep their own expiry; they are retired on checkout.
+                entry.url, entry.url_expires_at = url, expires_at
+            self._entries.move_to_end(ident)
+            while len(self._entries) > self._max_entries:
+                oldest_ident, oldest = next(iter(self._entries.items()))
+                if oldest is entry:
+                    break
+                del self._entries[oldest_ident]
+                stale.extend(oldest.idle)
+        for handle in stale:
+            self._close(handle)
+        return entry
+
+    def url(self, bucket: str, key: str, version: str | None = None) -> str:
+        return self._entry(bucket, key, version).url
+
+    @contextmanager
+    def checkout(self, bucket: str, key: str, version: str | None = None) -> Iterator[Any]:
+        """Yield an open dataset for ``bucket/key`` at ``version``; it is reused by later requests."""
+        entry = self._entry(bucket, key, version)
+        handle: _Handle | None = None
+        expired: list[_Handle] = []
+        with self._lock:
+            while entry.idle:
+                candidate = entry.idle.pop()
+                if self._fresh(candidate.expires_at):
+                    handle = candidate
+                    break
+                expired.append(candidate)
+            entry.busy += 1
+            url, url_expires_at = entry.url, entry.url_expires_at
+        for old in expired:
+            self._close(old)
+        try:
+            if handle is None:
+                handle = _Handle(self._opener(url), url_expires_at)
+                self.stats["handle_opens"] += 1
+            else:
+                self.stats["handle_hits"] += 1
+            yield handle.dataset
+        except BaseException as exc:
+            # Apart from expected errors (e.g. tile outside bounds) the handle may be in an
+            # unknown state (network error, replaced object), so it is not reused.
+            if handle is not None and not isinstance(exc, self._benign):
+                self._close(handle)
+                handle = None
+            raise
+        finally:
+            if handle is not None:
+                self._release(bucket, key, entry, handle)
+            with self._lock:
+                entry.busy -= 1
+
+    def _release(self, bucket: str, key: str, entry: _Entry, handle: _Handle) -> None:
+        with self._lock:
+            current = self._entries.get((bucket, key))
+            keep = current is entry and len(entry.idle) < self._max_idle
+            if keep:
+                entry.idle.append(handle)
+        if not keep:
+            self._close(handle)
+
+    def clear(self) -> int:
+        """Close every idle handle and forget all URLs; returns the number of keys dropped."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            for handle in entry.idle:
+                self._close(handle)
+            entry.idle.clear()
+        return len(entries)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            keys = len(self._entries)
+            idle = sum(len(e.idle) for e in self._entries.values())
+            busy = sum(e.busy for e in self._entries.values())
+        return {**self.stats, "keys": keys, "idle_handles": idle, "busy_handles": busy}
+
+
+__all__ = ["DatasetHandleCache", "PresignError"]
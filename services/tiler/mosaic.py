@@ -0,0 +1,185 @@
+"""On-the-fly multi-site NEXRAD reflectivity mosaic.
+
+``nexrad-mosaic`` tiles are composited at request time from the single-site frames
+whose coverage footprints intersect the tile. Each site contributes its frame nearest
+to the requested time, within a skew limit. ``latest`` takes every site's newest
+frame that is close to the newest frame overall. Sites and footprints come from the
+ingestion frames indexes (``indices/radar/nexrad/{SITE}/frames.json``), which are
+re-listed at most once per TTL.
+
+Overlapping coverage is resolved per pixel, either by the maximum reflectivity or by
+the nearest radar (shortest range, least beam height).
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import numpy as np
+from services.tiler.datasets import tile_outside
+
+# Ingestion keys frames as ``YYYYMMDDHHMMSSZ``; the docs and seed data use ``YYYYMMDDTHHMMSSZ``.
+TIMESTAMP_FORMATS = ("%Y%m%d%H%M%SZ", "%Y%m%dT%H%M%SZ")
+RULES = ("max", "nearest")
+
+
+@dataclass(frozen=True)
+class SiteFrames:
+    """A site's coverage footprint (lon/lat) and its indexed frame timestamps, oldest first."""
+
+    site: str
+    bbox: tuple[float, float, float, float]
+    timestamps: tuple[str, ...]
+
+    @property
+    def center(self) -> tuple[float, float]:
+        west, south, east, north = self.bbox
+        return (west + east) / 2, (south + north) / 2
+
+
+def parse_timestamp(value: str) -> datetime:
+    """UTC datetime of a frame timestamp key; ``ValueError`` if it is in neither format."""
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=UTC)
+        except ValueError:
+            continue
+    raise ValueError(f"invalid timestamp {value!r}")
+
+
+def select_members(
+    sites: list[SiteFrames], timestamp: str, z: int, x: int, y: int, max_skew: timedelta
+) -> list[tuple[SiteFrames, str]]:
+    """``(site, frame timestamp)`` of every site covering tile ``z/x/y`` at ``timestamp``.
+
+    Raises ``ValueError`` for a timestamp that is neither ``latest`` nor a frame timestamp key.
+    """
+    covering = [s for s in sites if s.timestamps and not tile_outside(s.bbox, z, x, y)]
+    if timestamp == "latest":
+        if not covering:
+            return []
+        newest = max(parse_timestamp(s.timestamps[-1]) for s in covering)
+        return [(s, s.timestamps[-1]) for s in covering if newest - parse_timestamp(s.timestamps[-1]) <= max_skew]
+    target = parse_timestamp(timestamp)
+    members = []
+    for site in covering:
+        nearest = min(site.timestamps, key=lambda t: abs(parse_timestamp(t) - target))
+        if abs(parse_timestamp(nearest) - target) <= max_skew:
+            members.append((site, nearest))
+    return members
+
+
+def members_digest(members: list[tuple[SiteFrames, str]]) -> str:
+    """Short stable id of a member set, so a tile is re-rendered when its inputs change."""
+    text = ",".join(sorted(f"{site.site}:{ts}" for site, ts in members))
+    return hashlib.sha1(text.encode()).hexdigest()[:12]
+
+
+def _pixel_lonlat(z: int, x: int, y: int, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Longitudes of the pixel columns and latitudes of the pixel rows of a tile."""
+    n = 2**z * size
+    centers = np.arange(size, dtype="float64") + 0.5
+    lon = (x * size + centers) / n * 360.0 - 180.0
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y * size + centers) / n))))
+    return lon, lat
+
+
+def range_rank(center: tuple[float, float], z: int, x: int, y: int, size: int) -> np.ndarray:
+    """Squared equirectangular distance (degrees^2) of each tile pixel from ``center``.
+
+    Only used to order radars per pixel, so the flat-earth approximation is enough.
+    """
+    lon, lat = _pixel_lonlat(z, x, y, size)
+    lon0, lat0 = center
+    dx = (lon - lon0) * math.cos(math.radians(lat0))
+    dy = lat - lat0
+    return dy[:, np.newaxis] ** 2 + dx[np.newaxis, :] ** 2
+
+
+def composite(
+    layers: list[tuple[np.ndarray, np.ndarray]],
+    rule: str = "max",
+    ranks: list[np.ndarray] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Merge ``(values, valid)`` layers of one tile into ``(values, mask)``.
+
+    ``max`` keeps the highest valid value per pixel; ``nearest`` keeps the valid value of
+    the layer with the lowest ``ranks`` entry. ``mask`` is uint8, 255 where any layer
+    is valid, like a rio-tiler tile mask.
+    """
+    values = np.stack([v for v, _ in layers]).astype("float32", copy=False)
+    valid = np.stack([m for _, m in layers])
+    if rule == "max":
+        merged = np.where(valid, values, -np.inf).max(axis=0)
+    elif rule == "nearest":
+        if ranks is None:
+            raise ValueError("the nearest rule needs per-layer ranks")
+        order = np.where(valid, np.stack(ranks), np.inf).argmin(axis=0)
+        merged = np.take_along_axis(values, order[np.newaxis], axis=0)[0]
+    else:
+        raise ValueError(f"unknown mosaic rule {rule!r}; expected one of {RULES}")
+    any_valid = valid.any(axis=0)
+    return np.where(any_valid, merged, np.nan).astype("float32"), any_valid.astype("uint8") * 255
+
+
+class MosaicIndex:
+    """Site footprints and frame timestamps, reloaded at most once per ``ttl`` seconds."""
+
+    def __init__(
+        self,
+        loader: Callable[[str], list[SiteFrames]],
+        *,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._loader = loader
+        self._ttl = ttl
+        self._clock = clock
+        self._sites: dict[str, tuple[float, list[SiteFrames]]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"loads": 0}
+
+    def peek(self, bucket: str) -> list[SiteFrames] | None:
+        """Current sites if fresh, without loading; usable on the event loop."""
+        entry = self._sites.get(bucket)
+        if entry is not None and self._clock() - entry[0] < self._ttl:
+            return entry[1]
+        return None
+
+    def sites(self, bucket: str) -> list[SiteFrames]:
+        """Current sites, reloading them when stale (blocking)."""
+        sites = self.peek(bucket)
+        if sites is not None:
+            return sites
+        with self._lock:
+            sites = self.peek(bucket)
+            if sites is None:
+                sites = self._loader(bucket)
+                self._sites[bucket] = (self._clock(), sites)
+                self.stats["loads"] += 1
+            return sites
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sites.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {**self.stats, "sites": {bucket: len(sites) for bucket, (_, sites) in self._sites.items()}}
+
+
+__all__ = [
+    "MosaicIndex",
+    "RULES",
+    "SiteFrames",
+    "composite",
+    "members_digest",
+    "parse_timestamp",
+    "range_rank",
+    "select_members",
+]
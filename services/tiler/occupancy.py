@@ -0,0 +1,130 @@
+"""Per-frame tile occupancy published by ingestion (see ``atmos_ingestion.occupancy``).
+
+A frame's occupancy document gives its coverage footprint and, for a range of zooms, one
+bit per XYZ tile that is set when the tile holds any valid pixel. With it the tiler can
+answer most tiles of a radar frame, which lie outside the coverage circle or see only
+clear air, without presigning, opening or reading the COG.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from services.tiler.datasets import tile_outside
+
+logger = logging.getLogger("tiler.occupancy")
+
+
+@dataclass(frozen=True)
+class _Window:
+    x0: int
+    y0: int
+    bits: np.ndarray  # (height, width) bool
+
+    def occupied(self, x: int, y: int) -> bool:
+        row, col = y - self.y0, x - self.x0
+        if 0 <= row < self.bits.shape[0] and 0 <= col < self.bits.shape[1]:
+            return bool(self.bits[row, col])
+        return False
+
+
+@dataclass(frozen=True)
+class TileOccupancy:
+    """Decoded occupancy document of one frame."""
+
+    bbox: tuple[float, float, float, float]
+    windows: dict[int, _Window]
+
+    @classmethod
+    def from_json(cls, blob: bytes | str | dict) -> TileOccupancy:
+        doc = blob if isinstance(blob, dict) else json.loads(blob)
+        windows = {}
+        for zoom, window in doc.get("zooms", {}).items():
+            width, height = int(window["width"]), int(window["height"])
+            packed = np.frombuffer(base64.b64decode(window["bits"]), dtype="uint8")
+            bits = np.unpackbits(packed)[: width * height].reshape(height, width).astype(bool)
+            windows[int(zoom)] = _Window(int(window["x0"]), int(window["y0"]), bits)
+        return cls(tuple(doc["bbox"]), windows)  # type: ignore[arg-type]
+
+    def is_empty(self, z: int, x: int, y: int) -> bool | None:
+        """True if tile ``z/x/y`` has no valid pixel, False if it has, None if unknown.
+
+        Tiles outside the footprint are always empty. Zooms deeper than the finest bitmap
+        are answered from their ancestor tile, which can only prove emptiness.
+        """
+        if tile_outside(self.bbox, z, x, y):
+            return True
+        window = self.windows.get(z)
+        if window is not None:
+            return not window.occupied(x, y)
+        coarser = [zoom for zoom in self.windows if zoom < z]
+        if not coarser:
+            return None
+        zoom = max(coarser)
+        shift = z - zoom
+        return True if not self.windows[zoom].occupied(x >> shift, y >> shift) else None
+
+
+class OccupancyCache:
+    """LRU of decoded occupancy documents keyed by ``(bucket, key)``.
+
+    ``loader`` returns the document bytes, or ``None`` when the frame has none (older
+    frames, non-mercator grids); that is remembered too so it is not fetched per tile.
+    ``version`` identifies the frame's object version for frames that can be rewritten;
+    an entry cached for another version is reloaded.
+    """
+
+    def __init__(self, loader: Callable[[str, str], bytes | None], *, max_entries: int = 512):
+        self._loader = loader
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[str | None, TileOccupancy | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "loads": 0, "missing": 0}
+
+    def peek(self, bucket: str, key: str, version: str | None = None) -> tuple[bool, TileOccupancy | None]:
+        """``(found, occupancy)`` without loading; usable on the event loop."""
+        ident = (bucket, key)
+        with self._lock:
+            entry = self._entries.get(ident)
+            if entry is None or entry[0] != version:
+                return False, None
+            self._entries.move_to_end(ident)
+            self.stats["hits"] += 1
+            return True, entry[1]
+
+    def get(self, bucket: str, key: str, version: str | None = None) -> TileOccupancy | None:
+        """Cached occupancy, loading it on first use (blocking)."""
+        found, occupancy = self.peek(bucket, key, version)
+        if found:
+            return occupancy
+        try:
+            blob = self._loader(bucket, key)
+            occupancy = TileOccupancy.from_json(blob) if blob is not None else None
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("Occupancy %s/%s unavailable: %s", bucket, key, exc)
+            occupancy = None
+        with self._lock:
+            self.stats["loads" if occupancy is not None else "missing"] += 1
+            self._entries[(bucket, key)] = (version, occupancy)
+            self._entries.move_to_end((bucket, key))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return occupancy
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries)}
+
+
+__all__ = ["OccupancyCache", "TileOccupancy"]
@@ -0,0 +1,119 @@
+"""Minimal 8-bit indexed (palette) PNG and APNG encoder.
+
+Colormapped tiles have at most 256 colours, so they are written as one byte per pixel
+with a PLTE/tRNS palette instead of RGBA: a quarter of the raw bytes to deflate, and
+typically a much smaller file. Frames of one animation share the palette, so an
+animated tile stack is the same encoding with APNG frame-control chunks.
+"""
+from __future__ import annotations
+
+import struct
+import zlib
+
+import numpy as np
+
+_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# PNG row filter types (one byte per pixel, so the left neighbour is the previous byte).
+FILTERS = {"none": 0, "sub": 1, "up": 2}
+
+
+def _chunk(tag: bytes, payload: bytes) -> bytes:
+    crc = zlib.crc32(payload, zlib.crc32(tag))
+    return struct.pack(">I", len(payload)) + tag + payload + struct.pack(">I", crc)
+
+
+def _filter_rows(indices: np.ndarray, filter_name: str) -> np.ndarray:
+    """Rows prefixed with their filter byte, filtered as ``filter_name`` (mod 256)."""
+    try:
+        filter_type = FILTERS[filter_name]
+    except KeyError:
+        raise ValueError(f"unsupported PNG filter {filter_name!r}; expected one of {sorted(FILTERS)}") from None
+    height, width = indices.shape
+    raw = np.empty((height, width + 1), dtype="uint8")
+    raw[:, 0] = filter_type
+    if filter_type == 1:
+        raw[:, 1:] = np.diff(indices, axis=1, prepend=np.uint8(0))
+    elif filter_type == 2:
+        raw[:, 1:] = np.diff(indices, axis=0, prepend=np.zeros((1, width), dtype="uint8"))
+    else:
+        raw[:, 1:] = indices
+    return raw
+
+
+def _header(indices: np.ndarray, palette: np.ndarray) -> tuple[np.ndarray, list[bytes]]:
+    """Validated indices plus the IHDR, PLTE and (if needed) tRNS chunks."""
+    indices = np.ascontiguousarray(indices, dtype="uint8")
+    if indices.ndim != 2:
+        raise ValueError(f"expected a 2-D index array, got shape {indices.shape}")
+    palette = np.asarray(palette, dtype="uint8")
+    height, width = indices.shape
+    alpha = palette[:, 3]
+    opaque_tail = len(alpha)
+    while opaque_tail and alpha[opaque_tail - 1] == 255:
+        opaque_tail -= 1
+    parts = [_chunk(b"PLTE", palette[:, :3].tobytes())]
+    if opaque_tail:
+        parts.append(_chunk(b"tRNS", alpha[:opaque_tail].tobytes()))
+    ihdr = _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0))
+    return indices, [ihdr, *parts]
+
+
+def encode_indexed_png(
+    indices: np.ndarray, palette: np.ndarray, level: int = 6, filter_name: str = "none"
+) -> bytes:
+    """Encode a ``(h, w)`` uint8 index array with a ``(n, 4)`` RGBA palette (``n <= 256``).
+
+    ``level`` is the zlib level (0-9). ``filter_name`` is applied to every row: ``none``
+    suits palette indices of discrete ramps, while ``sub``/``up`` can help smooth fields.
+    """
+    indices, (ihdr, *palette_chunks) = _header(indices, palette)
+    raw = _filter_rows(indices, filter_name)
+    return b"".join(
+        [
+            _SIGNATURE,
+            ihdr,
+            *palette_chunks,
+            _chunk(b"IDAT", zlib.compress(raw.tobytes(), level)),
+            _chunk(b"IEND", b""),
+        ]
+    )
+
+
+def encode_indexed_apng(
+    frames: list[np.ndarray],
+    palette: np.ndarray,
+    delay_ms: int = 250,
+    level: int = 6,
+    filter_name: str = "none",
+    loops: int = 0,
+) -> bytes:
+    """Encode equally sized index arrays as an animated PNG sharing one palette.
+
+    Every frame replaces the whole canvas (``APNG_BLEND_OP_SOURCE``), so transparent
+    pixels of a later frame do not show the previous frame through. ``loops=0`` repeats
+    forever. Viewers without APNG support show the first frame.
+    """
+    if not frames:
+        raise ValueError("an animation needs at least one frame")
+    first, (ihdr, *palette_chunks) = _header(frames[0], palette)
+    height, width = first.shape
+    parts = [_SIGNATURE, ihdr, _chunk(b"acTL", struct.pack(">II", len(frames), loops)), *palette_chunks]
+    sequence = 0
+    for number, frame in enumerate(frames):
+        frame = np.ascontiguousarray(frame, dtype="uint8")
+        if frame.shape != (height, width):
+            raise ValueError(f"frame {number} has shape {frame.shape}, expected {(height, width)}")
+        control = struct.pack(">IIIIIHHBB", sequence, width, height, 0, 0, delay_ms, 1000, 0, 0)
+        parts.append(_chunk(b"fcTL", control))
+        sequence += 1
+        data = zlib.compress(_filter_rows(frame, filter_name).tobytes(), level)
+        if number == 0:
+            parts.append(_chunk(b"IDAT", data))
+        else:
+            parts.append(_chunk(b"fdAT", struct.pack(">I", sequence) + data))
+            sequence += 1
+    parts.append(_chunk(b"IEND", b""))
+    return b"".join(parts)
+
+
+__all__ = ["FILTERS", "encode_indexed_apng", "encode_indexed_png"]
@@ -0,0 +1,169 @@
+"""Background pre-rendering of new frames' tiles into the tile cache.
+
+Ingestion announces each newly committed frame (``POST /tiles/prewarm``). Every client
+switches to a new frame at the same moment, so without this the first viewers pay for
+all visible tiles at once. Queued frames are planned into tiles (the occupied tiles of
+the frame's occupancy document, or every tile of a fixed-bounds dataset) up to a maximum
+zoom and rendered on dedicated worker threads, outside the live render pool.
+
+Pre-rendering must never starve live requests. Workers are paced to ``rate`` tiles per
+second in total, and they pause while ``busy()`` reports that the live pool is loaded.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from services.tiler.occupancy import TileOccupancy
+
+logger = logging.getLogger("tiler.prewarm")
+
+Tile = tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class PrewarmJob:
+    dataset: str
+    timestamp: str
+
+
+def occupied_tiles(occupancy: TileOccupancy, min_zoom: int, max_zoom: int) -> Iterator[Tile]:
+    """Tiles with valid pixels per the occupancy bitmaps, coarsest zoom first."""
+    for zoom in sorted(z for z in occupancy.windows if min_zoom <= z <= max_zoom):
+        window = occupancy.windows[zoom]
+        for row, col in zip(*window.bits.nonzero(), strict=True):
+            yield zoom, window.x0 + int(col), window.y0 + int(row)
+
+
+def bounds_tiles(bounds: tuple[float, float, float, float], min_zoom: int, max_zoom: int) -> Iterator[Tile]:
+    """Every tile intersecting the lon/lat box ``bounds``, coarsest zoom first."""
+    west, south, east, north = bounds
+
+    def row(lat: float, n: int) -> int:
+        lat = max(min(lat, 85.0511), -85.0511)
+        y = (1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n
+        return min(max(int(y), 0), n - 1)
+
+    for zoom in range(min_zoom, max_zoom + 1):
+        n = 2**zoom
+        x0, x1 = int((west + 180.0) / 360.0 * n), min(int((east + 180.0) / 360.0 * n), n - 1)
+        for y in range(row(north, n), row(south, n) + 1):
+            for x in range(max(x0, 0), x1 + 1):
+                yield zoom, x, y
+
+
+class Prewarmer:
+    """Queue of frames to pre-render, drained by ``workers`` paced background threads.
+
+    ``plan(job)`` lists a frame's tiles and ``render(job, z, x, y)`` renders one into the
+    cache (both blocking). Submitting a frame that is already queued is a no-op, and a full
+    queue rejects new frames rather than growing without bound.
+    """
+
+    def __init__(
+        self,
+        plan: Callable[[PrewarmJob], Iterable[Tile]],
+        render: Callable[[PrewarmJob, int, int, int], None],
+        *,
+        workers: int = 1,
+        rate: float = 20.0,
+        busy: Callable[[], bool] = lambda: False,
+        max_queued: int = 64,
+        busy_backoff: float = 0.25,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._plan = plan
+        self._render = render
+        self._workers = workers
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._busy = busy
+        self._backoff = busy_backoff
+        self._clock = clock
+        self._sleep = sleep
+        self._queue: queue.Queue[PrewarmJob] = queue.Queue(maxsize=max_queued)
+        self._pending: set[PrewarmJob] = set()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._next_slot = 0.0
+        self.stats = {"frames": 0, "tiles": 0, "errors": 0, "rejected": 0, "paused": 0}
+
+    def submit(self, job: PrewarmJob) -> bool:
+        """Queue ``job``; False when the queue is full."""
+        with self._lock:
+            if job in self._pending:
+                return True
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self.stats["rejected"] += 1
+                return False
+            self._pending.add(job)
+            if not self._threads:
+                self._start()
+        return True
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _start(self) -> None:
+        for i in range(self._workers):
+            thread = threading.Thread(target=self._worker, name=f"tile-prewarm-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _wait_turn(self) -> None:
+        """Block until this worker may render a tile: live pool idle and rate slot reached."""
+        while self._busy():
+            self._count("paused")
+            self._sleep(self._backoff)
+        with self._lock:
+            now = self._clock()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            self._sleep(slot - now)
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                self.run_job(job)
+            finally:
+                with self._lock:
+                    self._pending.discard(job)
+                self._queue.task_done()
+
+    def run_job(self, job: PrewarmJob) -> None:
+        """Pre-render every planned tile of ``job`` (blocking, paced)."""
+        try:
+            tiles = list(self._plan(job))
+        except Exception as exc:  # noqa: BLE001
+            self._count("errors")
+            logger.warning("Cannot plan prewarm of %s %s: %s", job.dataset, job.timestamp, exc)
+            return
+        for z, x, y in tiles:
+            self._wait_turn()
+            try:
+                self._render(job, z, x, y)
+                self._count("tiles")
+            except Exception as exc:  # noqa: BLE001
+                self._count("errors")
+                logger.debug("Prewarm of %s %s %d/%d/%d failed: %s", job.dataset, job.timestamp, z, x, y, exc)
+        self._count("frames")
+        logger.info("Prewarmed %d tiles of %s %s", len(tiles), job.dataset, job.timestamp)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        return {**stats, "queued": self._queue.qsize(), "workers": len(self._threads)}
+
+
+__all__ = ["PrewarmJob", "Prewarmer", "bounds_tiles", "occupied_tiles"]
@@ -0,0 +1,59 @@
+"""Bounded worker pool for blocking tile rendering, with in-flight request coalescing.
+
+COG reads, array rescaling and PNG encoding block, so they run on a fixed-size thread
+pool instead of the event loop. Requests for a tile that is already being rendered
+await the same future rather than rendering it again, so N viewers of a new frame cost
+one render per unique tile. When workers and the wait queue are full, new work is
+rejected immediately so the endpoint can shed load instead of queueing without bound.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+logger = logging.getLogger("tiler.render_pool")
+
+
+class PoolSaturated(RuntimeError):
+    """Raised when the pool has no free worker or queue slot for a new render."""
+
+
+class RenderPool:
+    def __init__(self, max_workers: int = 8, max_queued: int = 32):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tile-render")
+        self._capacity = max_workers + max_queued
+        self._inflight: dict[Hashable, asyncio.Future[Any]] = {}
+        self.stats = {"renders": 0, "coalesced": 0, "rejected": 0}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    async def run(self, key: Hashable, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` on the pool, sharing the result with concurrent callers of ``key``."""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+        else:
+            if len(self._inflight) >= self._capacity:
+                self.stats["rejected"] += 1
+                raise PoolSaturated(f"{len(self._inflight)} renders in flight")
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, func, *args)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _f, k=key: self._inflight.pop(k, None))
+            self.stats["renders"] += 1
+        # A disconnecting client must not cancel the render other callers are waiting on.
+        return await asyncio.shield(future)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {**self.stats, "in_flight": len(self._inflight), "capacity": self._capacity}
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+__all__ = ["PoolSaturated", "RenderPool"]
@@ -6,26 +6,67 @@ Notes:
 - No AWS SDKs or Lambda adapters are used.
 - COGs are read via HTTP from the local MinIO endpoint (e.g., http://object-store:9000).
 """
+import asyncio
+import functools
+import hashlib
+import json
 import logging
 import os
+import time
 from datetime import timedelta
+from functools import lru_cache
 
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import Response
+import numpy as np
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response
 from minio import Minio
+from pydantic import BaseModel
+from services.common.colormaps import DATA_LEVELS, NODATA_INDEX, colormap_for, get_colormap
+from services.tiler.data_tiles import DATA_HEADERS, DATA_MEDIA_TYPE, DataTile, encode_data_tile
+from services.tiler.datasets import DatasetSpec, lookup, tile_outside
+from services.tiler.encoders import (
+    MEDIA_TYPES,
+    STACK_MEDIA_TYPES,
+    EncodingProfile,
+    encode_stack,
+    encode_tile,
+    load_profiles,
+    negotiate_format,
+    profile_for,
+    webp_available,
+)
+from services.tiler.etags import SourceETags, etag_matches, source_digest, tile_etag
+from services.tiler.frame_cache import FrameCache, read_frame
+from services.tiler.handles import DatasetHandleCache, PresignError
+from services.tiler.mosaic import (
+    MosaicIndex,
+    SiteFrames,
+    composite,
+    members_digest,
+    range_rank,
+    select_members,
+)
+from services.tiler.occupancy import OccupancyCache
+from services.tiler.prewarm import Prewarmer, PrewarmJob, Tile, bounds_tiles, occupied_tiles
+from services.tiler.render_pool import PoolSaturated, RenderPool
+from services.tiler.tile_cache import MinioTileStore, TileCache, TileKey
+from starlette.concurrency import run_in_threadpool
 
 try:
     from services.common.minio_utils import get_minio_client  # type: ignore
 except ImportError:  # pragma: no cover
     get_minio_client = None  # type: ignore
 try:  # Allow operation without heavy tiler deps (e.g., unit tests without rio-tiler installed)
+    from rio_tiler.errors import TileOutsideBounds  # type: ignore
     from rio_tiler.io import Reader  # type: ignore
-    from rio_tiler.utils import render  # type: ignore
     from titiler.application.main import app  # type: ignore
     _tiler_available = True
 except Exception:  # pragma: no cover - executed only when deps absent
     Reader = None  # type: ignore
-    render = None  # type: ignore
+
+    class TileOutsideBounds(Exception):  # type: ignore[no-redef]
+        pass
+
     app = FastAPI(title="Atmos Tiler (degraded)")
     _tiler_available = False
 
@@ -36,6 +77,180 @@ _legacy_bucket = os.getenv("DERIVED_BUCKET_NAME")
 if _legacy_bucket:
     logger.warning("DERIVED_BUCKET_NAME is deprecated; use S3_BUCKET_DERIVED instead.")
 
+# Rendered tile cache: in-process LRU + persisted tiles in the tiles bucket
+TILES_BUCKET = os.getenv("S3_BUCKET_TILES", "tiles")
+TILE_CACHE_MEMORY_MB = int(os.getenv("TILE_CACHE_MEMORY_MB", "256"))
+TILE_CACHE_STORE = os.getenv("TILE_CACHE_STORE", "true").lower() in ("1", "true", "yes")
+TILE_CACHE_STORE_MAX_MB = int(os.getenv("TILE_CACHE_STORE_MAX_MB", "10240"))
+TILE_CACHE_STORE_MAX_AGE_HOURS = float(os.getenv("TILE_CACHE_STORE_MAX_AGE_HOURS", "48"))
+TILE_CACHE_PURGE_TOKEN = os.getenv("TILE_CACHE_PURGE_TOKEN")
+
+
+def _minio_client() -> Minio:
+    if get_minio_client is not None:
+        return get_minio_client()
+    # fallback local inline construction
+    minio_endpoint = os.getenv("MINIO_ENDPOINT", "http://object-store:9000").rstrip("/")
+    secure = minio_endpoint.startswith("https://")
+    endpoint_host = minio_endpoint.replace("https://", "").replace("http://", "")
+    return Minio(
+        endpoint_host,
+        access_key=os.getenv("MINIO_ROOT_USER", "localminio"),
+        secret_key=os.getenv("MINIO_ROOT_PASSWORD", "change-me-now"),
+        secure=secure,
+    )
+
+
+tile_cache = TileCache(
+    max_memory_bytes=TILE_CACHE_MEMORY_MB << 20,
+    store=MinioTileStore(_minio_client(), TILES_BUCKET) if TILE_CACHE_STORE else None,
+    store_max_bytes=TILE_CACHE_STORE_MAX_MB << 20,
+    store_max_age=timedelta(hours=TILE_CACHE_STORE_MAX_AGE_HOURS),
+)
+
+# Open COG handles + presigned URLs, reused across tile requests
+HANDLE_CACHE_SIZE = int(os.getenv("TILER_HANDLE_CACHE_SIZE", "64"))
+PRESIGN_TTL_MINUTES = int(os.getenv("TILER_PRESIGN_TTL_MINUTES", "60"))
+# Fewer round trips per open: no sidecar probing, header + IFDs in one read, merged ranges.
+for _name, _value in (
+    ("GDAL_DISABLE_READDIR_ON_OPEN", "EMPTY_DIR"),
+    ("GDAL_INGESTED_BYTES_AT_OPEN", "32768"),
+    ("GDAL_HTTP_MERGE_CONSECUTIVE_RANGES", "YES"),
+    ("VSI_CACHE", "TRUE"),
+):
+    os.environ.setdefault(_name, _value)
+
+
+def _presign(bucket: str, key: str, expires: timedelta) -> str:
+    return _minio_client().presigned_get_object(bucket, key, expires=expires)
+
+
+dataset_handles = DatasetHandleCache(
+    _presign,
+    lambda url: Reader(url),  # type: ignore[misc]
+    max_entries=HANDLE_CACHE_SIZE,
+    presign_ttl=timedelta(minutes=PRESIGN_TTL_MINUTES),
+    benign_errors=(TileOutsideBounds,),
+)
+
+# Small single-band frames (NEXRAD) are read whole once and tiled from memory
+FRAME_CACHE_MB = int(os.getenv("TILER_FRAME_CACHE_MB", "256"))
+# 2048 x 2048 holds every default NEXRAD grid (zoom 7, 300 km; Alaska sites reach 2048 x 1536).
+FRAME_MAX_PIXELS = int(os.getenv("TILER_FRAME_MAX_PIXELS", "4194304"))
+
+
+def _load_frame(bucket: str, key: str):
+    return read_frame(dataset_handles.url(bucket, key), FRAME_MAX_PIXELS)
+
+
+frame_cache = FrameCache(_load_frame, max_bytes=FRAME_CACHE_MB << 20) if FRAME_CACHE_MB > 0 else None
+
+# Per-frame tile occupancy (NEXRAD) and dataset bounds answer empty tiles without COG reads.
+OCCUPANCY_CACHE_SIZE = int(os.getenv("TILER_OCCUPANCY_CACHE_SIZE", "512"))
+# "transparent" serves a cached fully transparent tile; "204" answers No Content.
+EMPTY_TILE_MODE = os.getenv("TILER_EMPTY_TILE", "transparent").lower()
+
+
+def _read_object(bucket: str, key: str) -> bytes:
+    response = _minio_client().get_object(bucket, key)
+    try:
+        return response.read()
+    finally:
+        response.close()
+        response.release_conn()
+
+
+occupancy_cache = (
+    OccupancyCache(_read_object, max_entries=OCCUPANCY_CACHE_SIZE) if OCCUPANCY_CACHE_SIZE > 0 else None
+)
+
+# HTTP caching: frame-addressed responses never change, so they are immutable. "latest"
+# aliases, index ranges and revisable datasets get a short TTL and revalidate by ETag.
+IMMUTABLE_MAX_AGE = int(os.getenv("TILER_IMMUTABLE_MAX_AGE", "31536000"))
+SHORT_MAX_AGE = int(os.getenv("TILER_SHORT_MAX_AGE", "60"))
+SOURCE_ETAG_TTL_SECONDS = float(os.getenv("TILER_SOURCE_ETAG_TTL_SECONDS", "60"))
+
+
+def _stat_etag(bucket: str, key: str) -> str:
+    return _minio_client().stat_object(bucket, key).etag
+
+
+source_etags = SourceETags(_stat_etag, ttl=SOURCE_ETAG_TTL_SECONDS)
+# Newest indexed timestamp per frames index, for "latest" aliases: (loaded at, timestamp)
+_latest_frames: dict[tuple[str, str], tuple[float, str]] = {}
+
+# Per-dataset-family PNG level/filter and WebP mode (TILE_ENCODING_<FAMILY> overrides)
+ENCODING_PROFILES = load_profiles()
+
+# Tile edge lengths in pixels; 512 is what MapLibre requests for @2x / tileSize 512 sources
+TILE_SIZES = (256, 512)
+
+# Multi-frame tile stacks for animation
+STACK_MAX_FRAMES = int(os.getenv("TILER_STACK_MAX_FRAMES", "24"))
+NEXRAD_INDEX_PREFIX = "indices/radar/nexrad"
+
+# nexrad-mosaic: per-pixel "max" or "nearest" radar; member frames within the skew limit
+MOSAIC_RULE = os.getenv("TILER_MOSAIC_RULE", "max").lower()
+MOSAIC_MAX_SKEW = timedelta(minutes=float(os.getenv("TILER_MOSAIC_MAX_SKEW_MINUTES", "10")))
+MOSAIC_INDEX_TTL_SECONDS = float(os.getenv("TILER_MOSAIC_INDEX_TTL_SECONDS", "60"))
+
+
+def _load_mosaic_sites(bucket: str) -> list[SiteFrames]:
+    """Footprint and frame timestamps of every site with a frames index (blocking)."""
+    sites = []
+    for entry in _minio_client().list_objects(bucket, prefix=f"{NEXRAD_INDEX_PREFIX}/", recursive=False):
+        if not entry.is_dir:
+            continue
+        site = entry.object_name.rstrip("/").rsplit("/", 1)[-1]
+        try:
+            frames = json.loads(_read_object(bucket, f"{NEXRAD_INDEX_PREFIX}/{site}/frames.json"))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("Skipping %s in the mosaic: %s", site, exc)
+            continue
+        # Frames indexed before footprints were published carry no bbox.
+        boxes = [f["bbox"] for f in frames if f.get("bbox")]
+        if boxes:
+            timestamps = tuple(sorted(f["timestamp_key"] for f in frames if "timestamp_key" in f))
+            sites.append(SiteFrames(site, tuple(boxes[-1]), timestamps))
+    return sites
+
+
+mosaic_index = MosaicIndex(_load_mosaic_sites, ttl=MOSAIC_INDEX_TTL_SECONDS)
+
+# Point / time-series drill requests
+POINT_MAX_POINTS = int(os.getenv("TILER_POINT_MAX_POINTS", "16"))
+POINT_MAX_FRAMES = int(os.getenv("TILER_POINT_MAX_FRAMES", "48"))
+
+# Blocking COG reads and PNG encoding run on a bounded pool, never on the event loop
+RENDER_WORKERS = int(os.getenv("TILER_RENDER_WORKERS", "8"))
+RENDER_QUEUE = int(os.getenv("TILER_RENDER_QUEUE", "32"))
+render_pool = RenderPool(max_workers=RENDER_WORKERS, max_queued=RENDER_QUEUE)
+
+# Background pre-rendering of newly ingested frames (POST /tiles/prewarm), on its own
+# threads, paced, and paused while live renders are in flight.
+PREWARM_TOKEN = os.getenv("TILER_PREWARM_TOKEN")
+PREWARM_WORKERS = int(os.getenv("TILER_PREWARM_WORKERS", "1"))
+PREWARM_RATE = float(os.getenv("TILER_PREWARM_RATE", "20"))
+PREWARM_QUEUE = int(os.getenv("TILER_PREWARM_QUEUE", "64"))
+PREWARM_MIN_ZOOM = int(os.getenv("TILER_PREWARM_MIN_ZOOM", "3"))
+PREWARM_MAX_ZOOM = int(os.getenv("TILER_PREWARM_MAX_ZOOM", "7"))
+PREWARM_FORMATS = tuple(f.strip() for f in os.getenv("TILER_PREWARM_FORMATS", "png").split(",") if f.strip())
+# The frontend loads NEXRAD as 512-px (@2x) tiles only.
+PREWARM_TILE_SIZES = tuple(int(s) for s in os.getenv("TILER_PREWARM_TILE_SIZES", "512").split(",") if s.strip())
+PREWARM_BUSY_IN_FLIGHT = int(os.getenv("TILER_PREWARM_BUSY_IN_FLIGHT", str(max(RENDER_WORKERS // 2, 1))))
+
+_EXPOSED_HEADERS = (
+    "X-Tile-Cache",
+    "X-Stack-Timestamps",
+    "X-Stack-Missing",
+    "X-Mosaic-Sites",
+    "X-Mosaic-Missing",
+    "X-Tile-Timestamp",
+    "ETag",
+    *DATA_HEADERS,
+)
+
+
 # Configure CORS for AtmosInsight domain
 @app.middleware("http")
 async def cors_middleware(request: Request, call_next):
@@ -57,6 +272,8 @@ async def cors_middleware(request: Request, call_next):
     response.headers["Access-Control-Allow-Methods"] = "GET, HEAD, OPTIONS"
     response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
     response.headers["Access-Control-Max-Age"] = "86400"
+    # Let browser clients read the tile metadata headers (data tile layout, cache status).
+    response.headers["Access-Control-Expose-Headers"] = ", ".join(_EXPOSED_HEADERS)
 
     return response
 
@@ -80,105 +297,1018 @@ def _convert_temperature(data, style: str):  # numpy imported lazily later; keep
         return (data - 273.15) * 9 / 5 + 32
     return data
 
+
+def _rescale_to_index(data, lo: float, hi: float) -> np.ndarray:
+    """Palette index for each value: ``lo..hi`` maps linearly onto 1..255 (0 is no-data)."""
+    frac = np.nan_to_num(np.clip((np.asarray(data, dtype="float64") - lo) / (hi - lo), 0, 1))
+    return (np.rint(frac * (DATA_LEVELS - 1)) + 1).astype("uint8")
+
+
+@lru_cache(maxsize=64)
+def _code_lut(dtype: str, scale: float, offset: float, lo: float, hi: float, style: str) -> np.ndarray:
+    """Palette index for every code of an integer-encoded raster (``value = code * scale + offset``)."""
+    info = np.iinfo(dtype)
+    codes = np.arange(info.min, info.max + 1, dtype="float64")
+    return _rescale_to_index(_convert_temperature(codes * scale + offset, style), lo, hi)
+
+
+def _tile_to_index(
+    data,
+    mask,
+    lo: float,
+    hi: float,
+    *,
+    scale: float = 1.0,
+    offset: float = 0.0,
+    style: str = "default",
+) -> np.ndarray:
+    """Map a ``(bands, h, w)`` tile and its mask to an ``(h, w)`` array of palette indices.
+
+    Quantized (unsigned integer) COGs go through a cached lookup table built from the
+    band's scale/offset, so no per-pixel float math is needed; float COGs are rescaled.
+    Masked pixels get the transparent no-data index.
+    """
+    band = np.asarray(data)
+    if band.ndim == 3:
+        band = band[0]
+    if band.dtype.kind == "u" and band.dtype.itemsize <= 2:
+        indices = _code_lut(band.dtype.name, float(scale), float(offset), lo, hi, style)[band]
+    else:
+        indices = _rescale_to_index(_convert_temperature(band, style), lo, hi)
+    if mask is not None:
+        indices[np.asarray(mask) == 0] = NODATA_INDEX
+    return indices
+
+
+@lru_cache(maxsize=64)
+def _palette(colormap: str, lo: float, hi: float) -> np.ndarray:
+    return get_colormap(colormap).palette(lo, hi)
+
+
+def _derived_bucket() -> str:
+    derived_bucket = os.getenv("S3_BUCKET_DERIVED")
+    if not derived_bucket:
+        raise HTTPException(status_code=500, detail="Derived bucket not configured")
+    return derived_bucket
+
+
+def _resolve_dataset(
+    dataset: str, timestamp: str, style: str, rescale: str | None, *, allow_mosaic: bool = False
+) -> tuple[str, str]:
+    """Return ``(s3_key, rescale)`` of ``dataset`` at ``timestamp`` inside the derived bucket."""
+    found = lookup(dataset)
+    if found is None:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset: {dataset}")
+    spec, site = found
+    if spec.mosaic_of is not None and not allow_mosaic:
+        raise HTTPException(status_code=400, detail=f"{dataset} is only served as image tiles")
+    if rescale:
+        return spec.key(timestamp, site), rescale
+    lo, hi = _temp_rescale_for_style(spec.rescale, style) if spec.temperature else spec.rescale
+    return spec.key(timestamp, site), f"{lo},{hi}"
+
+
+def _is_empty_tile(key: TileKey, bucket: str, *, load: bool) -> bool:
+    """True when the dataset bounds or the frame's occupancy prove the tile has no data.
+
+    With ``load=False`` only already-cached occupancy is consulted, so it is safe to call
+    on the event loop; ``load=True`` may fetch the occupancy document (blocking).
+    """
+    found = lookup(key.dataset)
+    if found is None:
+        return False
+    spec, site = found
+    if spec.bounds is not None and tile_outside(spec.bounds, key.z, key.x, key.y):
+        return True
+    occupancy_key = spec.occupancy_key(key.timestamp, site)
+    if occupancy_key is None or occupancy_cache is None:
+        return False
+    # Revisable frames are keyed by their object version, and so is their occupancy.
+    if load:
+        occupancy = occupancy_cache.get(bucket, occupancy_key, key.sources)
+    else:
+        _, occupancy = occupancy_cache.peek(bucket, occupancy_key, key.sources)
+    return occupancy is not None and occupancy.is_empty(key.z, key.x, key.y) is True
+
+
+@lru_cache(maxsize=4)
+def _empty_indices(size: int) -> np.ndarray:
+    indices = np.zeros((size, size), dtype="uint8")
+    indices.flags.writeable = False
+    return indices
+
+
+@lru_cache(maxsize=8)
+def _empty_tile(fmt: str, size: int = 256) -> bytes:
+    """A fully transparent ``size`` x ``size`` tile, encoded once per format."""
+    return encode_tile(_empty_indices(size), np.zeros((1, 4), dtype="uint8"), fmt, EncodingProfile(png_level=9))
+
+
+def _check_tile_size(tilesize: int) -> int:
+    if tilesize not in TILE_SIZES:
+        raise HTTPException(status_code=400, detail=f"tilesize must be one of {', '.join(map(str, TILE_SIZES))}")
+    return tilesize
+
+
+def _pool_busy() -> HTTPException:
+    return HTTPException(status_code=503, detail="Tile renderer busy", headers={"Retry-After": "1"})
+
+
+def _cache_control(immutable: bool) -> str:
+    if immutable:
+        return f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    return f"public, max-age={SHORT_MAX_AGE}"
+
+
+async def _source_etag(bucket: str, key: str) -> str | None:
+    """ETag of a source object; ``None`` when it cannot be stat'ed (e.g. not ingested yet)."""
+    found, etag = source_etags.peek(bucket, key)
+    if found:
+        return etag
+    try:
+        return await render_pool.run(("etag", bucket, key), source_etags.get, bucket, key)
+    except PoolSaturated:
+        raise _pool_busy() from None
+
+
+async def _latest_timestamp(derived_bucket: str, spec: DatasetSpec, site: str | None) -> str:
+    """Newest indexed timestamp of a dataset, re-read at most every ``SHORT_MAX_AGE`` seconds."""
+    index_key = spec.index_key(site)
+    if index_key is None:
+        raise HTTPException(status_code=400, detail="latest is only available for indexed datasets")
+    ident = (derived_bucket, index_key)
+    cached = _latest_frames.get(ident)
+    if cached is not None and time.monotonic() - cached[0] < SHORT_MAX_AGE:
+        return cached[1]
+    try:
+        available = await render_pool.run(
+            ("frames-index", derived_bucket, index_key), _indexed_frame_timestamps, derived_bucket, index_key
+        )
+    except PoolSaturated:
+        raise _pool_busy() from None
+    if not available:
+        raise HTTPException(status_code=404, detail="No frames indexed yet")
+    _latest_frames[ident] = (time.monotonic(), available[-1])
+    return available[-1]
+
+
+def _not_modified(etag: str, cache_control: str, vary_accept: bool, headers: dict[str, str]) -> Response:
+    headers = {**headers, "ETag": etag, "Cache-Control": cache_control, "X-Tile-Cache": "not-modified"}
+    if vary_accept:
+        headers["Vary"] = "Accept"
+    return Response(status_code=304, headers=headers)
+
+
+# High-DPI tiles: /{y}@2x is a 512-px tile. Registered before weather_tiles, whose
+# bare {y} segment would otherwise swallow "@2x".
+@app.get("/tiles/weather/{dataset}/{timestamp}/{z}/{x}/{y}@2x")
+@app.get("/tiles/weather/{dataset}/{timestamp}/{z}/{x}/{y}@2x.{fmt}")
+async def weather_tiles_2x(
+    dataset: str,
+    timestamp: str,
+    z: int,
+    x: int,
+    y: int,
+    fmt: str | None = None,
+    style: str = "default",
+    rescale: str | None = None,
+    accept: str | None = Header(default=None),
+    if_none_match: str | None = Header(default=None),
+):
+    """512-pixel variant of :func:`weather_tiles` for high-DPI maps."""
+    return await weather_tiles(dataset, timestamp, z, x, y, fmt, style, rescale, 512, accept, if_none_match)
+
+
 # Custom route for AtmosInsight COGs from derived bucket (MinIO)
-@app.get("/tiles/weather/{dataset}/{timestamp}/{z}/{x}/{y}.png")
+# Decorators register bottom-up, so the suffixed route is tried before the bare one.
+@app.get("/tiles/weather/{dataset}/{timestamp}/{z}/{x}/{y}")
+@app.get("/tiles/weather/{dataset}/{timestamp}/{z}/{x}/{y}.{fmt}")
 async def weather_tiles(
     dataset: str,
     timestamp: str,
     z: int,
     x: int,
     y: int,
+    fmt: str | None = None,
     style: str = "default",
-    rescale: str | None = None
+    rescale: str | None = None,
+    tilesize: int = 256,
+    accept: str | None = Header(default=None),
+    if_none_match: str | None = Header(default=None),
 ):
     """
     Serve weather data tiles from AtmosInsight derived bucket.
 
+    Tiles carry a strong ETag derived from the source COG's ETag and the render
+    parameters; a matching ``If-None-Match`` is answered ``304`` without rendering.
+
     Args:
-        dataset: goes-c13, mrms-reflq, nexrad-{site}
-        timestamp: ISO8601 timestamp
+        dataset: goes-c13, mrms-reflq, nexrad-{site}, nexrad-mosaic
+        timestamp: Frame timestamp, or ``latest`` for indexed datasets and nexrad-mosaic
         z, x, y: Tile coordinates
+        fmt: ``png`` or ``webp``; without a suffix the format follows the Accept header
         style: Rendering style (kelvin, celsius, fahrenheit for GOES)
         rescale: Custom rescale range (e.g., "180,330")
+        tilesize: 256 or 512 pixels (``@2x`` URLs are 512)
     """
-    # Bucket and MinIO endpoint configuration
-    derived_bucket = os.getenv("S3_BUCKET_DERIVED")
-    if not derived_bucket:
-        raise HTTPException(status_code=500, detail="Derived bucket not configured")
-
-    minio_endpoint = os.getenv("MINIO_ENDPOINT", "http://object-store:9000").rstrip("/")
+    derived_bucket = _derived_bucket()
+    s3_key, default_rescale = _resolve_dataset(dataset, timestamp, style, rescale, allow_mosaic=True)
 
-    # Map dataset to S3 path
-    if dataset == "goes-c13":
-        s3_key = f"derived/goes/east/abi/c13/conus/{timestamp}/bt_c13.tif"
-        base_range = (180.0, 330.0)
-        style_range = _temp_rescale_for_style(base_range, style)
-        default_rescale = f"{style_range[0]},{style_range[1]}" if not rescale else rescale
+    if fmt is not None and fmt not in MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail=f"Unsupported tile format: {fmt}")
+    if fmt == "webp" and not webp_available():
+        raise HTTPException(status_code=406, detail="WebP encoding unavailable")
+    tile_format = negotiate_format(fmt, accept)
+    # Suffix-less URLs vary by Accept, so shared caches must key on it.
+    vary_accept = fmt is None
 
-    elif dataset == "mrms-reflq":
-        s3_key = f"derived/mrms/reflq/{timestamp}/mosaic.tif"
-        default_rescale = "-30,80" if not rescale else rescale
-
-    elif dataset.startswith("nexrad-"):
-        site = dataset.replace("nexrad-", "").upper()
-        # Canonical NEXRAD layout (inside derived bucket): nexrad/<SITE>/<TIMESTAMP>/tilt0_reflectivity.tif
-        s3_key = f"nexrad/{site}/{timestamp}/tilt0_reflectivity.tif"
-        default_rescale = "-30,80" if not rescale else rescale
+    _check_tile_size(tilesize)
 
+    spec, site = lookup(dataset)  # type: ignore[misc]
+    latest = timestamp == "latest"
+    cache_control = _cache_control(not latest and not spec.revisable)
+    headers: dict[str, str] = {}
+    members = None
+    if spec.mosaic_of is not None:
+        members = await _mosaic_members(derived_bucket, timestamp, z, x, y)
+        if not members:
+            return _tile_response(
+                _empty_tile(tile_format, tilesize), tile_format, "empty", vary_accept, cache_control=cache_control
+            )
+        source: str | None = members_digest(members)
+        sources = source
     else:
-        raise HTTPException(status_code=404, detail=f"Unknown dataset: {dataset}")
+        if latest:
+            timestamp = await _latest_timestamp(derived_bucket, spec, site)
+            s3_key, default_rescale = _resolve_dataset(dataset, timestamp, style, rescale)
+            headers["X-Tile-Timestamp"] = timestamp
+        if spec.revisable:
+            source = await _source_etag(derived_bucket, s3_key)
+            sources = source_digest(source)
+        else:
+            # Other frames never change once written: their tiles need no version in the
+            # cache key, and memory hits reuse the last-known ETag instead of waiting on a
+            # HEAD through the render pool.
+            source = source_etags.last_known(derived_bucket, s3_key)
+            sources = None
+
+    # A rendered tile never changes once its frame exists: serve repeats from the cache.
+    # Mosaic tiles are keyed by their member frames as well, which change as sites report,
+    # and revisable frames by their object version.
+    cache_key = TileKey(dataset, timestamp, z, x, y, style, rescale, tile_format, tilesize, sources=sources)
+    profile = profile_for(ENCODING_PROFILES, dataset)
+    etag = tile_etag(source, cache_key.object_name, profile) if source else None
+    if etag is not None and etag_matches(if_none_match, etag):
+        return _not_modified(etag, cache_control, vary_accept, headers)
+    respond = functools.partial(_tile_response, vary_accept=vary_accept, cache_control=cache_control, etag=etag)
+    cached = tile_cache.get_memory(cache_key)
+    if cached is not None:
+        return respond(cached, tile_format, "memory", headers=headers)
+    if source is None and members is None and not spec.revisable:
+        source = await _source_etag(derived_bucket, s3_key)
+        etag = tile_etag(source, cache_key.object_name, profile) if source else None
+        if etag is not None and etag_matches(if_none_match, etag):
+            return _not_modified(etag, cache_control, vary_accept, headers)
+        respond = functools.partial(respond, etag=etag)
+    if members:
+        return await _mosaic_tile(cache_key, derived_bucket, members, default_rescale, vary_accept, cache_control, etag)
+    # Tiles outside the dataset bounds, or known empty from the frame's occupancy bitmap.
+    if _is_empty_tile(cache_key, derived_bucket, load=False):
+        return respond(_empty_tile(tile_format, tilesize), tile_format, "empty", headers=headers)
 
-    # Build a pre-signed URL via MinIO SDK so we can securely access private objects via HTTP
-    if get_minio_client is None:  # fallback local inline construction
-        secure = minio_endpoint.startswith("https://")
-        endpoint_host = minio_endpoint.replace("https://", "").replace("http://", "")
-        client = Minio(
-            endpoint_host,
-            access_key=os.getenv("MINIO_ROOT_USER", "localminio"),
-            secret_key=os.getenv("MINIO_ROOT_PASSWORD", "change-me-now"),
-            secure=secure,
+    # Everything below blocks (bucket reads, COG range reads, encoding), so it runs on the
+    # render pool; concurrent requests for the same tile share a single render.
+    try:
+        img_bytes, cache_status = await render_pool.run(
+            cache_key, _produce_tile, cache_key, derived_bucket, s3_key, default_rescale
         )
-    else:
-        client = get_minio_client()
-    # MinIO expects object name without leading slash
-    object_name = s3_key
+    except PoolSaturated:
+        raise _pool_busy() from None
+    return respond(img_bytes, tile_format, cache_status, headers=headers)
+
+
+def _produce_tile(
+    cache_key: TileKey, derived_bucket: str, s3_key: str, default_rescale: str
+) -> tuple[bytes, str]:
+    """Return ``(image, cache_status)`` from the tile store or a fresh render (blocking)."""
+    if _is_empty_tile(cache_key, derived_bucket, load=True):
+        # Empty tiles are cheap to answer again, so they are not cached.
+        return _empty_tile(cache_key.fmt, cache_key.tile_size), "empty"
+    media_type = MEDIA_TYPES[cache_key.fmt]
+    stored = tile_cache.get_store(cache_key, media_type)
+    if stored is not None:
+        return stored, "store"
+
+    indices, palette = _render_indices(cache_key, derived_bucket, s3_key, default_rescale)
+    profile = profile_for(ENCODING_PROFILES, cache_key.dataset)
     try:
-        # Default expiry 1 hour
-        http_url = client.presigned_get_object(derived_bucket, object_name, expires=timedelta(hours=1))
+        img_bytes = encode_tile(indices, palette, cache_key.fmt, profile)
     except Exception as e:  # noqa: BLE001
+        raise HTTPException(status_code=500, detail=f"Tile generation failed: {str(e)}") from None
+
+    tile_cache.put(cache_key, img_bytes, media_type)
+    return img_bytes, "miss"
+
+
+def _tile_style(cache_key: TileKey, default_rescale: str) -> tuple[str, float, float, np.ndarray]:
+    """``(style, lo, hi, RGBA palette)`` a tile is coloured with."""
+    # Styles (temperature units) only apply to temperature datasets.
+    found = lookup(cache_key.dataset)
+    style = cache_key.style if found is not None and found[0].temperature else "default"
+    try:
+        lo, hi = map(float, default_rescale.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid rescale: {default_rescale}") from None
+    return style, lo, hi, _palette(colormap_for(cache_key.dataset, style).name, lo, hi)
+
+
+def _render_indices(
+    cache_key: TileKey, derived_bucket: str, s3_key: str, default_rescale: str
+) -> tuple[np.ndarray, np.ndarray]:
+    """Read and colour one tile: ``(palette indices, RGBA palette)`` (blocking).
+
+    Callers have already ruled out known-empty tiles.
+    """
+    style, lo, hi, palette = _tile_style(cache_key, default_rescale)
+    try:
+        data, mask, scale, offset, _ = _read_tile(cache_key, derived_bucket, s3_key)
+        # Style conversions (GOES temperature units) happen before the numeric rescale;
+        # the colormap is applied as a 256-entry palette (8-bit indexed PNG, or RGBA WebP).
+        indices = _tile_to_index(data, mask, lo, hi, scale=scale, offset=offset, style=style)
+    except HTTPException:
+        raise
+    except Exception as e:  # noqa: BLE001
+        raise HTTPException(status_code=500, detail=f"Tile generation failed: {str(e)}") from None
+    return indices, palette
+
+
+def _stack_frame_indices(
+    cache_key: TileKey, derived_bucket: str, s3_key: str, default_rescale: str
+) -> tuple[np.ndarray, np.ndarray]:
+    """``(palette indices, RGBA palette)`` of one stack frame, transparent when empty (blocking)."""
+    if _is_empty_tile(cache_key, derived_bucket, load=True):
+        return _empty_indices(cache_key.tile_size), _tile_style(cache_key, default_rescale)[3]
+    return _render_indices(cache_key, derived_bucket, s3_key, default_rescale)
+
+
+def _read_tile(cache_key: TileKey, derived_bucket: str, s3_key: str):
+    """Raw ``(data, mask, scale, offset, nodata)`` of one tile (blocking)."""
+    # Pre-signed URL via MinIO SDK so we can securely access private objects via HTTP;
+    # URLs and open handles are cached per object and refreshed before the URL expires;
+    # revisable frames pass their object version so a rewrite is never read through them.
+    try:
+        dataset_handles.url(derived_bucket, s3_key, cache_key.sources)
+    except PresignError as e:
         # Suppress internal MinIO stack details in outward facing error
         raise HTTPException(status_code=500, detail=f"Failed to sign COG URL: {str(e)}") from None
 
+    x, y, z = cache_key.x, cache_key.y, cache_key.z
+    frame = None
+    if frame_cache is not None and cache_key.dataset.startswith("nexrad-"):
+        frame = frame_cache.get(derived_bucket, s3_key)
+    if frame is not None:
+        # Whole frame is in memory: the tile is an array gather, no GDAL read.
+        tile = frame.tile(z, x, y, tile_size=cache_key.tile_size)
+        if tile is None:
+            raise TileOutsideBounds(f"Tile {z}/{x}/{y} is outside {s3_key}")
+        data, mask = tile
+        return data, mask, frame.scale, frame.offset, frame.nodata
     if not _tiler_available:
         raise HTTPException(status_code=500, detail="Tiler dependencies unavailable")
+    # Read remote COG via HTTP; rio-tiler returns (data, mask) arrays
+    with dataset_handles.checkout(derived_bucket, s3_key, cache_key.sources) as src:
+        data, mask = src.tile(x, y, z, tilesize=cache_key.tile_size)
+        # Quantized COGs carry scale/offset in band metadata; tile codes are read as-is.
+        scale = (src.dataset.scales or (1.0,))[0]
+        offset = (src.dataset.offsets or (0.0,))[0]
+        return data, mask, scale, offset, src.dataset.nodata
 
+
+def _produce_data_tile(cache_key: TileKey, derived_bucket: str, s3_key: str) -> tuple[DataTile | None, str]:
+    """Return ``(data tile, cache_status)``; ``None`` for a known-empty tile (blocking)."""
+    if _is_empty_tile(cache_key, derived_bucket, load=True):
+        return None, "empty"
+    stored = tile_cache.get_store(cache_key, DATA_MEDIA_TYPE)
+    if stored is not None:
+        return DataTile.unpack(stored), "store"
     try:
-        # Read remote COG via HTTP and render a PNG tile
-        # rio-tiler returns (data, mask) arrays
-        with Reader(http_url) as src:  # type: ignore[misc]
-            rescale_vals = [tuple(map(float, default_rescale.split(",")))]
-            data, mask = src.tile(x, y, z)
-            # Apply style conversions before numeric rescale
-            if dataset == "goes-c13":
-                data = _convert_temperature(data, style)
-            # Apply rescaling to convert float32 to uint8 for PNG
-            import numpy as np
-            data_scaled = np.clip((data - rescale_vals[0][0]) / (rescale_vals[0][1] - rescale_vals[0][0]) * 255, 0, 255).astype("uint8")
-            if render is None:  # safety guard (shouldn't happen if _tiler_available True)
-                raise HTTPException(status_code=500, detail="Render backend unavailable")
-            img_bytes = render(data_scaled, mask=mask, img_format="PNG")  # type: ignore[operator]
-
-            return Response(
-                content=img_bytes,
-                media_type="image/png",
-                headers={
-                    "Cache-Control": "public, max-age=3600",
-                    "Content-Type": "image/png",
-                },
+        data, mask, scale, offset, nodata = _read_tile(cache_key, derived_bucket, s3_key)
+        tile = encode_data_tile(data, mask, scale=scale, offset=offset, nodata=nodata)
+    except HTTPException:
+        raise
+    except Exception as e:  # noqa: BLE001
+        raise HTTPException(status_code=500, detail=f"Data tile generation failed: {str(e)}") from None
+    tile_cache.put(cache_key, tile.pack(), DATA_MEDIA_TYPE)
+    return tile, "miss"
+
+
+def _tile_response(
+    content: bytes,
+    fmt: str,
+    cache_status: str,
+    vary_accept: bool = False,
+    *,
+    cache_control: str,
+    etag: str | None = None,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    media_type = MEDIA_TYPES[fmt]
+    headers = {**(headers or {}), "Cache-Control": cache_control, "X-Tile-Cache": cache_status}
+    if vary_accept:
+        headers["Vary"] = "Accept"
+    if cache_status == "empty" and EMPTY_TILE_MODE == "204":
+        return Response(status_code=204, headers=headers)
+    headers["Content-Type"] = media_type
+    if etag is not None:
+        headers["ETag"] = etag
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
+async def _mosaic_members(
+    derived_bucket: str, timestamp: str, z: int, x: int, y: int
+) -> list[tuple[SiteFrames, str]]:
+    """Sites covering tile ``z/x/y`` and their frames nearest to ``timestamp``."""
+    sites = mosaic_index.peek(derived_bucket)
+    if sites is None:
+        try:
+            sites = await render_pool.run(("mosaic-index", derived_bucket), mosaic_index.sites, derived_bucket)
+        except PoolSaturated:
+            raise _pool_busy() from None
+        except Exception as exc:  # noqa: BLE001
+            raise HTTPException(status_code=500, detail="Mosaic site index unavailable") from exc
+    try:
+        return select_members(sites, timestamp, z, x, y, MOSAIC_MAX_SKEW)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid timestamp: {timestamp}") from None
+
+
+async def _mosaic_tile(
+    cache_key: TileKey,
+    derived_bucket: str,
+    members: list[tuple[SiteFrames, str]],
+    default_rescale: str,
+    vary_accept: bool,
+    cache_control: str,
+    etag: str | None,
+) -> Response:
+    """Composite one tile from its member sites' frames, read concurrently."""
+    media_type = MEDIA_TYPES[cache_key.fmt]
+    member_keys = [
+        TileKey(f"nexrad-{site.site}", ts, cache_key.z, cache_key.x, cache_key.y, tile_size=cache_key.tile_size)
+        for site, ts in members
+    ]
+    try:
+        stored = await render_pool.run(("store", cache_key), tile_cache.get_store, cache_key, media_type)
+        if stored is not None:
+            return _tile_response(stored, cache_key.fmt, "store", vary_accept, cache_control=cache_control, etag=etag)
+        results = await asyncio.gather(
+            *(render_pool.run(("values", key), _read_values, key, derived_bucket) for key in member_keys),
+            return_exceptions=True,
+        )
+        if any(isinstance(r, PoolSaturated) for r in results):
+            raise PoolSaturated()
+        layers = [
+            (site, r)
+            for (site, _), r in zip(members, results, strict=True)
+            if r is not None and not isinstance(r, BaseException)
+        ]
+        failed = [
+            f"{site.site}:{ts}" for (site, ts), r in zip(members, results, strict=True) if isinstance(r, BaseException)
+        ]
+        if not layers:
+            if failed:
+                raise HTTPException(status_code=500, detail="No mosaic member could be read")
+            return _tile_response(
+                _empty_tile(cache_key.fmt, cache_key.tile_size),
+                cache_key.fmt,
+                "empty",
+                vary_accept,
+                cache_control=cache_control,
+                etag=etag,
             )
+        img_bytes = await render_pool.run(
+            cache_key, _composite_tile, cache_key, layers, default_rescale, not failed
+        )
+    except PoolSaturated:
+        raise _pool_busy() from None
+    # Partial composites are neither cached nor tagged.
+    response = _tile_response(
+        img_bytes,
+        cache_key.fmt,
+        "miss",
+        vary_accept,
+        cache_control="public, max-age=30" if failed else cache_control,
+        etag=None if failed else etag,
+    )
+    response.headers["X-Mosaic-Sites"] = ",".join(f"{site.site}:{ts}" for site, ts in members)
+    if failed:
+        # Partial composites are not cached; the client should retry soon.
+        response.headers["X-Mosaic-Missing"] = ",".join(failed)
+    return response
+
+
+def _read_values(key: TileKey, derived_bucket: str) -> tuple[np.ndarray, np.ndarray] | None:
+    """``(values, valid)`` of one single-site tile in data units; ``None`` if empty (blocking)."""
+    if _is_empty_tile(key, derived_bucket, load=True):
+        return None
+    s3_key, _ = _resolve_dataset(key.dataset, key.timestamp, "default", None)
+    try:
+        data, mask, scale, offset, _ = _read_tile(key, derived_bucket, s3_key)
+    except TileOutsideBounds:
+        return None
+    band = np.asarray(data)
+    if band.ndim == 3:
+        band = band[0]
+    valid = np.asarray(mask) != 0
+    if not valid.any():
+        return None
+    return band.astype("float32") * np.float32(scale) + np.float32(offset), valid
 
+
+def _composite_tile(
+    cache_key: TileKey,
+    layers: list[tuple[SiteFrames, tuple[np.ndarray, np.ndarray]]],
+    default_rescale: str,
+    persist: bool,
+) -> bytes:
+    """Merge member tiles, colour and encode the result (blocking)."""
+    z, x, y, size = cache_key.z, cache_key.x, cache_key.y, cache_key.tile_size
+    try:
+        lo, hi = map(float, default_rescale.split(","))
+        ranks = [range_rank(site.center, z, x, y, size) for site, _ in layers] if MOSAIC_RULE == "nearest" else None
+        values, mask = composite([layer for _, layer in layers], MOSAIC_RULE, ranks)
+        indices = _tile_to_index(values, mask, lo, hi)
+        palette = _palette(colormap_for(cache_key.dataset).name, lo, hi)
+        img_bytes = encode_tile(indices, palette, cache_key.fmt, profile_for(ENCODING_PROFILES, cache_key.dataset))
     except Exception as e:  # noqa: BLE001
-        raise HTTPException(status_code=500, detail=f"Tile generation failed: {str(e)}") from None
+        raise HTTPException(status_code=500, detail=f"Mosaic generation failed: {str(e)}") from None
+    if persist:
+        tile_cache.put(cache_key, img_bytes, MEDIA_TYPES[cache_key.fmt])
+    return img_bytes
+
+
+def _indexed_frame_timestamps(derived_bucket: str, index_key: str) -> list[str]:
+    """Timestamp keys listed in an ingestion frames index, oldest first (blocking)."""
+    try:
+        frames = json.loads(_read_object(derived_bucket, index_key))
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(status_code=404, detail=f"No frames index at {index_key}") from exc
+    return sorted(f["timestamp_key"] for f in frames if "timestamp_key" in f)
+
+
+async def _select_frame_times(
+    dataset: str,
+    derived_bucket: str,
+    timestamps: str | None,
+    start: str | None,
+    end: str | None,
+    limit: int,
+    max_frames: int,
+) -> list[str]:
+    """Explicit ``timestamps``, or for indexed datasets the newest ``limit`` frames in range."""
+    _resolve_dataset(dataset, "", "default", None)
+    spec, site = lookup(dataset)  # type: ignore[misc]
+    index_key = spec.index_key(site)
+    if timestamps:
+        frame_times = [t for t in timestamps.split(",") if t]
+    elif index_key is not None:
+        try:
+            available = await render_pool.run(
+                ("frames-index", derived_bucket, index_key), _indexed_frame_timestamps, derived_bucket, index_key
+            )
+        except PoolSaturated:
+            raise _pool_busy() from None
+        frame_times = [
+            t for t in available if (start is None or t >= start) and (end is None or t <= end)
+        ][-limit:]
+    else:
+        raise HTTPException(status_code=400, detail=f"timestamps is required for {dataset}")
+    if not frame_times:
+        raise HTTPException(status_code=404, detail="No frames in the requested range")
+    if len(frame_times) > max_frames:
+        raise HTTPException(status_code=400, detail=f"At most {max_frames} frames per request")
+    return frame_times
+
+
+@app.get("/tiles/stack/{dataset}/{z}/{x}/{y}.{fmt}")
+async def weather_tile_stack(
+    dataset: str,
+    z: int,
+    x: int,
+    y: int,
+    fmt: str,
+    timestamps: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    limit: int = Query(default=10, ge=1),
+    delay_ms: int = Query(default=250, ge=20, le=10000),
+    style: str = "default",
+    rescale: str | None = None,
+    tilesize: int = 256,
+):
+    """
+    Serve every frame of one tile in a single response, for loop animation.
+
+    Args:
+        fmt: ``apng`` (animated PNG), ``webp`` (animated WebP) or ``bin`` (length-prefixed PNGs)
+        timestamps: Comma-separated timestamps, in playback order
+        start, end, limit: For NEXRAD without ``timestamps``: the newest ``limit`` indexed
+            frames with ``start <= timestamp <= end``
+        delay_ms: Frame duration for animated formats
+        tilesize: 256 or 512 pixels
+    """
+    _check_tile_size(tilesize)
+    if fmt not in STACK_MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail=f"Unsupported stack format: {fmt}")
+    if fmt == "webp" and not webp_available():
+        raise HTTPException(status_code=406, detail="WebP encoding unavailable")
+    derived_bucket = _derived_bucket()
+    frame_times = await _select_frame_times(
+        dataset, derived_bucket, timestamps, start, end, limit, STACK_MAX_FRAMES
+    )
+    sources = [_resolve_dataset(dataset, t, style, rescale) for t in frame_times]
+    revisable = lookup(dataset)[0].revisable  # type: ignore[index]
+    # Revisable frames are keyed by their object version, as in weather_tiles, and so is
+    # the stack: a recomposited frame yields a new stack.
+    versions: list[str | None] = [None] * len(frame_times)
+    if revisable:
+        etags = await asyncio.gather(*(_source_etag(derived_bucket, s3_key) for s3_key, _ in sources))
+        versions = [source_digest(etag) for etag in etags]
+
+    digest_text = f"{','.join(frame_times)}|{delay_ms}|{','.join(v or '' for v in versions)}"
+    digest = hashlib.sha1(digest_text.encode()).hexdigest()[:16]
+    stack_key = TileKey(dataset, f"stack-{digest}", z, x, y, style, rescale, fmt, tilesize)
+    headers = {
+        # Explicit timestamp lists never change; index ranges move as new frames arrive.
+        "Cache-Control": _cache_control(bool(timestamps) and not revisable),
+        "X-Stack-Timestamps": ",".join(frame_times),
+    }
+    cached = tile_cache.get_memory(stack_key)
+    if cached is not None:
+        return Response(
+            content=cached, media_type=STACK_MEDIA_TYPES[fmt], headers={**headers, "X-Tile-Cache": "memory"}
+        )
+
+    # Frames are read from their sources and coloured concurrently on the render pool. The
+    # tile cache is not consulted; only concurrent stacks share in-flight work per frame.
+    frame_keys = [
+        TileKey(dataset, t, z, x, y, style, rescale, tile_size=tilesize, sources=v)
+        for t, v in zip(frame_times, versions, strict=True)
+    ]
+    results = await asyncio.gather(
+        *(
+            render_pool.run(("indices", key), _stack_frame_indices, key, derived_bucket, s3_key, key_rescale)
+            for key, (s3_key, key_rescale) in zip(frame_keys, sources, strict=True)
+        ),
+        return_exceptions=True,
+    )
+    if any(isinstance(r, PoolSaturated) for r in results):
+        raise _pool_busy()
+    rendered = [(t, r) for t, r in zip(frame_times, results, strict=True) if not isinstance(r, BaseException)]
+    missing = [t for t, r in zip(frame_times, results, strict=True) if isinstance(r, BaseException)]
+    if not rendered:
+        raise HTTPException(status_code=404, detail="None of the requested frames could be rendered")
+
+    palette = rendered[0][1][1]
+    profile = profile_for(ENCODING_PROFILES, dataset)
+    try:
+        payload = await render_pool.run(
+            stack_key, encode_stack, [r[0] for _, r in rendered], palette, fmt, profile, delay_ms
+        )
+    except PoolSaturated:
+        raise _pool_busy() from None
+    except Exception as e:  # noqa: BLE001
+        raise HTTPException(status_code=500, detail=f"Stack encoding failed: {str(e)}") from None
+
+    headers["X-Stack-Timestamps"] = ",".join(t for t, _ in rendered)
+    if missing:
+        # Incomplete stacks are neither cached here nor cacheable for long downstream.
+        headers["X-Stack-Missing"] = ",".join(missing)
+        headers["Cache-Control"] = "public, max-age=30"
+    else:
+        # Stacks stay in memory only; a miss reads and colours every frame again.
+        tile_cache.put(stack_key, payload, STACK_MEDIA_TYPES[fmt], persist=False)
+    return Response(
+        content=payload, media_type=STACK_MEDIA_TYPES[fmt], headers={**headers, "X-Tile-Cache": "miss"}
+    )
+
+
+@app.get("/tiles/data/{dataset}/{timestamp}/{z}/{x}/{y}.bin")
+async def weather_data_tile(
+    dataset: str,
+    timestamp: str,
+    z: int,
+    x: int,
+    y: int,
+    tilesize: int = 256,
+    if_none_match: str | None = Header(default=None),
+):
+    """
+    Serve the values of one tile, uncoloured, for client-side (GPU) colourizing.
+
+    The body is a zlib-compressed little-endian array described by the ``X-Data-*``
+    headers (see ``services/tiler/data_tiles.py``). Styles and ``rescale`` do not apply:
+    one data tile serves every palette and unit. Known-empty tiles answer ``204``.
+    ETags, ``latest`` and caching follow :func:`weather_tiles`.
+    """
+    derived_bucket = _derived_bucket()
+    s3_key, _ = _resolve_dataset(dataset, timestamp, "default", None)
+    _check_tile_size(tilesize)
+    spec, site = lookup(dataset)  # type: ignore[misc]
+    latest = timestamp == "latest"
+    headers: dict[str, str] = {}
+    if latest:
+        timestamp = await _latest_timestamp(derived_bucket, spec, site)
+        s3_key, _ = _resolve_dataset(dataset, timestamp, "default", None)
+        headers["X-Tile-Timestamp"] = timestamp
+    # As in weather_tiles, only revisable frames wait on a fresh source ETag before the cache.
+    if spec.revisable:
+        source = await _source_etag(derived_bucket, s3_key)
+    else:
+        source = source_etags.last_known(derived_bucket, s3_key)
+    cache_key = TileKey(
+        dataset,
+        timestamp,
+        z,
+        x,
+        y,
+        fmt="data",
+        tile_size=tilesize,
+        sources=source_digest(source) if spec.revisable else None,
+    )
+    cache_control = _cache_control(not latest and not spec.revisable)
+    etag = tile_etag(source, cache_key.object_name) if source else None
+    if etag is not None and etag_matches(if_none_match, etag):
+        return _not_modified(etag, cache_control, False, headers)
+    respond = functools.partial(_data_tile_response, cache_control=cache_control, etag=etag, headers=headers)
+
+    cached = tile_cache.get_memory(cache_key)
+    if cached is not None:
+        return respond(DataTile.unpack(cached), "memory")
+    if source is None and not spec.revisable:
+        source = await _source_etag(derived_bucket, s3_key)
+        etag = tile_etag(source, cache_key.object_name) if source else None
+        if etag is not None and etag_matches(if_none_match, etag):
+            return _not_modified(etag, cache_control, False, headers)
+        respond = functools.partial(respond, etag=etag)
+    if _is_empty_tile(cache_key, derived_bucket, load=False):
+        return respond(None, "empty")
+    try:
+        tile, cache_status = await render_pool.run(
+            cache_key, _produce_data_tile, cache_key, derived_bucket, s3_key
+        )
+    except PoolSaturated:
+        raise _pool_busy() from None
+    return respond(tile, cache_status)
+
+
+def _data_tile_response(
+    tile: DataTile | None,
+    cache_status: str,
+    *,
+    cache_control: str,
+    etag: str | None = None,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    headers = {**(headers or {}), "Cache-Control": cache_control, "X-Tile-Cache": cache_status}
+    if tile is None:
+        return Response(status_code=204, headers=headers)
+    if etag is not None:
+        headers["ETag"] = etag
+    return Response(content=tile.body, media_type=DATA_MEDIA_TYPE, headers={**headers, **tile.headers()})
+
+
+def _parse_points(points: str) -> list[tuple[float, float]]:
+    """``lon,lat;lon,lat;...`` as a list of ``(lon, lat)``."""
+    parsed = []
+    for item in filter(None, (part.strip() for part in points.split(";"))):
+        try:
+            lon, lat = map(float, item.split(","))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid point {item!r}; expected lon,lat") from None
+        if not (-180.0 <= lon <= 180.0 and -90.0 <= lat <= 90.0):
+            raise HTTPException(status_code=400, detail=f"Point {item!r} is out of range")
+        parsed.append((lon, lat))
+    if not parsed:
+        raise HTTPException(status_code=400, detail="At least one point is required")
+    if len(parsed) > POINT_MAX_POINTS:
+        raise HTTPException(status_code=400, detail=f"At most {POINT_MAX_POINTS} points per request")
+    return parsed
+
+
+def _sample_points(
+    dataset: str, derived_bucket: str, s3_key: str, points: tuple[tuple[float, float], ...], style: str
+) -> list[float | None]:
+    """Value of one frame at each point, ``None`` where it has no data (blocking).
+
+    Frames in the frame cache are sampled from memory. Other COGs go through the shared
+    open handles, and each point reads only the block that holds it.
+    """
+    frame = None
+    if frame_cache is not None and dataset.startswith("nexrad-"):
+        frame = frame_cache.get(derived_bucket, s3_key)
+    if frame is not None:
+        values = [frame.sample(lon, lat) for lon, lat in points]
+    else:
+        if not _tiler_available:
+            raise HTTPException(status_code=500, detail="Tiler dependencies unavailable")
+        version = None
+        if lookup(dataset)[0].revisable:  # type: ignore[index]
+            version = source_digest(source_etags.get(derived_bucket, s3_key))
+        values = []
+        with dataset_handles.checkout(derived_bucket, s3_key, version) as src:
+            scale = (src.dataset.scales or (1.0,))[0]
+            offset = (src.dataset.offsets or (0.0,))[0]
+            for lon, lat in points:
+                try:
+                    point = src.point(lon, lat)
+                except TileOutsideBounds:
+                    values.append(None)
+                    continue
+                valid = bool(np.asarray(point.mask)[0])
+                values.append(float(np.asarray(point.data)[0]) * scale + offset if valid else None)
+    return [
+        None if v is None or not np.isfinite(v) else round(float(_convert_temperature(v, style)), 3)
+        for v in values
+    ]
+
+
+@app.get("/tiles/point/{dataset}")
+async def weather_point_series(
+    dataset: str,
+    points: str,
+    timestamps: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    limit: int = Query(default=10, ge=1),
+    style: str = "default",
+):
+    """
+    Value series of a dataset at one or more points, for hover readouts and meteograms.
+
+    Args:
+        points: ``lon,lat`` pairs separated by ``;``
+        timestamps, start, end, limit: Frames, as for tile stacks
+        style: Temperature unit for GOES (kelvin, celsius, fahrenheit)
+
+    ``values`` holds one series per point, aligned with ``timestamps``; ``null`` marks no
+    data. Frames that could not be read are listed in ``missing``.
+    """
+    derived_bucket = _derived_bucket()
+    coords = tuple(_parse_points(points))
+    frame_times = await _select_frame_times(
+        dataset, derived_bucket, timestamps, start, end, limit, POINT_MAX_FRAMES
+    )
+    sources = [_resolve_dataset(dataset, t, style, None)[0] for t in frame_times]
+    if not lookup(dataset)[0].temperature:  # type: ignore[index]
+        style = "default"
+
+    # One small read per frame, concurrently on the render pool.
+    results = await asyncio.gather(
+        *(
+            render_pool.run(
+                ("point", derived_bucket, s3_key, coords, style),
+                _sample_points,
+                dataset,
+                derived_bucket,
+                s3_key,
+                coords,
+                style,
+            )
+            for s3_key in sources
+        ),
+        return_exceptions=True,
+    )
+    if any(isinstance(r, PoolSaturated) for r in results):
+        raise _pool_busy()
+    read = [(t, r) for t, r in zip(frame_times, results, strict=True) if not isinstance(r, BaseException)]
+    missing = [t for t, r in zip(frame_times, results, strict=True) if isinstance(r, BaseException)]
+    if not read:
+        raise HTTPException(status_code=404, detail="None of the requested frames could be read")
+    return JSONResponse(
+        {
+            "dataset": dataset,
+            "units": colormap_for(dataset, style).units,
+            "timestamps": [t for t, _ in read],
+            "points": [
+                {"lon": lon, "lat": lat, "values": [r[i] for _, r in read]} for i, (lon, lat) in enumerate(coords)
+            ],
+            "missing": missing,
+        },
+        headers={
+            "Cache-Control": _cache_control(
+                bool(timestamps) and not missing and not lookup(dataset)[0].revisable  # type: ignore[index]
+            )
+        },
+    )
+
+
+@app.get("/tiles/cache/stats")
+async def tile_cache_stats():
+    return {
+        **tile_cache.snapshot(),
+        "handles": dataset_handles.snapshot(),
+        "render": render_pool.snapshot(),
+        "frames": frame_cache.snapshot() if frame_cache is not None else None,
+        "occupancy": occupancy_cache.snapshot() if occupancy_cache is not None else None,
+        "mosaic": mosaic_index.snapshot(),
+        "etags": source_etags.snapshot(),
+        "prewarm": prewarmer.snapshot(),
+    }
+
+
+@app.delete("/tiles/cache/{dataset}")
+@app.delete("/tiles/cache/{dataset}/{timestamp}")
+async def purge_tile_cache(
+    dataset: str,
+    timestamp: str | None = None,
+    x_purge_token: str | None = Header(default=None),
+):
+    """Drop cached tiles for a dataset, or for one of its timestamps (e.g. after re-ingest)."""
+    if TILE_CACHE_PURGE_TOKEN and x_purge_token != TILE_CACHE_PURGE_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid purge token")
+    # Deleting the store prefix lists and removes objects (blocking): keep it off the loop.
+    removed = await run_in_threadpool(tile_cache.purge, dataset, timestamp)
+    # A purge usually follows a re-ingest; reopen COGs so no stale headers are reused.
+    dataset_handles.clear()
+    if frame_cache is not None:
+        frame_cache.clear()
+    if occupancy_cache is not None:
+        occupancy_cache.clear()
+    mosaic_index.clear()
+    source_etags.clear()
+    _latest_frames.clear()
+    return {"dataset": dataset, "timestamp": timestamp, "removed": removed}
+
+def _prewarm_plan(job: PrewarmJob) -> list[Tile]:
+    """Tiles worth pre-rendering for a frame: its occupied tiles, else its dataset bounds."""
+    spec, site = lookup(job.dataset)  # type: ignore[misc]
+    derived_bucket = _derived_bucket()
+    occupancy_key = spec.occupancy_key(job.timestamp, site)
+    if occupancy_key is not None and occupancy_cache is not None:
+        version = None
+        if spec.revisable:
+            version = source_digest(source_etags.get(derived_bucket, spec.key(job.timestamp, site)))
+        occupancy = occupancy_cache.get(derived_bucket, occupancy_key, version)
+        if occupancy is not None:
+            return list(occupied_tiles(occupancy, PREWARM_MIN_ZOOM, PREWARM_MAX_ZOOM))
+    if spec.bounds is not None:
+        return list(bounds_tiles(spec.bounds, PREWARM_MIN_ZOOM, PREWARM_MAX_ZOOM))
+    return []
+
+
+def _prewarm_tile(job: PrewarmJob, z: int, x: int, y: int) -> None:
+    """Render tile ``z/x/y`` of a frame into the tile cache like a default-style request (blocking)."""
+    spec, _ = lookup(job.dataset)  # type: ignore[misc]
+    derived_bucket = _derived_bucket()
+    s3_key, default_rescale = _resolve_dataset(job.dataset, job.timestamp, "default", None)
+    # Loaded for every dataset, so later memory hits on these tiles can answer with an ETag.
+    source = source_etags.get(derived_bucket, s3_key)
+    sources = source_digest(source) if spec.revisable else None
+    for fmt in PREWARM_FORMATS:
+        if fmt == "webp" and not webp_available():
+            continue
+        for size in PREWARM_TILE_SIZES:
+            key = TileKey(job.dataset, job.timestamp, z, x, y, "default", None, fmt, size, sources=sources)
+            if tile_cache.get_memory(key) is None:
+                _produce_tile(key, derived_bucket, s3_key, default_rescale)
+
+
+prewarmer = Prewarmer(
+    _prewarm_plan,
+    _prewarm_tile,
+    workers=PREWARM_WORKERS,
+    rate=PREWARM_RATE,
+    busy=lambda: render_pool.in_flight >= PREWARM_BUSY_IN_FLIGHT,
+    max_queued=PREWARM_QUEUE,
+)
+
+
+class PrewarmRequest(BaseModel):
+    dataset: str
+    timestamps: list[str]
+
+
+@app.post("/tiles/prewarm", status_code=202)
+async def prewarm_tiles(request: PrewarmRequest, x_prewarm_token: str | None = Header(default=None)):
+    """Queue newly ingested frames for background pre-rendering into the tile cache."""
+    if PREWARM_TOKEN and x_prewarm_token != PREWARM_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid prewarm token")
+    if PREWARM_WORKERS <= 0:
+        raise HTTPException(status_code=503, detail="Tile prewarm disabled")
+    _derived_bucket()
+    for timestamp in request.timestamps:
+        if timestamp == "latest":
+            raise HTTPException(status_code=400, detail="Prewarm needs explicit frame timestamps")
+        _resolve_dataset(request.dataset, timestamp, "default", None)
+    queued, rejected = [], []
+    for timestamp in request.timestamps:
+        accepted = prewarmer.submit(PrewarmJob(request.dataset, timestamp))
+        (queued if accepted else rejected).append(timestamp)
+    if rejected and not queued:
+        raise HTTPException(status_code=503, detail="Prewarm queue full", headers={"Retry-After": "10"})
+    return {"dataset": request.dataset, "queued": queued, "rejected": rejected}
+
 
 # Health check endpoints (direct and via Caddy /tiles/* route)
 @app.get("/healthz")
@@ -0,0 +1,160 @@
+import zlib
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services.tiler import server as srv
+from services.tiler.etags import SourceETags, etag_matches, tile_etag
+from services.tiler.frame_cache import MERCATOR_HALF_EXTENT_M, Frame, FrameCache
+from services.tiler.handles import DatasetHandleCache
+from services.tiler.occupancy import OccupancyCache
+from services.tiler.render_pool import PoolSaturated, RenderPool
+from services.tiler.tile_cache import TileCache
+
+TS, OLDER = "20240501120500Z", "20240501120000Z"
+IMMUTABLE = f"public, max-age={srv.IMMUTABLE_MAX_AGE}, immutable"
+SHORT = f"public, max-age={srv.SHORT_MAX_AGE}"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    res = 2 * MERCATOR_HALF_EXTENT_M / (256 * 2**7)
+    left, top = -MERCATOR_HALF_EXTENT_M + 29 * 256 * res, MERCATOR_HALF_EXTENT_M - 51 * 256 * res
+    frame = Frame(np.full((256, 256), 140, dtype="uint8"), left, top, res, res, nodata=0, scale=0.5, offset=-33.0)
+    loads = []
+
+    def loader(bucket, key):
+        loads.append(key)
+        return frame
+
+    versions = {"v": "1"}
+    monkeypatch.setenv("S3_BUCKET_DERIVED", "derived")
+    monkeypatch.setattr(srv, "tile_cache", TileCache())
+    monkeypatch.setattr(srv, "source_etags", SourceETags(lambda bucket, key: f"{key}-v{versions['v']}", ttl=0))
+    monkeypatch.setattr(srv, "render_pool", RenderPool(max_workers=2))
+    monkeypatch.setattr(srv, "dataset_handles", DatasetHandleCache(lambda b, k, e: f"https://minio/{b}/{k}", object))
+    monkeypatch.setattr(srv, "frame_cache", FrameCache(loader))
+    monkeypatch.setattr(srv, "occupancy_cache", OccupancyCache(lambda bucket, key: None))
+    monkeypatch.setattr(srv, "_latest_frames", {})
+    monkeypatch.setattr(srv, "_indexed_frame_timestamps", lambda bucket, index_key: [OLDER, TS])
+    test_client = TestClient(srv.app)
+    test_client.frame_loads = loads
+    test_client.versions = versions
+    return test_client
+
+
+def test_frame_tiles_are_immutable_and_revalidate_with_304(client):
+    url = f"/tiles/weather/nexrad-KTLX/{TS}/7/29/51.png"
+    first = client.get(url)
+    assert first.status_code == 200 and first.headers["Cache-Control"] == IMMUTABLE
+    etag = first.headers["ETag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    again = client.get(url, headers={"If-None-Match": f'"other", W/{etag}'})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["ETag"] == etag and again.headers["Cache-Control"] == IMMUTABLE
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+    assert len(client.frame_loads) == 1
+
+    # Other render parameters are other representations.
+    assert client.get(f"/tiles/weather/nexrad-KTLX/{TS}/7/29/51@2x.png").headers["ETag"] != etag
+    data = client.get(f"/tiles/data/nexrad-KTLX/{TS}/7/29/51.bin")
+    assert data.headers["ETag"] not in (etag, None) and data.headers["Cache-Control"] == IMMUTABLE
+    data_again = client.get(f"/tiles/data/nexrad-KTLX/{TS}/7/29/51.bin", headers={"If-None-Match": data.headers["ETag"]})
+    assert data_again.status_code == 304
+
+
+def test_latest_alias_resolves_through_the_index_with_a_short_ttl(client):
+    explicit = client.get(f"/tiles/weather/nexrad-KTLX/{TS}/7/29/51.png")
+    latest = client.get("/tiles/weather/nexrad-KTLX/latest/7/29/51.png")
+    assert latest.status_code == 200 and latest.headers["X-Tile-Timestamp"] == TS
+    assert latest.headers["Cache-Control"] == SHORT
+    # Same frame, same tile: shared cache entry and validator.
+    assert latest.headers["X-Tile-Cache"] == "memory" and latest.headers["ETag"] == explicit.headers["ETag"]
+    assert client.get("/tiles/data/nexrad-KTLX/latest/7/29/51.bin").headers["X-Tile-Timestamp"] == TS
+    assert client.get("/tiles/weather/goes-c13/latest/3/1/3.png").status_code == 400
+
+
+def test_revisable_frames_are_revalidated_and_change_etag_with_their_source(client):
+    url = f"/tiles/weather/mrms-reflq/{TS}/3/0/0.png"  # outside the dataset bounds: empty
+    first = client.get(url)
+    assert first.status_code == 200 and first.headers["Cache-Control"] == SHORT
+    assert client.get(url, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+    client.versions["v"] = "2"  # recomposited by ingestion
+    second = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200 and second.headers["ETag"] != first.headers["ETag"]
+
+
+def test_etag_helpers():
+    etag = tile_etag("abc", "nexrad-KTLX/t/7/29/51/default_auto.png")
+    assert etag == tile_etag("abc", "nexrad-KTLX/t/7/29/51/default_auto.png") != tile_etag("abd", "x")
+    assert etag_matches("*", etag) and etag_matches(f"W/{etag}", etag)
+    assert not etag_matches(None, etag) and not etag_matches('"nope"', etag)
+
+    now = [0.0]
+    calls = []
+
+    def stat(bucket, key):
+        calls.append(key)
+        if key == "missing":
+            raise FileNotFoundError(key)
+        return '"d41d8cd9"'
+
+    etags = SourceETags(stat, ttl=60, clock=lambda: now[0])
+    assert etags.peek("b", "k") == (False, None)
+    assert etags.get("b", "k") == "d41d8cd9" and etags.get("b", "k") == "d41d8cd9"
+    assert etags.get("b", "missing") is None and etags.get("b", "missing") is None
+    assert calls == ["k", "missing"]
+    now[0] = 61.0
+    assert etags.peek("b", "k") == (False, None) and etags.last_known("b", "k") == "d41d8cd9"
+    assert etags.last_known("b", "missing") is None and etags.last_known("b", "never") is None
+    assert etags.get("b", "k") == "d41d8cd9"
+    assert etags.snapshot()["loads"] == 2 and etags.snapshot()["missing"] == 1
+
+
+def test_memory_hits_of_immutable_frames_never_wait_on_the_render_pool(client, monkeypatch):
+    url = f"/tiles/weather/nexrad-KTLX/{TS}/7/29/51.png"
+    data_url = f"/tiles/data/nexrad-KTLX/{TS}/7/29/51.bin"
+    first, data = client.get(url), client.get(data_url)
+
+    # Source ETags expire at once here (ttl=0); a saturated pool cannot HEAD them again.
+    async def saturated(*_args):
+        raise PoolSaturated
+
+    monkeypatch.setattr(srv.render_pool, "run", saturated)
+    again = client.get(url)
+    assert again.status_code == 200 and again.headers["X-Tile-Cache"] == "memory"
+    assert again.headers["ETag"] == first.headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+    assert client.get(data_url).headers["ETag"] == data.headers["ETag"]
+    # Revisable frames still need their current version before the cache can be used.
+    assert client.get(f"/tiles/weather/mrms-reflq/{TS}/3/0/0.png").status_code == 503
+
+
+def test_rewritten_revisable_frames_are_read_through_fresh_handles(client, monkeypatch):
+    stored = {"code": 100}
+
+    class _Reader:
+        def __init__(self, url):
+            # An open handle keeps serving the blocks of the object it was opened on.
+            self.code = stored["code"]
+            self.dataset = SimpleNamespace(scales=(0.5,), offsets=(-33.0,), nodata=0)
+
+        def tile(self, x, y, z, tilesize):
+            return np.full((1, tilesize, tilesize), self.code, "uint8"), np.full((tilesize, tilesize), 255, "uint8")
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(srv, "_tiler_available", True)
+    monkeypatch.setattr(srv, "dataset_handles", DatasetHandleCache(lambda b, k, e: f"https://minio/{b}/{k}", _Reader))
+    url = f"/tiles/data/mrms-reflq/{TS}/3/1/3.bin"
+
+    def codes():
+        return set(np.frombuffer(zlib.decompress(client.get(url).content), dtype="uint8"))
+
+    assert codes() == {100}
+    stored["code"], client.versions["v"] = 150, "2"  # recomposited in place by ingestion
+    assert codes() == {150}
@@ -0,0 +1,86 @@
+import zlib
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services.tiler import server as srv
+from services.tiler.data_tiles import DataTile, encode_data_tile
+from services.tiler.etags import SourceETags
+from services.tiler.frame_cache import MERCATOR_HALF_EXTENT_M, Frame, FrameCache
+from services.tiler.handles import DatasetHandleCache
+from services.tiler.occupancy import OccupancyCache
+from services.tiler.render_pool import RenderPool
+from services.tiler.tile_cache import TileCache
+
+TS = "20240501T120000Z"
+
+
+def test_quantized_codes_pass_through_with_masked_pixels_as_nodata():
+    codes = np.array([[[10, 20], [30, 40]]], dtype="uint8")
+    mask = np.array([[255, 0], [255, 255]], dtype="uint8")
+    tile = encode_data_tile(codes, mask, scale=0.5, offset=-33.0, nodata=0)
+    assert tile.headers() == {
+        "X-Data-Dtype": "uint8",
+        "X-Data-Scale": "0.5",
+        "X-Data-Offset": "-33.0",
+        "X-Data-Nodata": "0.0",
+        "X-Data-Shape": "2,2",
+    }
+    assert tile.array().tolist() == [[10, 0], [30, 40]]
+    assert DataTile.unpack(tile.pack()) == tile
+
+
+def test_float_tiles_become_float16_physical_values():
+    kelvin = np.array([[200.0, 250.0], [-999.0, 300.0]], dtype="float32")
+    tile = encode_data_tile(kelvin, None, nodata=-999.0)
+    assert tile.dtype == "float16" and tile.headers()["X-Data-Nodata"] == "nan"
+    values = np.frombuffer(zlib.decompress(tile.body), dtype="<f2").reshape(2, 2)
+    assert values[0].tolist() == [200.0, 250.0] and np.isnan(values[1, 0])
+    restored = DataTile.unpack(tile.pack())
+    assert np.isnan(restored.nodata) and restored.body == tile.body
+
+
+@pytest.fixture
+def client(monkeypatch):
+    res = 2 * MERCATOR_HALF_EXTENT_M / (256 * 2**7)
+    left, top = -MERCATOR_HALF_EXTENT_M + 29 * 256 * res, MERCATOR_HALF_EXTENT_M - 51 * 256 * res
+    codes = np.full((256, 256), 120, dtype="uint8")
+    codes[:, :16] = 0
+    frame = Frame(codes, left, top, res, res, nodata=0, scale=0.5, offset=-33.0)
+    loads = []
+
+    def loader(bucket, key):
+        loads.append(key)
+        return frame
+
+    monkeypatch.setenv("S3_BUCKET_DERIVED", "derived")
+    monkeypatch.setattr(srv, "tile_cache", TileCache())
+    monkeypatch.setattr(srv, "source_etags", SourceETags(lambda bucket, key: f"etag-{key}"))
+    monkeypatch.setattr(srv, "render_pool", RenderPool(max_workers=2))
+    monkeypatch.setattr(srv, "dataset_handles", DatasetHandleCache(lambda b, k, e: f"https://minio/{b}/{k}", object))
+    monkeypatch.setattr(srv, "frame_cache", FrameCache(loader))
+    monkeypatch.setattr(srv, "occupancy_cache", OccupancyCache(lambda bucket, key: None))
+    test_client = TestClient(srv.app)
+    test_client.frame_loads = loads
+    return test_client
+
+
+def test_data_tile_endpoint_serves_codes_and_caches_once(client):
+    url = f"/tiles/data/nexrad-KTLX/{TS}/7/29/51.bin"
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers["X-Data-Dtype"] == "uint8" and response.headers["X-Data-Shape"] == "256,256"
+    assert "X-Data-Scale" in response.headers["Access-Control-Expose-Headers"]
+    values = np.frombuffer(zlib.decompress(response.content), dtype="uint8").reshape(256, 256)
+    assert values[0, 0] == 0 and values[0, 100] == 120
+
+    again = client.get(url, params={"style": "celsius", "rescale": "0,50"})
+    assert again.headers["X-Tile-Cache"] == "memory" and again.content == response.content
+    assert client.frame_loads == [f"nexrad/KTLX/{TS}/tilt0_reflectivity.tif"]
+
+
+def test_data_tiles_outside_dataset_bounds_are_no_content(client):
+    response = client.get(f"/tiles/data/goes-c13/{TS}/3/0/0.bin")
+    assert response.status_code == 204 and response.headers["X-Tile-Cache"] == "empty"
+    assert client.get(f"/tiles/data/unknown/{TS}/3/0/0.bin").status_code == 404
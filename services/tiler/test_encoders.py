@@ -0,0 +1,84 @@
+import io
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services.common.colormaps import NEXRAD_REFLECTIVITY
+from services.tiler import server as srv
+from services.tiler.encoders import EncodingProfile, encode_tile, load_profiles, negotiate_format
+from services.tiler.etags import SourceETags
+from services.tiler.frame_cache import MERCATOR_HALF_EXTENT_M, Frame, FrameCache
+from services.tiler.handles import DatasetHandleCache
+from services.tiler.render_pool import RenderPool
+from services.tiler.tile_cache import TileCache
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _frame():
+    # One z7 tile, (29, 51), of ramped reflectivity codes.
+    res = 2 * MERCATOR_HALF_EXTENT_M / (256 * 2**7)
+    left, top = -MERCATOR_HALF_EXTENT_M + 29 * 256 * res, MERCATOR_HALF_EXTENT_M - 51 * 256 * res
+    return Frame(_indices(), left, top, res, res, nodata=0, scale=0.5, offset=-33.0)
+
+
+def _indices():
+    yy, xx = np.mgrid[0:256, 0:256]
+    return ((xx + yy) // 4 % 256).astype("uint8")
+
+
+@pytest.mark.parametrize("png_filter", ["none", "sub", "up"])
+def test_png_filters_decode_to_the_same_pixels(png_filter):
+    palette = NEXRAD_REFLECTIVITY.palette(-30.0, 80.0)
+    png = encode_tile(_indices(), palette, "png", EncodingProfile(png_level=9, png_filter=png_filter))
+    decoded = np.asarray(Image.open(io.BytesIO(png)).convert("RGBA"))
+    np.testing.assert_array_equal(decoded, palette[_indices()])
+
+
+def test_lossless_webp_is_exact_and_lossy_webp_encodes():
+    palette = NEXRAD_REFLECTIVITY.palette(-30.0, 80.0)
+    lossless = encode_tile(_indices(), palette, "webp", EncodingProfile(webp_lossless=True))
+    lossy = encode_tile(_indices(), palette, "webp", EncodingProfile(webp_lossless=False, webp_quality=50))
+    decoded = np.asarray(Image.open(io.BytesIO(lossless)).convert("RGBA"))
+    np.testing.assert_array_equal(decoded, palette[_indices()])
+    assert lossy[:4] == b"RIFF" and lossy[8:12] == b"WEBP"
+
+
+def test_profiles_parse_env_overrides(monkeypatch):
+    monkeypatch.setenv("TILE_ENCODING_GOES", "png_level=9, png_filter=sub, webp_lossless=1")
+    goes = load_profiles()["goes"]
+    assert (goes.png_level, goes.png_filter, goes.webp_lossless, goes.webp_quality) == (9, "sub", True, 80)
+    with pytest.raises(ValueError):
+        EncodingProfile.parse("png_filter=paeth")
+    with pytest.raises(ValueError):
+        EncodingProfile.parse("zopfli=1")
+
+
+def test_format_negotiation():
+    assert negotiate_format("png", "image/webp,*/*") == "png"
+    assert negotiate_format(None, "image/avif,image/webp,*/*") == "webp"
+    assert negotiate_format(None, "image/png") == "png"
+    assert negotiate_format(None, None) == "png"
+
+
+def test_route_negotiates_webp_and_honours_suffixes(monkeypatch):
+    frame = _frame()
+    monkeypatch.setenv("S3_BUCKET_DERIVED", "derived")
+    monkeypatch.setattr(srv, "tile_cache", TileCache())
+    monkeypatch.setattr(srv, "source_etags", SourceETags(lambda bucket, key: f"etag-{key}"))
+    monkeypatch.setattr(srv, "render_pool", RenderPool(max_workers=1))
+    monkeypatch.setattr(srv, "dataset_handles", DatasetHandleCache(lambda b, k, e: f"https://minio/{b}/{k}", object))
+    monkeypatch.setattr(srv, "frame_cache", FrameCache(lambda bucket, key: frame))
+    client = TestClient(srv.app)
+    base = "/tiles/weather/nexrad-KTLX/20240501T120000Z/7/29/51"
+
+    negotiated = client.get(base, headers={"Accept": "image/webp,*/*"})
+    assert negotiated.headers["Content-Type"] == "image/webp"
+    assert negotiated.headers["Vary"] == "Accept"
+    assert client.get(base, headers={"Accept": "image/png"}).headers["Content-Type"] == "image/png"
+
+    explicit = client.get(base + ".png", headers={"Accept": "image/webp"})
+    assert explicit.headers["Content-Type"] == "image/png" and "Vary" not in explicit.headers
+    assert client.get(base + ".webp").headers["X-Tile-Cache"] == "memory"
+    assert client.get(base + ".gif").status_code == 404
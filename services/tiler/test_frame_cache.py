@@ -0,0 +1,124 @@
+import math
+import threading
+
+import numpy as np
+import rasterio
+from rasterio.transform import from_origin
+
+from services.tiler.etags import SourceETags
+from services.tiler.frame_cache import MERCATOR_HALF_EXTENT_M, Frame, FrameCache, read_frame
+
+
+def _tile_origin(z, x, y, tile_size=256):
+    res = 2 * MERCATOR_HALF_EXTENT_M / (tile_size * 2**z)
+    return -MERCATOR_HALF_EXTENT_M + x * tile_size * res, MERCATOR_HALF_EXTENT_M - y * tile_size * res, res
+
+
+def _frame(nodata=0):
+    # A 2x2-tile frame at z7 whose top-left corner is tile (28, 50), i.e. all of z6 (14, 25).
+    left, top, res = _tile_origin(7, 28, 50)
+    data = np.arange(512 * 512, dtype="uint32").reshape(512, 512).astype("uint16")
+    data[0, 0] = nodata
+    return Frame(data, left, top, res, res, nodata=nodata, scale=0.5, offset=-33.0)
+
+
+def test_native_zoom_tiles_are_exact_slices():
+    frame = _frame()
+    data, mask = frame.tile(7, 29, 51)
+    assert data.shape == (1, 256, 256) and data.dtype == np.uint16
+    np.testing.assert_array_equal(data[0], frame.data[256:, 256:])
+    assert mask.dtype == np.uint8 and mask.min() == 255
+
+    _, mask = frame.tile(7, 28, 50)
+    assert mask[0, 0] == 0 and mask[0, 1] == 255
+
+
+def test_other_zooms_resample_and_mask_outside():
+    frame = _frame()
+    coarse = np.arange(1, 256 * 256 + 1, dtype="uint16").reshape(256, 256)
+    blocky = Frame(np.repeat(np.repeat(coarse, 2, 0), 2, 1), frame.left, frame.top, frame.res_x, frame.res_y)
+    data, mask = blocky.tile(6, 14, 25)
+    np.testing.assert_array_equal(data[0], coarse)
+    assert mask.min() == 255
+
+    _, mask = frame.tile(5, 7, 12)
+    assert mask[128:, :128].min() == 255
+    assert not mask[:128].any() and not mask[:, 128:].any()
+
+    zoomed, _ = frame.tile(8, 56, 100)
+    np.testing.assert_array_equal(zoomed[0], np.repeat(np.repeat(frame.data[:128, :128], 2, 0), 2, 1))
+    assert frame.tile(7, 10, 10) is None
+
+
+def test_read_frame_keeps_codes_and_rejects_other_crs(tmp_path):
+    left, top, res = _tile_origin(7, 29, 50)
+    codes = np.full((64, 64), 100, dtype="uint8")
+    path = tmp_path / "frame.tif"
+    profile = dict(driver="GTiff", width=64, height=64, count=1, dtype="uint8", nodata=0)
+    with rasterio.open(path, "w", crs="EPSG:3857", transform=from_origin(left, top, res, res), **profile) as dst:
+        dst.write(codes, 1)
+        dst.scales, dst.offsets = (0.5,), (-33.0,)
+    frame = read_frame(str(path), max_pixels=64 * 64)
+    assert (frame.scale, frame.offset, frame.nodata) == (0.5, -33.0, 0)
+    assert math.isclose(frame.left, left) and frame.data.dtype == np.uint8
+
+    assert read_frame(str(path), max_pixels=100) is None
+    other = tmp_path / "planar.tif"
+    with rasterio.open(other, "w", crs="EPSG:4326", transform=from_origin(0, 0, 0.01, 0.01), **profile) as dst:
+        dst.write(codes, 1)
+    assert read_frame(str(other), max_pixels=64 * 64) is None
+
+
+def test_cache_loads_once_remembers_ineligible_and_is_bounded():
+    loads = []
+    gate = threading.Event()
+
+    def loader(bucket, key):
+        loads.append(key)
+        gate.wait(5)
+        if key == "goes.tif":
+            return None
+        return Frame(np.zeros((16, 16), dtype="uint8"), 0.0, 0.0, 1.0, 1.0)
+
+    cache = FrameCache(loader, max_bytes=2 * 256)
+    threads = [threading.Thread(target=cache.get, args=("derived", "a.tif")) for _ in range(4)]
+    for t in threads:
+        t.start()
+    gate.set()
+    for t in threads:
+        t.join()
+    assert loads == ["a.tif"]
+
+    assert cache.get("derived", "goes.tif") is None
+    assert cache.get("derived", "goes.tif") is None
+    for key in ("b.tif", "c.tif"):
+        cache.get("derived", key)
+    assert loads == ["a.tif", "goes.tif", "b.tif", "c.tif"]
+    assert cache.snapshot() == {
+        "hits": 3, "loads": 3, "ineligible": 1, "evictions": 1, "frames": 2, "bytes": 512
+    }
+
+
+def test_route_renders_nexrad_tiles_from_the_frame_cache(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from services.tiler import server as srv
+    from services.tiler.handles import DatasetHandleCache
+    from services.tiler.render_pool import RenderPool
+    from services.tiler.tile_cache import TileCache
+
+    frame = _frame()
+    monkeypatch.setenv("S3_BUCKET_DERIVED", "derived")
+    monkeypatch.setattr(srv, "tile_cache", TileCache())
+    monkeypatch.setattr(srv, "source_etags", SourceETags(lambda bucket, key: f"etag-{key}"))
+    monkeypatch.setattr(srv, "render_pool", RenderPool(max_workers=1))
+    monkeypatch.setattr(srv, "dataset_handles", DatasetHandleCache(lambda b, k, e: f"https://minio/{b}/{k}", object))
+    monkeypatch.setattr(srv, "frame_cache", FrameCache(lambda bucket, key: frame))
+    client = TestClient(srv.app)
+
+    response = client.get("/tiles/weather/nexrad-KTLX/20240501T120000Z/7/29/51.png")
+    assert response.status_code == 200
+    assert response.headers["X-Tile-Cache"] == "miss"
+    assert response.content[:8] == b"\x89PNG\r\n\x1a\n" and response.content[25] == 3  # indexed colour
+    assert client.get("/tiles/weather/nexrad-KTLX/20240501T120000Z/7/3/3.png").status_code == 500
+    assert srv.frame_cache.snapshot()["loads"] == 1
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+import pytest
+
+from services.tiler.handles import DatasetHandleCache, PresignError
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Dataset:
+    def __init__(self, url):
+        self.url = url
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _cache(clock, signed, opened, **kwargs):
+    def sign(bucket, key, expires):
+        signed.append((bucket, key))
+        return f"https://minio/{bucket}/{key}?sig={len(signed)}"
+
+    def opener(url):
+        dataset = _Dataset(url)
+        opened.append(dataset)
+        return dataset
+
+    return DatasetHandleCache(sign, opener, clock=clock, **kwargs)
+
+
+def test_handles_and_urls_are_reused_until_close_to_expiry():
+    clock, signed, opened = _Clock(), [], []
+    cache = _cache(clock, signed, opened, presign_ttl=timedelta(hours=1), refresh_margin=timedelta(minutes=5))
+
+    with cache.checkout("derived", "a.tif") as first:
+        pass
+    with cache.checkout("derived", "a.tif") as second:
+        assert second is first
+    assert len(signed) == 1 and len(opened) == 1
+    assert cache.stats["handle_hits"] == 1
+
+    # Inside the refresh margin the URL is re-signed and the old handle retired.
+    clock.now = 56 * 60
+    with cache.checkout("derived", "a.tif") as third:
+        assert third is not first
+        assert third.url.endswith("sig=2")
+    assert first.closed
+    assert len(signed) == 2
+
+
+def test_concurrent_checkouts_get_distinct_handles_and_pool_is_bounded():
+    clock, signed, opened = _Clock(), [], []
+    cache = _cache(clock, signed, opened, max_idle_per_key=1)
+    with cache.checkout("derived", "a.tif") as a, cache.checkout("derived", "a.tif") as b:
+        assert a is not b
+        assert cache.snapshot()["busy_handles"] == 2
+    # Only one idle handle is kept per key; the other is closed.
+    assert sum(d.closed for d in opened) == 1
+    assert cache.snapshot()["idle_handles"] == 1
+
+
+def test_errors_discard_handles_unless_benign():
+    clock, signed, opened = _Clock(), [], []
+    cache = _cache(clock, signed, opened, benign_errors=(LookupError,))
+    with pytest.raises(LookupError), cache.checkout("derived", "a.tif"):
+        raise LookupError("tile outside bounds")
+    assert not opened[0].closed
+    with pytest.raises(OSError), cache.checkout("derived", "a.tif"):
+        raise OSError("connection reset")
+    assert opened[0].closed
+    with cache.checkout("derived", "a.tif") as fresh:
+        assert fresh is opened[1]
+
+
+def test_lru_bound_closes_evicted_handles_and_sign_errors_surface():
+    clock, signed, opened = _Clock(), [], []
+    cache = _cache(clock, signed, opened, max_entries=2)
+    for key in ("a.tif", "b.tif", "c.tif"):
+        with cache.checkout("derived", key):
+            pass
+    assert opened[0].closed
+    assert cache.snapshot()["keys"] == 2
+
+    def broken(bucket, key, expires):
+        raise RuntimeError("no credentials")
+
+    with pytest.raises(PresignError):
+        DatasetHandleCache(broken, _Dataset).url("derived", "a.tif")
+    assert cache.clear() == 2
+    assert all(d.closed for d in opened)
+
+
+def test_a_new_object_version_retires_the_url_and_handles_of_the_old_one():
+    clock, signed, opened = _Clock(), [], []
+    cache = _cache(clock, signed, opened)
+
+    with cache.checkout("derived", "a.tif", "v1") as first:
+        pass
+    with cache.checkout("derived", "a.tif", "v1") as busy:
+        assert busy is first
+        with cache.checkout("derived", "a.tif", "v2") as rewritten:
+            assert rewritten is not first and rewritten.url.endswith("sig=2")
+        # A handle still busy on the old version is closed when it is returned.
+        assert not busy.closed
+    assert first.closed and not rewritten.closed
+    with cache.checkout("derived", "a.tif", "v2") as again:
+        assert again is rewritten
+    assert len(signed) == 2
@@ -0,0 +1,69 @@
+import io
+import zlib
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services.tiler import server as srv
+from services.tiler.etags import SourceETags
+from services.tiler.frame_cache import MERCATOR_HALF_EXTENT_M, Frame, FrameCache
+from services.tiler.handles import DatasetHandleCache
+from services.tiler.occupancy import OccupancyCache
+from services.tiler.render_pool import RenderPool
+from services.tiler.tile_cache import TileCache, TileKey
+
+TS = "20240501T120000Z"
+
+
+def _png_size(png):
+    return int.from_bytes(png[16:20], "big"), int.from_bytes(png[20:24], "big")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # One z7 tile, (29, 51), of valid reflectivity codes.
+    res = 2 * MERCATOR_HALF_EXTENT_M / (256 * 2**7)
+    left, top = -MERCATOR_HALF_EXTENT_M + 29 * 256 * res, MERCATOR_HALF_EXTENT_M - 51 * 256 * res
+    frame = Frame(np.full((256, 256), 140, dtype="uint8"), left, top, res, res, nodata=0, scale=0.5, offset=-33.0)
+    monkeypatch.setenv("S3_BUCKET_DERIVED", "derived")
+    monkeypatch.setattr(srv, "tile_cache", TileCache())
+    monkeypatch.setattr(srv, "source_etags", SourceETags(lambda bucket, key: f"etag-{key}"))
+    monkeypatch.setattr(srv, "render_pool", RenderPool(max_workers=2))
+    monkeypatch.setattr(srv, "dataset_handles", DatasetHandleCache(lambda b, k, e: f"https://minio/{b}/{k}", object))
+    monkeypatch.setattr(srv, "frame_cache", FrameCache(lambda bucket, key: frame))
+    monkeypatch.setattr(srv, "occupancy_cache", OccupancyCache(lambda bucket, key: None))
+    return TestClient(srv.app)
+
+
+def test_at_2x_urls_render_512_pixel_tiles(client):
+    small = client.get(f"/tiles/weather/nexrad-KTLX/{TS}/7/29/51.png")
+    large = client.get(f"/tiles/weather/nexrad-KTLX/{TS}/7/29/51@2x.png")
+    assert small.status_code == large.status_code == 200
+    assert _png_size(small.content) == (256, 256) and _png_size(large.content) == (512, 512)
+    assert client.get(f"/tiles/weather/nexrad-KTLX/{TS}/7/29/51@2x").headers["Content-Type"] == "image/png"
+    # Same tile as ?tilesize=512, so it is already cached.
+    again = client.get(f"/tiles/weather/nexrad-KTLX/{TS}/7/29/51.png", params={"tilesize": 512})
+    assert again.headers["X-Tile-Cache"] == "memory" and again.content == large.content
+    assert client.get(f"/tiles/weather/nexrad-KTLX/{TS}/7/29/51.png", params={"tilesize": 300}).status_code == 400
+
+
+def test_512_tile_one_zoom_out_covers_four_frame_tiles(client):
+    response = client.get(f"/tiles/data/nexrad-KTLX/{TS}/6/14/25.bin", params={"tilesize": 512})
+    assert response.headers["X-Data-Shape"] == "512,512"
+    codes = np.frombuffer(zlib.decompress(response.content), dtype="uint8").reshape(512, 512)
+    # The frame is the south-east quadrant of the z6 tile, at native resolution.
+    assert (codes[256:, 256:] == 140).all() and (codes[:256] == 0).all() and (codes[:, :256] == 0).all()
+
+
+def test_empty_and_stacked_512_tiles(client):
+    image = pytest.importorskip("PIL.Image")
+    empty = client.get(f"/tiles/weather/goes-c13/{TS}/3/0/0@2x.png")
+    assert empty.headers["X-Tile-Cache"] == "empty" and _png_size(empty.content) == (512, 512)
+    stack = client.get("/tiles/stack/nexrad-KTLX/7/29/51.apng", params={"timestamps": TS, "tilesize": 512})
+    assert image.open(io.BytesIO(stack.content)).size == (512, 512)
+
+
+def test_512_tiles_are_stored_under_their_own_name():
+    assert TileKey("nexrad-KTLX", TS, 7, 29, 51).object_name.endswith("/default_auto.png")
+    assert TileKey("nexrad-KTLX", TS, 7, 29, 51, tile_size=512).object_name.endswith("/default_auto@512.png")
@@ -0,0 +1,56 @@
+import struct
+import zlib
+
+import numpy as np
+
+from services.common.colormaps import NEXRAD_REFLECTIVITY, colormap_for, get_colormap
+from services.tiler.png import encode_indexed_png
+
+
+def _chunks(png):
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+    pos, chunks = 8, {}
+    while pos < len(png):
+        (length,) = struct.unpack(">I", png[pos : pos + 4])
+        tag, payload = png[pos + 4 : pos + 8], png[pos + 8 : pos + 8 + length]
+        (crc,) = struct.unpack(">I", png[pos + 8 + length : pos + 12 + length])
+        assert crc == zlib.crc32(tag + payload)
+        chunks[tag] = payload
+        pos += 12 + length
+    return chunks
+
+
+def test_indexed_png_round_trips_indices_and_palette():
+    indices = (np.arange(64 * 32) % 256).astype("uint8").reshape(32, 64)
+    palette = NEXRAD_REFLECTIVITY.palette(-30.0, 80.0)
+    chunks = _chunks(encode_indexed_png(indices, palette))
+
+    width, height, depth, color_type = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    assert (width, height, depth, color_type) == (64, 32, 8, 3)
+    assert chunks[b"PLTE"] == palette[:, :3].tobytes()
+    # Trailing opaque entries are implied, so tRNS stops at the last translucent index.
+    last_clear = int(np.flatnonzero(palette[:, 3] < 255)[-1])
+    assert chunks[b"tRNS"] == palette[: last_clear + 1, 3].tobytes()
+    rows = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype="uint8").reshape(32, 65)
+    assert not rows[:, 0].any()
+    np.testing.assert_array_equal(rows[:, 1:], indices)
+
+
+def test_reflectivity_palette_is_clear_below_5_dbz_and_stepped():
+    palette = NEXRAD_REFLECTIVITY.palette(-30.0, 80.0)
+    assert palette[0].tolist() == [0, 0, 0, 0]
+
+    def color(dbz):
+        return palette[1 + round((dbz + 30) / 110 * 254)].tolist()
+
+    assert color(0.0)[3] == 0
+    assert color(7.0) == [0x04, 0xE9, 0xE7, 255]
+    assert color(52.0) == [0xFD, 0x00, 0x00, 255]
+
+
+def test_goes_styles_share_one_ramp_in_different_units():
+    kelvin, celsius = colormap_for("goes-c13"), colormap_for("goes-c13", "celsius")
+    assert (kelvin.units, celsius.units) == ("K", "°C")
+    np.testing.assert_array_equal(kelvin.colors_at([220.0]), celsius.colors_at([220.0 - 273.15]))
+    assert get_colormap("goes_ir_fahrenheit").legend()["range"] == [-135.67, 134.33]
+    assert colormap_for("nexrad-KTLX") is NEXRAD_REFLECTIVITY
@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services.tiler import server as srv
+from services.tiler.etags import SourceETags
+from services.tiler.frame_cache import MERCATOR_HALF_EXTENT_M, Frame, FrameCache
+from services.tiler.handles import DatasetHandleCache
+from services.tiler.mosaic import MosaicIndex, SiteFrames, composite, members_digest, range_rank, select_members
+from services.tiler.occupancy import OccupancyCache
+from services.tiler.render_pool import RenderPool
+from services.tiler.tile_cache import TileCache
+
+T0, T1, T2 = "20240501T120000Z", "20240501T120500Z", "20240501T121000Z"
+# Two overlapping radars around z7 tile (29, 51) and one far away.
+KTLX = SiteFrames("KTLX", (-100.0, 32.0, -94.0, 38.0), (T0, T1, T2))
+KINX = SiteFrames("KINX", (-98.0, 33.0, -93.0, 39.0), (T0,))
+KATX = SiteFrames("KATX", (-125.0, 45.0, -119.0, 51.0), (T2,))
+
+
+def test_select_members_picks_covering_sites_nearest_in_time():
+    members = select_members([KTLX, KINX, KATX], "20240501T120400Z", 7, 29, 51, timedelta(minutes=10))
+    assert [(s.site, t) for s, t in members] == [("KTLX", T1), ("KINX", T0)]
+    strict = select_members([KTLX, KINX], "20240501T120900Z", 7, 29, 51, timedelta(minutes=5))
+    assert [(s.site, t) for s, t in strict] == [("KTLX", T2)]
+    latest = select_members([KTLX, KINX], "latest", 7, 29, 51, timedelta(minutes=5))
+    assert [(s.site, t) for s, t in latest] == [("KTLX", T2)]
+    assert members_digest(members) == members_digest(members[::-1])
+    # Ingestion keys frames without the "T" separator.
+    ingested = SiteFrames("KTLX", KTLX.bbox, ("20240501120000Z", "20240501120500Z"))
+    assert select_members([ingested], "20240501T120400Z", 7, 29, 51, timedelta(minutes=10))[0][1] == "20240501120500Z"
+    with pytest.raises(ValueError):
+        select_members([KTLX], "yesterday", 7, 29, 51, timedelta(minutes=10))
+
+
+def test_composite_max_and_nearest_rules():
+    a = (np.array([[10.0, 40.0], [0.0, 0.0]], dtype="float32"), np.array([[True, True], [False, False]]))
+    b = (np.array([[30.0, 20.0], [25.0, 0.0]], dtype="float32"), np.array([[True, True], [True, False]]))
+    values, mask = composite([a, b], "max")
+    assert values[0].tolist() == [30.0, 40.0] and values[1, 0] == 25.0 and np.isnan(values[1, 1])
+    assert mask.tolist() == [[255, 255], [255, 0]]
+    # Layer a is nearer in the left column, b in the right one.
+    ranks = [np.array([[1.0, 5.0], [1.0, 5.0]]), np.array([[5.0, 1.0], [5.0, 1.0]])]
+    values, _ = composite([a, b], "nearest", ranks)
+    assert values[0].tolist() == [10.0, 20.0] and values[1, 0] == 25.0
+    rank = range_rank(KTLX.center, 7, 29, 51, 4)
+    assert rank.shape == (4, 4)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    res = 2 * MERCATOR_HALF_EXTENT_M / (256 * 2**7)
+    left, top = -MERCATOR_HALF_EXTENT_M + 29 * 256 * res, MERCATOR_HALF_EXTENT_M - 51 * 256 * res
+    west = np.zeros((256, 256), dtype="uint8")
+    west[:, :160] = 120  # 27 dBZ
+    east = np.zeros((256, 256), dtype="uint8")
+    east[:, 96:] = 140  # 37 dBZ
+    frames = {"KTLX": west, "KINX": east}
+    loads = []
+
+    def loader(bucket, key):
+        loads.append(key)
+        return Frame(frames[key.split("/")[1]], left, top, res, res, nodata=0, scale=0.5, offset=-33.0)
+
+    monkeypatch.setenv("S3_BUCKET_DERIVED", "derived")
+    monkeypatch.setattr(srv, "tile_cache", TileCache())
+    monkeypatch.setattr(srv, "source_etags", SourceETags(lambda bucket, key: f"etag-{key}"))
+    monkeypatch.setattr(srv, "render_pool", RenderPool(max_workers=2))
+    monkeypatch.setattr(srv, "dataset_handles", DatasetHandleCache(lambda b, k, e: f"https://minio/{b}/{k}", object))
+    monkeypatch.setattr(srv, "frame_cache", FrameCache(loader))
+    monkeypatch.setattr(srv, "occupancy_cache", OccupancyCache(lambda bucket, key: None))
+    monkeypatch.setattr(srv, "mosaic_index", MosaicIndex(lambda bucket: [KTLX, KINX, KATX]))
+    test_client = TestClient(srv.app)
+    test_client.frame_loads = loads
+    return test_client
+
+
+def test_mosaic_tile_composites_covering_sites(client, monkeypatch):
+    captured = {}
+    real = srv._tile_to_index
+
+    def spy(data, mask, lo, hi, **kwargs):
+        captured["values"], captured["mask"] = np.asarray(data), np.asarray(mask)
+        return real(data, mask, lo, hi, **kwargs)
+
+    monkeypatch.setattr(srv, "_tile_to_index", spy)
+    url = f"/tiles/weather/nexrad-mosaic/{T0}/7/29/51.png"
+    response = client.get(url)
+    assert response.status_code == 200 and response.headers["X-Tile-Cache"] == "miss"
+    assert response.headers["X-Mosaic-Sites"] == f"KTLX:{T0},KINX:{T0}"
+    values = captured["values"]
+    assert values[0, 0] == pytest.approx(27.0) and values[0, 255] == pytest.approx(37.0)
+    assert values[0, 128] == pytest.approx(37.0)  # overlap: maximum wins
+    assert captured["mask"].all()
+    assert sorted(client.frame_loads) == [
+        f"nexrad/KINX/{T0}/tilt0_reflectivity.tif",
+        f"nexrad/KTLX/{T0}/tilt0_reflectivity.tif",
+    ]
+
+    assert client.get(url).headers["X-Tile-Cache"] == "memory"
+    # No radar covers this tile.
+    assert client.get(f"/tiles/weather/nexrad-mosaic/{T0}/7/0/0.png").headers["X-Tile-Cache"] == "empty"
+
+
+def test_mosaic_latest_is_short_lived_and_other_endpoints_reject_it(client, monkeypatch):
+    monkeypatch.setattr(srv, "MOSAIC_MAX_SKEW", timedelta(minutes=5))
+    response = client.get("/tiles/weather/nexrad-mosaic/latest/7/29/51.png")
+    assert response.headers["X-Mosaic-Sites"] == f"KTLX:{T2}"
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+    assert client.get("/tiles/weather/nexrad-mosaic/yesterday/7/29/51.png").status_code == 400
+    assert client.get(f"/tiles/data/nexrad-mosaic/{T0}/7/29/51.bin").status_code == 400
+    assert client.get("/tiles/point/nexrad-mosaic", params={"points": "-97,35"}).status_code == 400
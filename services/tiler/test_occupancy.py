@@ -0,0 +1,129 @@
+import base64
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services.tiler import server as srv
+from services.tiler.datasets import lookup, tile_outside
+from services.tiler.etags import SourceETags
+from services.tiler.frame_cache import FrameCache
+from services.tiler.handles import DatasetHandleCache
+from services.tiler.occupancy import OccupancyCache, TileOccupancy
+from services.tiler.render_pool import RenderPool
+from services.tiler.tile_cache import TileCache
+
+TS = "20240501T120000Z"
+
+
+def _document(bits, x0=28, y0=48, zoom=7, bbox=(-102.0, 30.0, -92.0, 40.0)):
+    bits = np.asarray(bits, dtype=bool)
+    window = {
+        "x0": x0,
+        "y0": y0,
+        "width": bits.shape[1],
+        "height": bits.shape[0],
+        "bits": base64.b64encode(np.packbits(bits, axis=None).tobytes()).decode(),
+    }
+    return {"version": 1, "bbox": list(bbox), "valid_pixels": int(bits.sum()), "zooms": {str(zoom): window}}
+
+
+def test_registry_resolves_fixed_and_per_site_datasets():
+    spec, site = lookup("nexrad-ktlx")
+    assert site == "KTLX"
+    assert spec.key(TS, site) == f"nexrad/KTLX/{TS}/tilt0_reflectivity.tif"
+    assert spec.occupancy_key(TS, site) == f"nexrad/KTLX/{TS}/tilt0_occupancy.json"
+    assert spec.index_key(site) == "indices/radar/nexrad/KTLX/frames.json"
+    assert lookup("mrms-reflq")[0].index_key() == "indices/radar/mrms/reflq/frames.json"
+    assert lookup("goes-c13")[0].index_key() is None
+    assert lookup("goes-c13")[0].temperature and lookup("goes-c13")[1] is None
+    assert lookup("nexrad") is None and lookup("unknown-x") is None
+    goes_bounds = lookup("goes-c13")[0].bounds
+    assert tile_outside(goes_bounds, 3, 0, 0)
+    assert not tile_outside(goes_bounds, 3, 1, 3)
+
+
+def test_is_empty_uses_bits_footprint_and_ancestors():
+    occupancy = TileOccupancy.from_json(json.dumps(_document([[0, 1], [0, 0]])))
+    assert occupancy.is_empty(7, 29, 48) is False
+    assert occupancy.is_empty(7, 28, 48) is True
+    assert occupancy.is_empty(7, 28, 49) is True
+    assert occupancy.is_empty(7, 0, 0) is True  # outside the footprint
+    assert occupancy.is_empty(8, 56, 96) is True  # child of an empty tile
+    assert occupancy.is_empty(8, 58, 96) is None  # child of an occupied tile: unknown
+    assert occupancy.is_empty(6, 14, 24) is None  # no bitmap at this zoom
+
+
+def test_occupancy_cache_remembers_missing_documents():
+    calls = []
+
+    def loader(bucket, key):
+        calls.append(key)
+        raise OSError("NoSuchKey")
+
+    cache = OccupancyCache(loader, max_entries=2)
+    assert cache.peek("derived", "a") == (False, None)
+    assert cache.get("derived", "a") is None
+    assert cache.get("derived", "a") is None
+    assert calls == ["a"] and cache.peek("derived", "a") == (True, None)
+    assert cache.snapshot()["missing"] == 1
+
+
+@pytest.fixture
+def client(monkeypatch):
+    loads = []
+
+    def frame_loader(bucket, key):
+        loads.append(key)
+        raise OSError("COG must not be read for empty tiles")
+
+    document = json.dumps(_document([[0, 1], [0, 0]])).encode()
+    monkeypatch.setenv("S3_BUCKET_DERIVED", "derived")
+    monkeypatch.setattr(srv, "tile_cache", TileCache())
+    monkeypatch.setattr(srv, "source_etags", SourceETags(lambda bucket, key: f"etag-{key}"))
+    monkeypatch.setattr(srv, "render_pool", RenderPool(max_workers=2))
+    monkeypatch.setattr(srv, "dataset_handles", DatasetHandleCache(lambda b, k, e: f"https://minio/{b}/{k}", object))
+    monkeypatch.setattr(srv, "frame_cache", FrameCache(frame_loader))
+    monkeypatch.setattr(srv, "occupancy_cache", OccupancyCache(lambda bucket, key: document))
+    test_client = TestClient(srv.app)
+    test_client.frame_loads = loads
+    return test_client
+
+
+def test_empty_tiles_skip_the_cog(client, monkeypatch):
+    first = client.get(f"/tiles/weather/nexrad-KTLX/{TS}/7/28/48.png")
+    assert first.status_code == 200 and first.headers["X-Tile-Cache"] == "empty"
+    assert first.content.startswith(b"\x89PNG")
+    # The occupancy document is now cached, so the event loop answers directly.
+    assert client.get(f"/tiles/weather/nexrad-KTLX/{TS}/9/0/0.png").headers["X-Tile-Cache"] == "empty"
+    # Static bounds need no occupancy at all.
+    assert client.get(f"/tiles/weather/goes-c13/{TS}/3/0/0.png").headers["X-Tile-Cache"] == "empty"
+    assert client.frame_loads == []
+
+    assert client.get(f"/tiles/weather/nexrad-KTLX/{TS}/7/29/48.png").status_code == 500
+    assert client.frame_loads == [f"nexrad/KTLX/{TS}/tilt0_reflectivity.tif"]
+
+    monkeypatch.setattr(srv, "EMPTY_TILE_MODE", "204")
+    response = client.get(f"/tiles/weather/nexrad-KTLX/{TS}/7/28/48.png")
+    assert response.status_code == 204 and response.content == b""
+
+
+def test_stack_frames_of_empty_tiles_are_transparent(client):
+    response = client.get("/tiles/stack/nexrad-KTLX/7/28/48.bin", params={"timestamps": TS})
+    assert response.status_code == 200 and "X-Stack-Missing" not in response.headers
+    assert client.frame_loads == []
+
+
+def test_a_render_checks_occupancy_once(client, monkeypatch):
+    checks = []
+    is_empty = srv._is_empty_tile
+
+    def recording(key, bucket, *, load):
+        checks.append(load)
+        return is_empty(key, bucket, load=load)
+
+    monkeypatch.setattr(srv, "_is_empty_tile", recording)
+    assert client.get(f"/tiles/weather/nexrad-KTLX/{TS}/7/29/48.png").status_code == 500
+    # Once on the event loop from cache only, once loading before the render.
+    assert checks == [False, True]
@@ -0,0 +1,90 @@
+import math
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services.tiler import server as srv
+from services.tiler.etags import SourceETags
+from services.tiler.frame_cache import MERCATOR_HALF_EXTENT_M, Frame, FrameCache
+from services.tiler.handles import DatasetHandleCache
+from services.tiler.render_pool import RenderPool
+from services.tiler.tile_cache import TileCache
+
+TIMES = ["20240501T120000Z", "20240501T120500Z", "20240501T121000Z"]
+RES = 2 * MERCATOR_HALF_EXTENT_M / (256 * 2**7)
+LEFT, TOP = -MERCATOR_HALF_EXTENT_M + 29 * 256 * RES, MERCATOR_HALF_EXTENT_M - 51 * 256 * RES
+
+
+def _lonlat(col, row):
+    mx, my = LEFT + (col + 0.5) * RES, TOP - (row + 0.5) * RES
+    lon = math.degrees(mx / 6378137.0)
+    lat = math.degrees(2 * math.atan(math.exp(my / 6378137.0)) - math.pi / 2)
+    return lon, lat
+
+
+def _frame(code):
+    data = np.full((256, 256), code, dtype="uint8")
+    data[:, :128] = 0  # west half is no-data
+    return Frame(data, LEFT, TOP, RES, RES, nodata=0, scale=0.5, offset=-33.0)
+
+
+def test_frame_sample_applies_scale_and_nodata():
+    frame = _frame(100)
+    assert frame.sample(*_lonlat(200, 10)) == pytest.approx(17.0)
+    assert frame.sample(*_lonlat(10, 10)) is None
+    assert frame.sample(0.0, 0.0) is None
+    assert frame.sample(0.0, 89.0) is None
+
+
+@pytest.fixture
+def client(monkeypatch):
+    frames = {t: _frame(100 + 10 * i) for i, t in enumerate(TIMES)}
+    loads = []
+
+    def loader(bucket, key):
+        loads.append(key)
+        timestamp = key.split("/")[2]
+        if timestamp not in frames:
+            raise OSError(f"{key} not found")
+        return frames[timestamp]
+
+    monkeypatch.setenv("S3_BUCKET_DERIVED", "derived")
+    monkeypatch.setattr(srv, "tile_cache", TileCache())
+    monkeypatch.setattr(srv, "source_etags", SourceETags(lambda bucket, key: f"etag-{key}"))
+    monkeypatch.setattr(srv, "render_pool", RenderPool(max_workers=2))
+    monkeypatch.setattr(srv, "dataset_handles", DatasetHandleCache(lambda b, k, e: f"https://minio/{b}/{k}", object))
+    monkeypatch.setattr(srv, "frame_cache", FrameCache(loader))
+    monkeypatch.setattr(srv, "_indexed_frame_timestamps", lambda bucket, index_key: TIMES)
+    test_client = TestClient(srv.app)
+    test_client.frame_loads = loads
+    return test_client
+
+
+def test_point_series_over_indexed_frames(client):
+    inside, empty = _lonlat(200, 10), _lonlat(10, 10)
+    points = ";".join(f"{lon},{lat}" for lon, lat in (inside, empty))
+    response = client.get("/tiles/point/nexrad-KTLX", params={"points": points, "limit": 3})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["timestamps"] == TIMES and body["units"] == "dBZ" and body["missing"] == []
+    assert body["points"][0]["values"] == [17.0, 22.0, 27.0]
+    assert body["points"][1]["values"] == [None, None, None]
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+    # Each frame is loaded once and then sampled from memory.
+    assert len(client.frame_loads) == 3
+
+
+def test_point_series_reports_missing_frames_and_validates_input(client):
+    lon, lat = _lonlat(200, 10)
+    response = client.get(
+        "/tiles/point/nexrad-KTLX", params={"points": f"{lon},{lat}", "timestamps": f"{TIMES[0]},20240501T999999Z"}
+    )
+    assert response.json()["missing"] == ["20240501T999999Z"]
+    assert response.json()["points"][0]["values"] == [17.0]
+
+    assert client.get("/tiles/point/nexrad-KTLX", params={"points": "abc"}).status_code == 400
+    assert client.get("/tiles/point/nexrad-KTLX", params={"points": "200,10"}).status_code == 400
+    too_many = ";".join(["-97,35"] * (srv.POINT_MAX_POINTS + 1))
+    assert client.get("/tiles/point/nexrad-KTLX", params={"points": too_many}).status_code == 400
+    assert client.get("/tiles/point/goes-c13", params={"points": "-97,35"}).status_code == 400
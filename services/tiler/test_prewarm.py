@@ -0,0 +1,148 @@
+import base64
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services.tiler import server as srv
+from services.tiler.etags import SourceETags
+from services.tiler.frame_cache import MERCATOR_HALF_EXTENT_M, Frame, FrameCache
+from services.tiler.handles import DatasetHandleCache
+from services.tiler.occupancy import OccupancyCache, TileOccupancy
+from services.tiler.prewarm import Prewarmer, PrewarmJob, bounds_tiles, occupied_tiles
+from services.tiler.render_pool import RenderPool
+from services.tiler.tile_cache import TileCache, TileKey
+
+TS = "20240501120500Z"
+
+
+def _document(bits, x0=28, y0=50, zoom=7, bbox=(-102.0, 30.0, -92.0, 40.0)):
+    bits = np.asarray(bits, dtype=bool)
+    window = {
+        "x0": x0,
+        "y0": y0,
+        "width": bits.shape[1],
+        "height": bits.shape[0],
+        "bits": base64.b64encode(np.packbits(bits, axis=None).tobytes()).decode(),
+    }
+    return {"version": 1, "bbox": list(bbox), "valid_pixels": int(bits.sum()), "zooms": {str(zoom): window}}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    res = 2 * MERCATOR_HALF_EXTENT_M / (256 * 2**7)
+    left, top = -MERCATOR_HALF_EXTENT_M + 29 * 256 * res, MERCATOR_HALF_EXTENT_M - 51 * 256 * res
+    frame = Frame(np.full((256, 256), 140, dtype="uint8"), left, top, res, res, nodata=0, scale=0.5, offset=-33.0)
+    document = json.dumps(_document([[0, 0], [0, 1]])).encode()
+    submitted = []
+
+    class _Prewarmer(Prewarmer):
+        def submit(self, job):
+            submitted.append(job)
+            return job.timestamp != "20240501121000Z"
+
+    monkeypatch.setenv("S3_BUCKET_DERIVED", "derived")
+    monkeypatch.setattr(srv, "tile_cache", TileCache())
+    monkeypatch.setattr(srv, "source_etags", SourceETags(lambda bucket, key: f"etag-{key}"))
+    monkeypatch.setattr(srv, "render_pool", RenderPool(max_workers=2))
+    monkeypatch.setattr(srv, "dataset_handles", DatasetHandleCache(lambda b, k, e: f"https://minio/{b}/{k}", object))
+    monkeypatch.setattr(srv, "frame_cache", FrameCache(lambda bucket, key: frame))
+    monkeypatch.setattr(srv, "occupancy_cache", OccupancyCache(lambda bucket, key: document))
+    monkeypatch.setattr(srv, "prewarmer", _Prewarmer(srv._prewarm_plan, srv._prewarm_tile))
+    monkeypatch.setattr(srv, "PREWARM_TOKEN", "secret")
+    test_client = TestClient(srv.app)
+    test_client.submitted = submitted
+    return test_client
+
+
+def test_prewarm_endpoint_validates_and_queues_frames(client):
+    body = {"dataset": "nexrad-KTLX", "timestamps": [TS]}
+    assert client.post("/tiles/prewarm", json=body).status_code == 403
+    headers = {"X-Prewarm-Token": "secret"}
+    response = client.post("/tiles/prewarm", json=body, headers=headers)
+    assert response.status_code == 202 and response.json()["queued"] == [TS]
+    assert client.submitted == [PrewarmJob("nexrad-KTLX", TS)]
+
+    assert client.post("/tiles/prewarm", json={"dataset": "nope", "timestamps": [TS]}, headers=headers).status_code == 404
+    mosaic = {"dataset": "nexrad-mosaic", "timestamps": [TS]}
+    assert client.post("/tiles/prewarm", json=mosaic, headers=headers).status_code == 400
+    full = {"dataset": "nexrad-KTLX", "timestamps": ["20240501121000Z"]}
+    assert client.post("/tiles/prewarm", json=full, headers=headers).status_code == 503
+
+
+def test_prewarmed_tiles_are_the_ones_the_frontend_loads(client, monkeypatch):
+    rendered = []
+    produce = srv._produce_tile
+
+    def recording(key, *args):
+        rendered.append(key)
+        return produce(key, *args)
+
+    monkeypatch.setattr(srv, "_produce_tile", recording)
+    job = PrewarmJob("nexrad-KTLX", TS)
+    assert srv._prewarm_plan(job) == [(7, 29, 51)]
+    srv.prewarmer.run_job(job)
+    assert srv.prewarmer.stats["tiles"] == 1 and srv.prewarmer.stats["errors"] == 0
+    # BasemapView requests {y}@2x.png with tileSize 512.
+    frontend = TileKey("nexrad-KTLX", TS, 7, 29, 51, "default", None, "png", 512)
+    assert [key.object_name for key in rendered] == [frontend.object_name]
+    response = client.get(f"/tiles/weather/nexrad-KTLX/{TS}/7/29/51@2x.png")
+    assert response.status_code == 200 and response.headers["X-Tile-Cache"] == "memory"
+    assert response.headers["ETag"]
+
+
+def test_tile_planning():
+    occupancy = TileOccupancy.from_json(_document([[1, 0], [0, 1]]))
+    assert list(occupied_tiles(occupancy, 3, 7)) == [(7, 28, 50), (7, 29, 51)]
+    assert list(occupied_tiles(occupancy, 3, 6)) == []
+    tiles = list(bounds_tiles((-102.0, 30.0, -92.0, 40.0), 4, 5))
+    assert tiles == [(4, 3, 6), (5, 6, 12), (5, 7, 12), (5, 6, 13), (5, 7, 13)]
+
+
+def test_prewarmer_paces_renders_and_yields_to_live_requests():
+    now = [0.0]
+    sleeps = []
+    busy = [2]
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    def is_busy():
+        busy[0] -= 1
+        return busy[0] > 0
+
+    rendered = []
+    prewarmer = Prewarmer(
+        lambda job: [(3, 1, 2), (3, 2, 2), (3, 2, 3)],
+        lambda job, z, x, y: rendered.append((z, x, y)) if x != 2 or y != 3 else 1 / 0,
+        rate=4.0,
+        busy=is_busy,
+        busy_backoff=0.5,
+        clock=lambda: now[0],
+        sleep=sleep,
+    )
+    prewarmer.run_job(PrewarmJob("goes-c13", "20240501T120000Z"))
+    assert rendered == [(3, 1, 2), (3, 2, 2)]
+    # One backoff while the live pool was busy, then one render every 1/rate seconds.
+    assert sleeps == [0.5, 0.25, 0.25]
+    assert prewarmer.snapshot() == {
+        "frames": 1, "tiles": 2, "errors": 1, "rejected": 0, "paused": 1, "queued": 0, "workers": 0
+    }
+
+
+def test_prewarmer_deduplicates_and_bounds_its_queue():
+    prewarmer = Prewarmer(lambda job: [], lambda job, z, x, y: None, workers=0, max_queued=1)
+    job = PrewarmJob("nexrad-KTLX", TS)
+    assert prewarmer.submit(job) and prewarmer.submit(job)
+    assert not prewarmer.submit(PrewarmJob("nexrad-KTLX", "20240501121000Z"))
+    assert prewarmer.snapshot()["queued"] == 1 and prewarmer.stats["rejected"] == 1
+
+
+def test_prewarmer_workers_share_their_counters():
+    prewarmer = Prewarmer(lambda job: [(3, x, 2) for x in range(50)], lambda job, z, x, y: None, workers=4, rate=0)
+    for minute in range(8):
+        assert prewarmer.submit(PrewarmJob("nexrad-KTLX", f"202405011{minute:02d}000Z"))
+    prewarmer._queue.join()
+    assert prewarmer.snapshot()["frames"] == 8 and prewarmer.stats["tiles"] == 400
@@ -0,0 +1,45 @@
+import numpy as np
+
+from services.tiler import server as srv
+from services.tiler.tile_cache import TileKey
+
+
+def test_uint8_codes_render_like_decoded_floats():
+    codes = np.arange(256, dtype="uint8").reshape(1, 16, 16)
+    values = codes.astype("float64") * 0.5 - 33.0
+    expected = (np.rint(np.clip((values[0] + 30) / 110, 0, 1) * 254) + 1).astype("uint8")
+    out = srv._tile_to_index(codes, None, -30.0, 80.0, scale=0.5, offset=-33.0)
+    assert out.dtype == np.uint8 and out.shape == (16, 16)
+    np.testing.assert_array_equal(out, expected)
+
+
+def test_uint16_codes_apply_temperature_style_in_lut():
+    codes = np.array([[[0, 18000, 65535]]], dtype="uint16")
+    kelvin = codes * 0.01 + 150.0
+    celsius_range = srv._temp_rescale_for_style((180.0, 330.0), "celsius")
+    out = srv._tile_to_index(codes, None, *celsius_range, scale=0.01, offset=150.0, style="celsius")
+    expected = srv._tile_to_index(kelvin, None, *celsius_range, style="celsius")
+    np.testing.assert_array_equal(out, expected)
+
+
+def test_float_tiles_are_rescaled_and_masked_pixels_are_nodata():
+    data = np.array([[[-30.0, 25.0, 80.0, 200.0]]], dtype="float32")
+    mask = np.array([[255, 255, 255, 0]], dtype="uint8")
+    out = srv._tile_to_index(data, mask, -30.0, 80.0)
+    assert out.tolist() == [[1, 128, 255, 0]]
+
+
+def test_styles_apply_only_to_temperature_datasets(monkeypatch):
+    kelvin = np.full((1, 4, 4), 250.0, dtype="float32")
+    monkeypatch.setattr(srv, "_read_tile", lambda key, bucket, s3_key: (kelvin, None, None, None, None))
+    monkeypatch.setattr(srv, "occupancy_cache", None)
+    lo, hi = srv._temp_rescale_for_style((180.0, 330.0), "celsius")
+    goes = TileKey("goes-c13", "20240501T120000Z", 3, 1, 3, "celsius")
+    indices, palette = srv._render_indices(goes, "derived", "key", f"{lo},{hi}")
+    np.testing.assert_array_equal(indices, srv._tile_to_index(kelvin, None, lo, hi, style="celsius"))
+    np.testing.assert_array_equal(palette, srv._palette("goes_ir_celsius", lo, hi))
+
+    nexrad = TileKey("nexrad-KTLX", "20240501T120000Z", 3, 1, 3, "celsius")  # style ignored
+    indices, palette = srv._render_indices(nexrad, "derived", "key", "-30,80")
+    np.testing.assert_array_equal(indices, srv._tile_to_index(kelvin, None, -30.0, 80.0))
+    np.testing.assert_array_equal(palette, srv._palette("nexrad_reflectivity", -30.0, 80.0))
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services.tiler import server as srv
+from services.tiler.etags import SourceETags
+from services.tiler.render_pool import PoolSaturated, RenderPool
+from services.tiler.tile_cache import TileCache
+
+
+def test_identical_inflight_renders_are_coalesced():
+    pool = RenderPool(max_workers=2, max_queued=0)
+    release = threading.Event()
+    calls = []
+
+    def render(tile):
+        calls.append(tile)
+        release.wait(5)
+        return f"png-{tile}"
+
+    async def burst():
+        waiters = [asyncio.create_task(pool.run("7/29/50", render, "7/29/50")) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(burst()) == ["png-7/29/50"] * 5
+    assert calls == ["7/29/50"]
+    assert pool.snapshot() == {"renders": 1, "coalesced": 4, "rejected": 0, "in_flight": 0, "capacity": 2}
+
+
+def test_saturated_pool_rejects_new_tiles_but_joins_inflight_ones():
+    pool = RenderPool(max_workers=1, max_queued=0)
+    release = threading.Event()
+
+    async def burst():
+        first = asyncio.create_task(pool.run("a", release.wait, 5))
+        await asyncio.sleep(0)
+        with pytest.raises(PoolSaturated):
+            await pool.run("b", release.wait, 5)
+        joined = asyncio.create_task(pool.run("a", release.wait, 5))
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(first, joined)
+
+    assert asyncio.run(burst()) == [True, True]
+    assert pool.stats["rejected"] == 1
+
+
+def test_route_sheds_load_with_503_when_saturated(monkeypatch):
+    monkeypatch.setenv("S3_BUCKET_DERIVED", "derived")
+    monkeypatch.setattr(srv, "tile_cache", TileCache())
+    monkeypatch.setattr(srv, "source_etags", SourceETags(lambda bucket, key: f"etag-{key}"))
+    pool = RenderPool(max_workers=1, max_queued=0)
+    pool._capacity = 0  # noqa: SLF001 - every new render is rejected
+    monkeypatch.setattr(srv, "render_pool", pool)
+    client = TestClient(srv.app)
+
+    response = client.get("/tiles/weather/nexrad-KTLX/20240501T120000Z/7/29/50.png")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert client.get("/tiles/cache/stats").json()["render"]["rejected"] == 1
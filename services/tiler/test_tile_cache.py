@@ -0,0 +1,112 @@
+import asyncio
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+from services.tiler import server as srv
+from services.tiler.etags import SourceETags
+from services.tiler.tile_cache import TileCache, TileKey
+
+
+class _MemoryStore:
+    def __init__(self):
+        self.blobs = {}
+
+    def load(self, name):
+        return self.blobs.get(name)
+
+    def save(self, name, payload, content_type):
+        self.blobs[name] = payload
+
+    def delete_prefix(self, prefix):
+        doomed = [n for n in self.blobs if n.startswith(prefix)]
+        for n in doomed:
+            del self.blobs[n]
+        return len(doomed)
+
+    def enforce_limits(self, max_bytes, max_age):
+        return 0
+
+
+def _key(ts="20240501T120000Z", x=1, dataset="nexrad-KTLX"):
+    return TileKey(dataset, ts, 7, x, 2)
+
+
+def test_memory_lru_is_bounded_by_bytes():
+    cache = TileCache(max_memory_bytes=25)
+    for x in range(3):
+        cache.put(_key(x=x), b"x" * 10)
+    assert cache.get(_key(x=0)) is None
+    assert cache.get(_key(x=2)) == (b"x" * 10, "memory")
+    assert cache.memory_bytes == 20
+    assert cache.stats["evictions"] == 1
+
+
+def test_store_tier_survives_a_fresh_process_and_purges_by_timestamp():
+    store = _MemoryStore()
+    cache = TileCache(store=store)
+    cache.put(_key(), b"png-a")
+    cache.put(_key(ts="20240501T121000Z"), b"png-b")
+    cache._background.shutdown(wait=True)  # noqa: SLF001 - flush background writes
+    assert len(store.blobs) == 2
+
+    fresh = TileCache(store=store)
+    assert fresh.get(_key()) == (b"png-a", "store")
+    assert fresh.get(_key()) == (b"png-a", "memory")
+
+    removed = fresh.purge("nexrad-KTLX", "20240501T120000Z")
+    assert removed == {"memory": 1, "store": 1}
+    assert fresh.get(_key()) is None
+    assert fresh.get(_key(ts="20240501T121000Z")) == (b"png-b", "store")
+    assert fresh.purge("nexrad-KTLX") == {"memory": 1, "store": 1}
+    assert store.blobs == {}
+
+
+def test_background_sweep_enforces_store_limits():
+    calls = []
+
+    class _Store(_MemoryStore):
+        def enforce_limits(self, max_bytes, max_age):
+            calls.append((max_bytes, max_age))
+            return 3
+
+    cache = TileCache(store=_Store(), store_max_bytes=1000, sweep_interval_s=0.0)
+    cache.put(_key(), b"png")
+    cache._background.shutdown(wait=True)  # noqa: SLF001
+    assert calls == [(1000, timedelta(days=2))]
+
+
+class _LoopRecordingStore(_MemoryStore):
+    """Records whether store deletes run on the event loop thread."""
+
+    def delete_prefix(self, prefix):
+        try:
+            asyncio.get_running_loop()
+            self.deleted_on_loop = True
+        except RuntimeError:
+            self.deleted_on_loop = False
+        return super().delete_prefix(prefix)
+
+
+def test_route_serves_cached_tiles_and_purges(monkeypatch):
+    store = _LoopRecordingStore()
+    monkeypatch.setenv("S3_BUCKET_DERIVED", "derived")
+    monkeypatch.setattr(srv, "tile_cache", TileCache(store=store))
+    monkeypatch.setattr(srv, "source_etags", SourceETags(lambda bucket, key: f"etag-{key}"))
+    monkeypatch.setattr(srv, "TILE_CACHE_PURGE_TOKEN", "secret")
+    srv.tile_cache.put(TileKey("nexrad-KTLX", "20240501T120000Z", 7, 29, 50), b"\x89PNG-cached")
+    client = TestClient(srv.app)
+
+    response = client.get("/tiles/weather/nexrad-KTLX/20240501T120000Z/7/29/50.png")
+    assert response.status_code == 200
+    assert response.content == b"\x89PNG-cached"
+    assert response.headers["X-Tile-Cache"] == "memory"
+    assert client.get("/tiles/cache/stats").json()["memory_hits"] == 1
+
+    assert client.delete("/tiles/cache/nexrad-KTLX/20240501T120000Z").status_code == 403
+    purged = client.delete(
+        "/tiles/cache/nexrad-KTLX/20240501T120000Z", headers={"X-Purge-Token": "secret"}
+    )
+    assert purged.json()["removed"] == {"memory": 1, "store": 1}
+    assert store.deleted_on_loop is False
+    assert srv.tile_cache.get(TileKey("nexrad-KTLX", "20240501T120000Z", 7, 29, 50)) is None
@@ -0,0 +1,144 @@
+import io
+import struct
+import zlib
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services.common.colormaps import NEXRAD_REFLECTIVITY
+from services.tiler import server as srv
+from services.tiler.etags import SourceETags
+from services.tiler.frame_cache import MERCATOR_HALF_EXTENT_M, Frame, FrameCache
+from services.tiler.handles import DatasetHandleCache
+from services.tiler.occupancy import OccupancyCache
+from services.tiler.png import encode_indexed_apng
+from services.tiler.render_pool import RenderPool
+from services.tiler.tile_cache import TileCache
+
+TIMES = ["20240501T120000Z", "20240501T120500Z", "20240501T121000Z"]
+
+
+def _chunks(png):
+    pos, chunks = 8, []
+    while pos < len(png):
+        (length,) = struct.unpack(">I", png[pos : pos + 4])
+        chunks.append((png[pos + 4 : pos + 8], png[pos + 8 : pos + 8 + length]))
+        pos += 12 + length
+    return chunks
+
+
+def _frame(value):
+    # One z7 tile, (29, 51), filled with a single reflectivity code.
+    res = 2 * MERCATOR_HALF_EXTENT_M / (256 * 2**7)
+    left, top = -MERCATOR_HALF_EXTENT_M + 29 * 256 * res, MERCATOR_HALF_EXTENT_M - 51 * 256 * res
+    return Frame(np.full((256, 256), value, dtype="uint8"), left, top, res, res, nodata=0, scale=0.5, offset=-33.0)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    frames = {t: _frame(100 + 20 * i) for i, t in enumerate(TIMES)}
+
+    def loader(bucket, key):
+        timestamp = key.split("/")[2]
+        if timestamp not in frames:
+            raise OSError(f"{key} not found")
+        return frames[timestamp]
+
+    monkeypatch.setenv("S3_BUCKET_DERIVED", "derived")
+    monkeypatch.setattr(srv, "tile_cache", TileCache())
+    monkeypatch.setattr(srv, "source_etags", SourceETags(lambda bucket, key: f"etag-{key}"))
+    monkeypatch.setattr(srv, "render_pool", RenderPool(max_workers=2))
+    monkeypatch.setattr(srv, "dataset_handles", DatasetHandleCache(lambda b, k, e: f"https://minio/{b}/{k}", object))
+    monkeypatch.setattr(srv, "frame_cache", FrameCache(loader))
+    return TestClient(srv.app)
+
+
+def test_apng_has_one_frame_control_per_frame_and_shared_palette():
+    palette = NEXRAD_REFLECTIVITY.palette(-30.0, 80.0)
+    frames = [np.full((4, 4), i, dtype="uint8") for i in (10, 20, 30)]
+    chunks = _chunks(encode_indexed_apng(frames, palette, delay_ms=100))
+    tags = [tag for tag, _ in chunks]
+    assert tags[:3] == [b"IHDR", b"acTL", b"PLTE"]
+    assert tags.count(b"fcTL") == 3 and tags.count(b"IDAT") == 1 and tags.count(b"fdAT") == 2
+    assert struct.unpack(">II", dict(chunks)[b"acTL"]) == (3, 0)
+    sequences = [struct.unpack(">I", payload[:4])[0] for tag, payload in chunks if tag in (b"fcTL", b"fdAT")]
+    assert sequences == list(range(5))
+    last = [payload for tag, payload in chunks if tag == b"fdAT"][-1]
+    assert zlib.decompress(last[4:]) == (b"\x00" + bytes([30]) * 4) * 4
+
+
+def test_stack_bin_returns_frames_in_order_and_reports_missing(client):
+    base = "/tiles/stack/nexrad-KTLX/7/29/51.bin"
+    response = client.get(base, params={"timestamps": ",".join([*TIMES[:2], "20240501T999999Z", TIMES[2]])})
+    assert response.status_code == 200
+    assert response.headers["X-Stack-Timestamps"] == ",".join(TIMES)
+    assert response.headers["X-Stack-Missing"] == "20240501T999999Z"
+    body, blobs = response.content, []
+    while body:
+        length = int.from_bytes(body[:4], "big")
+        blobs.append(body[4 : 4 + length])
+        body = body[4 + length :]
+    assert len(blobs) == 3 and all(b.startswith(b"\x89PNG") for b in blobs)
+    assert len(set(blobs)) == 3
+
+    complete = client.get(base, params={"timestamps": ",".join(TIMES)})
+    assert complete.headers["X-Tile-Cache"] == "miss" and "X-Stack-Missing" not in complete.headers
+    assert client.get(base, params={"timestamps": ",".join(TIMES)}).headers["X-Tile-Cache"] == "memory"
+
+
+def test_stack_range_uses_the_frames_index(client, monkeypatch):
+    monkeypatch.setattr(srv, "_indexed_frame_timestamps", lambda bucket, index_key: TIMES)
+    response = client.get("/tiles/stack/nexrad-KTLX/7/29/51.apng", params={"start": TIMES[1], "limit": 5})
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "image/apng"
+    assert response.headers["X-Stack-Timestamps"] == ",".join(TIMES[1:])
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+    assert [tag for tag, _ in _chunks(response.content)].count(b"fcTL") == 2
+
+    assert client.get("/tiles/stack/goes-c13/7/29/51.apng").status_code == 400
+    assert client.get("/tiles/stack/nexrad-KTLX/7/29/51.gif").status_code == 404
+
+
+def test_stack_animated_webp(client):
+    image = pytest.importorskip("PIL.Image")
+    response = client.get("/tiles/stack/nexrad-KTLX/7/29/51.webp", params={"timestamps": ",".join(TIMES)})
+    assert response.headers["Content-Type"] == "image/webp"
+    assert image.open(io.BytesIO(response.content)).n_frames == 3
+
+
+def test_revisable_stacks_follow_their_frames_source_versions(client, monkeypatch):
+    stored, versions, occupancy_loads = {"code": 100}, {"v": "1"}, []
+
+    class _Reader:
+        def __init__(self, url):
+            self.code = stored["code"]
+            self.dataset = SimpleNamespace(scales=(0.5,), offsets=(-33.0,), nodata=0)
+
+        def tile(self, x, y, z, tilesize):
+            return np.full((1, tilesize, tilesize), self.code, "uint8"), np.full((tilesize, tilesize), 255, "uint8")
+
+        def close(self):
+            pass
+
+    def occupancy(bucket, key):
+        occupancy_loads.append(key)
+
+    monkeypatch.setattr(srv, "_tiler_available", True)
+    monkeypatch.setattr(srv, "dataset_handles", DatasetHandleCache(lambda b, k, e: f"https://minio/{b}/{k}", _Reader))
+    monkeypatch.setattr(srv, "source_etags", SourceETags(lambda bucket, key: f"{key}-v{versions['v']}", ttl=0))
+    monkeypatch.setattr(srv, "occupancy_cache", OccupancyCache(occupancy))
+    url, params = "/tiles/stack/mrms-reflq/3/1/3.bin", {"timestamps": TIMES[0]}
+
+    assert client.get(f"/tiles/weather/mrms-reflq/{TIMES[0]}/3/1/3.png").status_code == 200
+    first = client.get(url, params=params)
+    assert first.headers["X-Tile-Cache"] == "miss" and first.headers["Cache-Control"] == "public, max-age=60"
+    assert client.get(url, params=params).headers["X-Tile-Cache"] == "memory"
+    # Single tiles and stacks of one frame version share its occupancy entry.
+    assert len(occupancy_loads) == 1
+
+    stored["code"], versions["v"] = 150, "2"  # recomposited in place by ingestion
+    second = client.get(url, params=params)
+    assert second.headers["X-Tile-Cache"] == "miss" and second.content != first.content
+    assert len(occupancy_loads) == 2
@@ -0,0 +1,252 @@
+"""Two-level cache for rendered weather tiles.
+
+A tile for a given ``(dataset, timestamp, z, x, y, style, rescale)`` never changes once
+its frame exists, so rendered bytes are kept in a bounded in-process LRU and persisted
+to the ``tiles`` bucket, where every tiler replica (and restarts) can reuse them. The
+bucket tier is kept within a size and age budget by a periodic background sweep, and
+either tier can be purged per dataset or per dataset timestamp.
+"""
+from __future__ import annotations
+
+import io
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any, Protocol
+
+from minio.deleteobjects import DeleteObject  # type: ignore
+
+logger = logging.getLogger("tiler.cache")
+
+
+@dataclass(frozen=True)
+class TileKey:
+    dataset: str
+    timestamp: str
+    z: int
+    x: int
+    y: int
+    style: str = "default"
+    rescale: str | None = None
+    fmt: str = "png"
+    tile_size: int = 256
+    # Digest of the inputs of tiles whose sources can change over time: the member frames
+    # of mosaics, or the object version of revisable frames.
+    sources: str | None = None
+
+    @property
+    def object_name(self) -> str:
+        variant = f"{self.style}_{(self.rescale or 'auto').replace(',', '_')}"
+        if self.tile_size != 256:
+            variant += f"@{self.tile_size}"
+        if self.sources:
+            variant += f"~{self.sources}"
+        return f"{self.dataset}/{self.timestamp}/{self.z}/{self.x}/{self.y}/{variant}.{self.fmt}"
+
+
+class TileStore(Protocol):
+    """Persistent tier (e.g. a MinIO bucket prefix)."""
+
+    def load(self, name: str) -> bytes | None: ...
+
+    def save(self, name: str, payload: bytes, content_type: str) -> None: ...
+
+    def delete_prefix(self, prefix: str) -> int: ...
+
+    def enforce_limits(self, max_bytes: int, max_age: timedelta) -> int: ...
+
+
+class MinioTileStore:
+    """Tiles persisted under ``prefix`` in a MinIO bucket."""
+
+    def __init__(self, client: Any, bucket: str, prefix: str = "weather"):
+        self._client = client
+        self._bucket = bucket
+        self._prefix = prefix.strip("/")
+
+    def _key(self, name: str) -> str:
+        return f"{self._prefix}/{name}"
+
+    def load(self, name: str) -> bytes | None:
+        try:
+            response = self._client.get_object(self._bucket, self._key(name))
+        except Exception:  # noqa: BLE001 - missing objects and outages both mean "render it"
+            return None
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    def save(self, name: str, payload: bytes, content_type: str) -> None:
+        self._client.put_object(
+            self._bucket, self._key(name), io.BytesIO(payload), len(payload), content_type=content_type
+        )
+
+    def _delete(self, names: list[str]) -> int:
+        if not names:
+            return 0
+        errors = list(self._client.remove_objects(self._bucket, [DeleteObject(n) for n in names]))
+        for error in errors:
+            logger.warning("Failed to delete cached tile %s: %s", error.name, error.message)
+        return len(names) - len(errors)
+
+    def delete_prefix(self, prefix: str) -> int:
+        names = [
+            obj.object_name
+            for obj in self._client.list_objects(self._bucket, prefix=self._key(prefix), recursive=True)
+        ]
+        return self._delete(names)
+
+    def enforce_limits(self, max_bytes: int, max_age: timedelta) -> int:
+        cutoff = datetime.now(UTC) - max_age
+        objects = sorted(
+            self._client.list_objects(self._bucket, prefix=f"{self._prefix}/", recursive=True),
+            key=lambda o: o.last_modified,
+            reverse=True,
+        )
+        keep_bytes = 0
+        doomed = []
+        for obj in objects:
+            if obj.last_modified < cutoff or keep_bytes + obj.size > max_bytes:
+                doomed.append(obj.object_name)
+            else:
+                keep_bytes += obj.size
+        return self._delete(doomed)
+
+
+class TileCache:
+    """Memory LRU (bounded by bytes) in front of an optional persistent :class:`TileStore`."""
+
+    def __init__(
+        self,
+        *,
+        max_memory_bytes: int = 256 << 20,
+        store: TileStore | None = None,
+        store_max_bytes: int = 10 << 30,
+        store_max_age: timedelta = timedelta(days=2),
+        sweep_interval_s: float = 600.0,
+    ):
+        self._max_memory = max_memory_bytes
+        self._store = store
+        self._store_max_bytes = store_max_bytes
+        self._store_max_age = store_max_age
+        self._sweep_interval = sweep_interval_s
+        self._entries: OrderedDict[TileKey, tuple[bytes, str]] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self._sweeping = False
+        # Store writes and sweeps happen off the request path.
+        self._background = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tile-cache")
+        self.stats = {"memory_hits": 0, "store_hits": 0, "misses": 0, "evictions": 0, "store_writes": 0}
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    def _remember(self, key: TileKey, payload: bytes, media_type: str) -> None:
+        if len(payload) > self._max_memory:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous[0])
+            self._entries[key] = (payload, media_type)
+            self._memory_bytes += len(payload)
+            while self._memory_bytes > self._max_memory and self._entries:
+                _, (old, _) = self._entries.popitem(last=False)
+                self._memory_bytes -= len(old)
+                self.stats["evictions"] += 1
+
+    def get_memory(self, key: TileKey) -> bytes | None:
+        """Memory tier only: cheap enough to call on the event loop."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return entry[0]
+
+    def get_store(self, key: TileKey, media_type: str = "image/png") -> bytes | None:
+        """Store tier only (blocking); a hit is promoted to memory. Counts a miss otherwise."""
+        if self._store is not None:
+            payload = self._store.load(key.object_name)
+            if payload is not None:
+                self.stats["store_hits"] += 1
+                self._remember(key, payload, media_type)
+                return payload
+        self.stats["misses"] += 1
+        return None
+
+    def get(self, key: TileKey, media_type: str = "image/png") -> tuple[bytes, str] | None:
+        """Return ``(payload, tier)`` where tier is ``"memory"`` or ``"store"``, else ``None``."""
+        payload = self.get_memory(key)
+        if payload is not None:
+            return payload, "memory"
+        payload = self.get_store(key, media_type)
+        if payload is not None:
+            return payload, "store"
+        return None
+
+    def put(self, key: TileKey, payload: bytes, media_type: str = "image/png", *, persist: bool = True) -> None:
+        """Cache ``payload`` in memory and, unless ``persist`` is false, in the store."""
+        self._remember(key, payload, media_type)
+        if persist and self._store is not None:
+            self._background.submit(self._persist, key, payload, media_type)
+            self._maybe_sweep()
+
+    def _persist(self, key: TileKey, payload: bytes, media_type: str) -> None:
+        try:
+            self._store.save(key.object_name, payload, media_type)  # type: ignore[union-attr]
+            self.stats["store_writes"] += 1
+        except Exception:  # noqa: BLE001
+            logger.warning("Failed to persist tile %s", key.object_name)
+
+    def _maybe_sweep(self) -> None:
+        with self._lock:
+            if self._sweeping or time.monotonic() - self._last_sweep < self._sweep_interval:
+                return
+            self._sweeping = True
+            self._last_sweep = time.monotonic()
+        self._background.submit(self._sweep)
+
+    def _sweep(self) -> None:
+        try:
+            removed = self._store.enforce_limits(self._store_max_bytes, self._store_max_age)  # type: ignore[union-attr]
+            if removed:
+                logger.info("Evicted %d cached tiles from the store", removed)
+        except Exception:  # noqa: BLE001
+            logger.warning("Tile store sweep failed", exc_info=True)
+        finally:
+            with self._lock:
+                self._sweeping = False
+
+    def purge(self, dataset: str, timestamp: str | None = None) -> dict[str, int]:
+        """Drop every cached tile of ``dataset`` (optionally only one ``timestamp``)."""
+        with self._lock:
+            doomed = [
+                k
+                for k in self._entries
+                if k.dataset == dataset and (timestamp is None or k.timestamp == timestamp)
+            ]
+            for k in doomed:
+                self._memory_bytes -= len(self._entries.pop(k)[0])
+        removed_store = 0
+        if self._store is not None:
+            prefix = f"{dataset}/{timestamp}/" if timestamp else f"{dataset}/"
+            removed_store = self._store.delete_prefix(prefix)
+        return {"memory": len(doomed), "store": removed_store}
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            entries = len(self._entries)
+        return {**self.stats, "memory_entries": entries, "memory_bytes": self._memory_bytes}
+
+
+__all__ = ["MinioTileStore", "TileCache", "TileKey", "TileStore"]